@@ -41,6 +41,7 @@ Remember that you have no knowledge of the current time unless you check it usin
     },
     "TTS_MODELS": {
         "PROVIDER": "azure",  # "azure" or "openai"
+        "SYNTHESIS_LOOKAHEAD": 2,  # Phrases synthesized ahead of the one being played
         "OPENAI_TTS": {
             "TTS_CHUNK_SIZE": 8192,
             "TTS_SPEED": 1.0,
@@ -65,10 +66,36 @@ Remember that you have no knowledge of the current time unless you check it usin
             },
             "PLAYBACK_RATE": 24000,
             "ENABLE_PROFANITY_FILTER": False,
+            "SYNTHESIZER_POOL_SIZE": 3,  # Pre-warmed synthesizers shared by all sessions
             "STABILITY": 0,
             "PROSODY": {"rate": "1.0", "pitch": "0%", "volume": "default"},
         },
     },
+    "CONTEXT_WINDOW": {
+        "TOKEN_BUDGET": 6000,  # Prompt tokens allowed for system prompt + summary + history
+        "MIN_RECENT_MESSAGES": 2,  # Always sent verbatim, even over budget
+        "SUMMARIZE": True,  # Fold older messages into a rolling summary instead of dropping them
+        "SUMMARY_STALE_MESSAGES": 6,  # Refresh the summary once this many messages fell out unsummarized
+        "SUMMARY_MAX_TOKENS": 300,
+    },
+    "TTS_CACHE": {
+        "ENABLED": True,
+        "DIRECTORY": os.getenv(
+            "TTS_CACHE_DIR",
+            os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tts", "audio_cache"),
+        ),
+        "MEMORY_MAX_BYTES": 16 * 1024 * 1024,
+        "DISK_MAX_BYTES": 200 * 1024 * 1024,
+        # Pre-synthesized at startup so they are cache hits from the first use
+        "WARMUP_PHRASES": [],
+    },
+    "AUDIO_TRANSPORT": {
+        # "pcm" or "opus". Opus needs the opuslib package on both ends and a
+        # playback rate Opus supports; otherwise PCM is used.
+        "CODEC": "pcm",
+        "OPUS_BITRATE": 24000,
+        "OPUS_FRAME_MS": 20,
+    },
     "AUDIO_SETTINGS": {
         "FORMAT": 16,
         "CHANNELS": 1,
@@ -1,10 +1,13 @@
 import logging
+from typing import Optional
 from fastapi import APIRouter, HTTPException, Response
 from backend.config.config import CONFIG
-from backend.endpoints.state import GEN_STOP_EVENT, TTS_STOP_EVENT
+from backend.endpoints.state import session_manager
 
 # Import weather state
 import backend.weather.state as weather_state
+from backend.weather.cache import NWS, OPENWEATHER, weather_cache
+from backend.weather.nws_cache import get_nws_cache_metrics
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api")
@@ -26,6 +29,19 @@ async def get_tts_state():
         )
 
 
+@router.get("/tts-metrics")
+async def get_tts_metrics():
+    """Returns TTS audio cache statistics and, for Azure, per-phrase pool timings."""
+    from backend.tts.audio_cache import tts_audio_cache
+
+    metrics = {"provider": CONFIG["TTS_MODELS"]["PROVIDER"], "cache": tts_audio_cache.get_stats()}
+    if CONFIG["TTS_MODELS"]["PROVIDER"].lower() == "azure":
+        from backend.tts.azure_pool import azure_synthesizer_pool
+
+        metrics.update(azure_synthesizer_pool.get_stats())
+    return metrics
+
+
 @router.post("/toggle-tts")
 async def toggle_tts():
     try:
@@ -37,29 +53,41 @@ async def toggle_tts():
 
 
 @router.post("/stop-audio")
-async def stop_tts():
-    logger.info("Stop TTS requested")
-    TTS_STOP_EVENT.set()
-    return {"status": "success", "message": "TTS stopped"}
+async def stop_tts(session_id: Optional[str] = None, all: bool = False):
+    """
+    Stop TTS audio for the given session.
+    Every connected session is only stopped with all=true; without a
+    session_id nothing is stopped.
+    """
+    logger.info(f"Stop TTS requested (session: {'all' if all else session_id})")
+    stopped = session_manager.stop_audio(session_id, all_sessions=all)
+    return {"status": "success", "message": "TTS stopped", "sessions": stopped}
 
 
 @router.post("/stop-generation")
-async def stop_generation():
+async def stop_generation(session_id: Optional[str] = None, all: bool = False):
     """
-    Manually set the global GEN_STOP_EVENT.
+    Set the stop event of the given session.
+    Every connected session is only stopped with all=true; without a
+    session_id nothing is stopped.
     Any ongoing streaming text generation will stop soon after it checks the event.
     """
-    GEN_STOP_EVENT.set()
+    stopped = session_manager.stop_generation(session_id, all_sessions=all)
     return {
-        "detail": "Generation stop event triggered. Ongoing text generation will exit soon."
+        "detail": "Generation stop event triggered. Ongoing text generation will exit soon.",
+        "sessions": stopped,
     }
 
 
 # --- Weather Endpoint ---
 @router.get("/weather")
-async def get_weather_data():
+async def get_weather_data(response: Response):
     """Returns the latest cached weather data."""
     if weather_state.latest_weather_data:
+        freshness = weather_cache.freshness(NWS)
+        if freshness:
+            response.headers["X-Weather-Fetched-At"] = freshness["fetched_at"]
+            response.headers["Age"] = str(int(freshness["age_seconds"]))
         return weather_state.latest_weather_data
     else:
         # Return a 503 Service Unavailable if data hasn't been fetched yet
@@ -70,14 +98,12 @@ async def get_weather_data():
 @router.post("/weather/refresh")
 async def refresh_weather_data():
     """Forces a refresh of weather data by fetching new data from all sources."""
-    from backend.weather.fetcher import fetch_weather_data
-    from backend.weather.openweather_fetcher import fetch_openweather_data
     import asyncio
     
     try:
-        # Fetch both NWS and OpenWeatherMap data concurrently
-        nws_task = fetch_weather_data()
-        ow_task = fetch_openweather_data()
+        # Fetch both NWS and OpenWeatherMap data concurrently (refreshing the shared cache)
+        nws_task = weather_cache.get(NWS, force=True)
+        ow_task = weather_cache.get(OPENWEATHER, force=True)
         
         # Wait for both to complete
         nws_data, ow_data = await asyncio.gather(nws_task, ow_task, return_exceptions=True)
@@ -108,3 +134,12 @@ async def refresh_weather_data():
     except Exception as e:
         logger.error(f"Unexpected error refreshing weather data: {e}")
         return {"status": "error", "message": f"An error occurred: {str(e)}"}
+
+
+@router.get("/weather/metrics")
+async def get_weather_metrics():
+    """Returns cache effectiveness for the weather fetchers."""
+    metrics = get_nws_cache_metrics()
+    metrics["weather_cache_hits"] = weather_cache.hits
+    metrics["weather_cache_misses"] = weather_cache.misses
+    return metrics
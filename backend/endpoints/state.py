@@ -1,5 +1,3 @@
 # backend/endpoints/state.py
-import asyncio
-
-TTS_STOP_EVENT = asyncio.Event()
-GEN_STOP_EVENT = asyncio.Event()
+# Generation/TTS stop state is tracked per connection by the session registry.
+from backend.websocket.session_manager import session_manager
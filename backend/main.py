@@ -1,20 +1,27 @@
 import asyncio
 import logging
+import uuid
+from typing import Optional
 
 import uvicorn
 from dotenv import load_dotenv
 from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 
-from backend.config.config import setup_chat_client
-from backend.models.openaisdk import validate_messages_for_ws, stream_openai_completion
+from backend.config.config import CONFIG, setup_chat_client
+from backend.models.context_window import context_window
+from backend.models.openaisdk import (
+    build_completion_messages,
+    prepare_messages,
+    stream_openai_completion,
+    validate_messages_for_ws,
+)
 from backend.endpoints.api import router as api_router
-from backend.endpoints.state import GEN_STOP_EVENT
-from backend.tts.processor import process_streams
+from backend.tts.processor import process_streams, select_audio_codec
 
 # Import weather components
-from backend.weather.fetcher import fetch_weather_data, close_http_client
-from backend.weather.openweather_fetcher import fetch_openweather_data
+from backend.weather.fetcher import close_http_client
+from backend.weather.cache import NWS, OPENWEATHER, weather_cache
 import backend.weather.state as weather_state  # Use alias to avoid name collision
 
 # Import shutdown utilities
@@ -24,6 +31,13 @@ from contextlib import asynccontextmanager
 
 # Near the top of the file, import the navigation handler
 from backend.websocket.navigation_handler import navigation_handler
+from backend.websocket.frames import FLAG_OPUS, StreamWriter
+from backend.websocket.session_manager import ChatSession, session_manager
+from backend.websocket.conversation_store import (
+    Conversation,
+    ConversationOutOfSync,
+    conversation_store,
+)
 
 # ------------------------------------------------------------------------------
 # Logging Setup (Configure basic logging)
@@ -44,15 +58,18 @@ client, DEPLOYMENT_NAME = setup_chat_client()
 # Background Tasks
 # ------------------------------------------------------------------------------
 async def periodic_weather_update(interval_seconds: int = 1800):
-    """Periodically fetches weather data and updates the global state."""
+    """
+    Periodically refreshes the shared weather cache for the default location
+    and updates the global state served by /api/weather.
+    """
     # Initial fetch immediately
     logger.info("Performing initial weather data fetch...")
     
     # Fetch NWS data (used for forecasts, but not for current weather)
-    nws_data = await fetch_weather_data()
+    nws_data = await weather_cache.get(NWS, force=True)
     
     # Fetch OpenWeatherMap data (for current weather)
-    ow_data = await fetch_openweather_data()
+    ow_data = await weather_cache.get(OPENWEATHER, force=True)
     
     updated_weather_data = None
     if nws_data and not isinstance(nws_data, Exception):
@@ -96,8 +113,8 @@ async def periodic_weather_update(interval_seconds: int = 1800):
         await asyncio.sleep(30)  # Wait 30 seconds before retrying
         
         # Retry both data sources
-        nws_data = await fetch_weather_data()
-        ow_data = await fetch_openweather_data()
+        nws_data = await weather_cache.get(NWS, force=True)
+        ow_data = await weather_cache.get(OPENWEATHER, force=True)
         
         updated_weather_data_retry = None
         if nws_data and not isinstance(nws_data, Exception):
@@ -142,8 +159,8 @@ async def periodic_weather_update(interval_seconds: int = 1800):
         logger.info("Attempting periodic weather update...")
         
         # Fetch both data sources concurrently
-        nws_task = fetch_weather_data()
-        ow_task = fetch_openweather_data()
+        nws_task = weather_cache.get(NWS, force=True)
+        ow_task = weather_cache.get(OPENWEATHER, force=True)
         
         # Wait for both to complete
         nws_data, ow_data = await asyncio.gather(nws_task, ow_task, return_exceptions=True)
@@ -225,6 +242,20 @@ async def lifespan(app: FastAPI):
     weather_update_task = asyncio.create_task(periodic_weather_update())
     logger.info("Periodic weather update task started.")
 
+    # Connect Azure synthesizers before the first phrase needs one
+    if CONFIG["GENERAL_AUDIO"]["TTS_ENABLED"] and CONFIG["TTS_MODELS"]["PROVIDER"].lower() == "azure":
+        from backend.tts.azure_pool import azure_synthesizer_pool
+
+        asyncio.create_task(azure_synthesizer_pool.warm_up())
+        logger.info("Azure synthesizer pool warm-up started.")
+
+    # Pre-synthesize the configured common phrases into the TTS audio cache
+    if CONFIG["GENERAL_AUDIO"]["TTS_ENABLED"] and CONFIG["TTS_CACHE"]["WARMUP_PHRASES"]:
+        from backend.tts.audio_cache import warm_tts_cache
+
+        asyncio.create_task(warm_tts_cache())
+        logger.info("TTS audio cache warm-up started.")
+
     yield  # Application is running
 
     # --- Shutdown sequence ---
@@ -279,72 +310,51 @@ async def unified_chat_websocket(websocket: WebSocket):
     # Register websocket with navigation handler
     navigation_handler.register_connection(websocket)
 
+    # Each connection gets its own session (stop events, queues, tasks)
+    session = session_manager.create_session(websocket)
+
     try:
+        await websocket.send_json(
+            {"action": "session", "session_id": session.session_id}
+        )
+
         while True:
             data = await websocket.receive_json()
             logger.debug(f"Received JSON data: {data}")
             action = data.get("action")
 
             if action == "chat":
-                logger.info("Processing new chat message...")
-                # Clear event for the new chat.
-                GEN_STOP_EVENT.clear()
-
-                messages = data.get("messages", [])
-                validated = await validate_messages_for_ws(messages)
-
-                phrase_queue = asyncio.Queue()
-                audio_queue = asyncio.Queue()
-
-                process_streams_task = asyncio.create_task(
-                    process_streams(phrase_queue, audio_queue, GEN_STOP_EVENT)
-                )
-
-                audio_forward_task = asyncio.create_task(
-                    forward_audio_to_websocket(audio_queue, websocket, GEN_STOP_EVENT)
-                )
-
-                try:
-                    async for content in stream_openai_completion(
-                        client, DEPLOYMENT_NAME, validated, phrase_queue, GEN_STOP_EVENT, connection=websocket
-                    ):
-                        if GEN_STOP_EVENT.is_set():
-                            break
-                        logger.debug(f"Sending content chunk: {content[:50]}...")
-                        await websocket.send_json(
-                            {"content": content, "is_chunk": True}
-                        )
-                finally:
-                    logger.info("Chat stream finished, cleaning up...")
-                    # Send a final signal to indicate streaming is complete
-                    try:
-                        if not GEN_STOP_EVENT.is_set():
-                            # Get the accumulated content from the last message
-                            # and mark it as complete
-                            last_message = next(
-                                (
-                                    m
-                                    for m in validated[::-1]
-                                    if m.get("role") == "assistant"
-                                ),
-                                None,
-                            )
-                            if last_message:
-                                final_content = last_message.get("content", "")
-                                logger.debug(f"Sending final message: {final_content[:100]}...")
-                                await websocket.send_json(
-                                    {
-                                        "content": final_content,
-                                        "is_final": True,
-                                    }
-                                )
-                    except Exception as e:
-                        logger.error(f"Error sending final message: {e}")
-
-                    await phrase_queue.put(None)
-                    await process_streams_task
-                    await audio_forward_task
-                    logger.info("Cleanup completed")
+                logger.info(f"Processing new chat message for session {session.session_id}...")
+                # A new chat replaces any generation still running on this connection
+                if session.is_generating():
+                    session.stop_generation()
+                    await session.wait_for_generation()
+
+                conversation_id = data.get("conversation_id")
+                conversation = None
+                if conversation_id:
+                    conversation = await load_conversation(websocket, data)
+                    if conversation is None:
+                        # Client was asked to resync; it will resend the full history
+                        continue
+                    validated = build_completion_messages(conversation.messages)
+                else:
+                    # Legacy clients send the full history every turn
+                    validated = await validate_messages_for_ws(data.get("messages", []))
+
+                # Keep the prompt within the token budget
+                validated = context_window.fit(client, DEPLOYMENT_NAME, validated, conversation)
+
+                session.begin_generation()
+                session.start_generation(handle_chat(session, validated, conversation_id))
+            elif action == "stop":
+                logger.info(f"Stop requested over websocket for session {session.session_id}")
+                session.stop_generation()
+            elif action == "end_conversation":
+                conversation_store.remove(data.get("conversation_id"))
+            elif action == "audio_codecs":
+                session.audio_codecs = set(data.get("codecs", [])) | {"pcm"}
+                logger.info(f"Session {session.session_id} audio codecs: {sorted(session.audio_codecs)}")
     except WebSocketDisconnect:
         logger.info("WebSocket disconnected.")
     except Exception as e:
@@ -352,46 +362,157 @@ async def unified_chat_websocket(websocket: WebSocket):
     finally:
         # Unregister websocket from navigation handler
         navigation_handler.unregister_connection(websocket)
-        await websocket.close()
+        await session_manager.remove_session(session)
+        try:
+            await websocket.close()
+        except Exception:
+            pass
+
+
+async def load_conversation(websocket: WebSocket, data) -> Optional[Conversation]:
+    """
+    Apply a chat message to the server-side conversation store.
+
+    A normal message carries only the new messages (a delta) and the sequence
+    number it builds on. A message with "resync" carries the full history and
+    replaces the stored copy.
+
+    Returns:
+        The updated conversation, or None if the delta did not match and the
+        client was asked to resync.
+    """
+    conversation_id = data["conversation_id"]
+    messages = data.get("messages", [])
+
+    if data.get("resync"):
+        conversation = conversation_store.replace(
+            conversation_id, await prepare_messages(messages)
+        )
+    else:
+        base_seq = int(data.get("base_seq", 0))
+        delta = await prepare_messages(messages, start_index=base_seq)
+        try:
+            conversation = conversation_store.append(conversation_id, base_seq, delta)
+        except ConversationOutOfSync as e:
+            logger.info(f"{e}; requesting resync")
+            await websocket.send_json(
+                {
+                    "action": "resync_required",
+                    "conversation_id": conversation_id,
+                    "seq": e.expected_seq,
+                }
+            )
+            return None
+
+    return conversation
+
+
+async def handle_chat(session: ChatSession, validated, conversation_id: Optional[str] = None):
+    """Stream one chat turn (text + TTS audio) to the session's websocket."""
+    websocket = session.websocket
+    stop_event = session.stop_event
+    phrase_queue = session.phrase_queue
+    audio_queue = session.audio_queue
+    reply_parts = []
+    audio_codec = select_audio_codec(session.audio_codecs)
+    # Audio frames and text chunks of this turn share one stream id
+    writer = StreamWriter(
+        websocket,
+        session.next_stream_id(),
+        audio_flags=FLAG_OPUS if audio_codec == "opus" else 0,
+    )
+
+    process_streams_task = session.create_task(
+        process_streams(phrase_queue, audio_queue, stop_event, audio_codec)
+    )
+
+    audio_forward_task = session.create_task(
+        forward_audio_to_websocket(
+            audio_queue, writer, stop_event, session.tts_stop_event
+        )
+    )
+
+    try:
+        async for content in stream_openai_completion(
+            client, DEPLOYMENT_NAME, validated, phrase_queue, stop_event, connection=websocket
+        ):
+            if stop_event.is_set():
+                break
+            reply_parts.append(content)
+            logger.debug(f"Queueing content chunk: {content[:50]}...")
+            writer.queue_text(content)
+    except Exception as e:
+        logger.error(f"Chat stream error for session {session.session_id}: {e}")
+    finally:
+        logger.info("Chat stream finished, cleaning up...")
+        # Send a final signal to indicate streaming is complete
+        try:
+            await writer.flush_text()
+            if not stop_event.is_set():
+                final_content = "".join(reply_parts)
+                # A per-turn id keeps identical replies from being dropped as duplicates
+                final_message = {
+                    "id": uuid.uuid4().hex,
+                    "content": final_content,
+                    "is_final": True,
+                    "stream_id": writer.stream_id,
+                }
+                # Only completed replies become part of the stored conversation
+                if conversation_id:
+                    seq = conversation_store.append_reply(conversation_id, final_content)
+                    if seq is not None:
+                        final_message["conversation_id"] = conversation_id
+                        final_message["seq"] = seq
+                logger.debug(f"Sending final message: {final_content[:100]}...")
+                await websocket.send_json(final_message)
+        except Exception as e:
+            logger.error(f"Error sending final message: {e}")
+
+        await phrase_queue.put(None)
+        await asyncio.gather(
+            process_streams_task, audio_forward_task, return_exceptions=True
+        )
+        logger.info("Cleanup completed")
 
 
 # ------------------------------------------------------------------------------
 # Audio Forwarding Function
 # ------------------------------------------------------------------------------
 async def forward_audio_to_websocket(
-    audio_queue: asyncio.Queue, websocket: WebSocket, stop_event: asyncio.Event
+    audio_queue: asyncio.Queue,
+    writer: StreamWriter,
+    stop_event: asyncio.Event,
+    tts_stop_event: Optional[asyncio.Event] = None,
 ):
     try:
         while True:
-            if stop_event.is_set():
+            if stop_event.is_set() or (tts_stop_event and tts_stop_event.is_set()):
                 logger.info("Audio forwarding stopped by stop event")
-                await websocket.send_bytes(b"audio:")  # Send empty audio marker
+                await writer.abort()
                 break
 
             try:
                 audio_data = await audio_queue.get()
                 if audio_data is None:
-                    logger.info("Received None in audio queue, sending audio end marker")
-                    await websocket.send_bytes(b"audio:")
+                    logger.info("Received None in audio queue, sending audio end frame")
+                    await writer.end()
                     break
-                # Prepend "audio:" if not already present.
-                message = (
-                    b"audio:" + audio_data
-                    if not audio_data.startswith(b"audio:")
-                    else audio_data
-                )
-                logger.debug(f"Sending audio bytes, size: {len(message)}")
-                await websocket.send_bytes(message)
+                logger.debug(f"Sending audio frame, size: {len(audio_data)}")
+                await writer.send_audio(audio_data)
             except Exception as e:
                 logger.error(f"Error forwarding audio to websocket: {e}", exc_info=True)
                 break
     except Exception as e:
         logger.error(f"Forward audio task error: {e}", exc_info=True)
     finally:
+        # Make sure the frontend always sees the stream close
         try:
-            await websocket.send_bytes(b"audio:")
+            if stop_event.is_set() or (tts_stop_event and tts_stop_event.is_set()):
+                await writer.abort()
+            else:
+                await writer.end()
         except Exception as e:
-            logger.error(f"Error sending final empty message: {e}", exc_info=True)
+            logger.error(f"Error sending final stream frame: {e}", exc_info=True)
 
 
 # ------------------------------------------------------------------------------
@@ -400,4 +521,11 @@ async def forward_audio_to_websocket(
 app.include_router(api_router)
 
 if __name__ == "__main__":
-    uvicorn.run("backend.main:app", host="0.0.0.0", port=8000, reload=True)
+    # permessage-deflate compresses the JSON text messages
+    uvicorn.run(
+        "backend.main:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=True,
+        ws_per_message_deflate=True,
+    )
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Token-budgeted context window for chat completions.
+
+Keeps the system prompt and the most recent messages verbatim and replaces
+everything older with a rolling summary, so long conversations stop growing
+the prompt (and time-to-first-token) without bound.
+"""
+import asyncio
+import logging
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Set
+
+from backend.config.config import CONFIG
+
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
+
+logger = logging.getLogger(__name__)
+
+# Tokens the chat format adds around every message
+MESSAGE_OVERHEAD_TOKENS = 4
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+SUMMARY_INSTRUCTIONS = (
+    "Summarize the conversation below for your own future reference. Keep facts, "
+    "names, numbers, decisions and open requests; drop small talk. Write plain prose."
+)
+
+_encoding = None
+if tiktoken is not None:
+    try:
+        _encoding = tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        logger.warning(f"[ContextWindow] tiktoken unavailable, estimating tokens: {e}")
+
+
+@lru_cache(maxsize=4096)
+def count_text_tokens(text: str) -> int:
+    """
+    Count tokens in a piece of text. Results are cached, so each stored
+    message is only tokenized once.
+    """
+    if _encoding is not None:
+        return len(_encoding.encode(text))
+    # Roughly four characters per token for English text
+    return (len(text) + 3) // 4
+
+
+def count_message_tokens(message: Dict[str, Any]) -> int:
+    content = message.get("content") or ""
+    return count_text_tokens(content) + MESSAGE_OVERHEAD_TOKENS
+
+
+class ContextWindowManager:
+    """
+    Fits a conversation into the configured token budget.
+    """
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        settings = settings or CONFIG["CONTEXT_WINDOW"]
+        self.token_budget = settings["TOKEN_BUDGET"]
+        self.min_recent_messages = settings["MIN_RECENT_MESSAGES"]
+        self.summarize = settings["SUMMARIZE"]
+        self.summary_stale_messages = settings["SUMMARY_STALE_MESSAGES"]
+        self.summary_max_tokens = settings["SUMMARY_MAX_TOKENS"]
+        self._summary_tasks: Set[asyncio.Task] = set()
+
+    def fit(
+        self,
+        client,
+        model: str,
+        messages: List[Dict[str, Any]],
+        conversation=None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Trim messages to the token budget.
+
+        Args:
+            client: Chat client, used to refresh the summary in the background
+            model: Model name for the summary request
+            messages: System prompt followed by the conversation history
+            conversation: The stored Conversation, if any; holds the rolling summary
+
+        Returns:
+            The messages to send: system prompt, summary (if any) and recent history
+        """
+        if not messages:
+            return messages
+        system_prompt, history = messages[0], messages[1:]
+
+        summary_message = None
+        if conversation is not None and conversation.summary:
+            summary_message = {"role": "system", "content": SUMMARY_PREFIX + conversation.summary}
+
+        available = self.token_budget - count_message_tokens(system_prompt)
+        if summary_message:
+            available -= count_message_tokens(summary_message)
+
+        # Walk backwards and keep as many recent messages as fit
+        kept = 0
+        used = 0
+        for message in reversed(history):
+            tokens = count_message_tokens(message)
+            if kept >= self.min_recent_messages and used + tokens > available:
+                break
+            used += tokens
+            kept += 1
+
+        cut = len(history) - kept
+        if cut == 0:
+            return messages
+
+        if conversation is not None and self.summarize:
+            self._maybe_refresh_summary(client, model, conversation, history[:cut])
+            # Only drop what a finished summary covers; the rest stays verbatim
+            # (over budget) until the background refresh catches up
+            cut = min(cut, conversation.summary_seq)
+            if cut == 0:
+                return messages
+
+        fitted = [system_prompt]
+        if summary_message:
+            fitted.append(summary_message)
+        fitted.extend(history[cut:])
+
+        logger.info(
+            f"[ContextWindow] Folded {cut} of {len(history)} messages, "
+            f"sending ~{sum(count_message_tokens(m) for m in history[cut:])} history tokens "
+            f"(budget {self.token_budget})"
+        )
+        return fitted
+
+    def _maybe_refresh_summary(self, client, model: str, conversation, folded: List[Dict[str, Any]]):
+        """Start a background summary refresh when too many messages fell out of the window unsummarized."""
+        if conversation.summary_task is not None:
+            return
+        pending = len(folded) - conversation.summary_seq
+        stale_after = 1 if conversation.summary is None else self.summary_stale_messages
+        if pending < stale_after:
+            return
+
+        task = asyncio.create_task(self._refresh_summary(client, model, conversation, list(folded)))
+        conversation.summary_task = task
+        self._summary_tasks.add(task)
+        task.add_done_callback(self._summary_tasks.discard)
+
+    async def _refresh_summary(self, client, model: str, conversation, folded: List[Dict[str, Any]]):
+        """Fold the messages not yet covered into the rolling summary."""
+        history = conversation.messages
+        try:
+            new_messages = folded[conversation.summary_seq:]
+            transcript = "\n".join(f"{m['role']}: {m.get('content') or ''}" for m in new_messages)
+            if conversation.summary:
+                transcript = f"Previous summary:\n{conversation.summary}\n\nNew messages:\n{transcript}"
+
+            response = await client.chat.completions.create(
+                model=model,
+                messages=[
+                    {"role": "system", "content": SUMMARY_INSTRUCTIONS},
+                    {"role": "user", "content": transcript},
+                ],
+                max_tokens=self.summary_max_tokens,
+                temperature=0.3,
+            )
+            summary = (response.choices[0].message.content or "").strip()
+            # A resync replaced the history while we were summarizing; drop the result
+            if summary and conversation.messages is history:
+                conversation.summary = summary
+                conversation.summary_seq = len(folded)
+                logger.info(
+                    f"[ContextWindow] Summary for {conversation.conversation_id} now covers "
+                    f"{conversation.summary_seq} messages ({count_text_tokens(summary)} tokens)"
+                )
+        except Exception as e:
+            logger.error(f"[ContextWindow] Failed to refresh summary: {e}")
+        finally:
+            conversation.summary_task = None
+
+
+# Create a singleton instance
+context_window = ContextWindowManager()
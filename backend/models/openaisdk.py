@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import inspect
 import json
 import re
 from typing import Any, AsyncIterator, Dict, List, Optional, Sequence, Union
@@ -6,8 +7,9 @@ import asyncio
 from fastapi import HTTPException
 
 from backend.config.config import CONFIG
-from backend.tools.registry import get_tools, get_available_functions
-from backend.tools.helpers import get_function_and_args, execute_function
+from backend.tools.registry import get_tools, get_available_functions, get_tool_metadata
+from backend.tools.helpers import get_function_and_args
+from backend.tools.orchestrator import ToolOrchestrator
 
 
 def log_segment(segment: str) -> None:
@@ -88,13 +90,23 @@ async def process_chunks(
                         break
 
 
-async def validate_messages_for_ws(
-    messages: List[Dict[str, Any]],
+async def prepare_messages(
+    messages: List[Dict[str, Any]], start_index: int = 0
 ) -> List[Dict[str, Any]]:
+    """
+    Validate frontend (sender/text) messages and convert them to OpenAI format.
+
+    Args:
+        messages: The messages to validate (a full history or a delta)
+        start_index: Position of the first message in the conversation, used in errors
+
+    Returns:
+        The converted messages, without the system prompt
+    """
     if not isinstance(messages, list):
         raise HTTPException(status_code=400, detail="'messages' must be a list.")
     prepared = []
-    for idx, msg in enumerate(messages):
+    for idx, msg in enumerate(messages, start=start_index):
         if not isinstance(msg, dict):
             raise HTTPException(
                 status_code=400, detail=f"Message at index {idx} must be a dictionary."
@@ -120,11 +132,86 @@ async def validate_messages_for_ws(
                 status_code=400, detail=f"Invalid sender at index {idx}."
             )
         prepared.append({"role": role, "content": text})
-    system_prompt = {"role": "system", "content": CONFIG["SYSTEM_PROMPT"]["CONTENT"]}
-    prepared.insert(0, system_prompt)
     return prepared
 
 
+def build_completion_messages(history: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Prepend the system prompt to already validated messages.
+    Returns a new list, so the completion can append tool messages to it freely.
+    """
+    system_prompt = {"role": "system", "content": CONFIG["SYSTEM_PROMPT"]["CONTENT"]}
+    return [system_prompt, *history]
+
+
+async def validate_messages_for_ws(
+    messages: List[Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    return build_completion_messages(await prepare_messages(messages))
+
+
+async def run_tool_calls(
+    tool_calls: List[Dict[str, Any]], connection=None
+) -> List[Dict[str, Any]]:
+    """
+    Execute the tool calls of one assistant turn through the ToolOrchestrator.
+
+    Independent calls run concurrently; dependencies and per-tool timeouts come
+    from the tool schemas. Returns one "tool" message per call, in call order.
+    """
+    funcs = get_available_functions()
+    orchestrated = []
+    results: Dict[str, Any] = {}
+    keys = []
+
+    for idx, tc in enumerate(tool_calls):
+        # Some providers leave ids empty; the orchestrator still needs unique keys
+        key = tc["id"] or f"call_{idx}"
+        keys.append(key)
+        try:
+            fn, fn_args = get_function_and_args(tc, funcs)
+        except (ValueError, json.JSONDecodeError) as e:
+            results[key] = {"error": str(e), "status": "error"}
+            continue
+
+        # Connection-aware tools (e.g. navigation) get the originating websocket
+        if connection is not None and "connection" in inspect.signature(fn).parameters:
+            fn_args["connection"] = connection
+
+        metadata = get_tool_metadata(fn.__name__)
+        orchestrated.append(
+            {
+                "id": key,
+                "name": fn.__name__,
+                "params": fn_args,
+                "depends_on": metadata.get("dependencies", []),
+                "provides": metadata.get("provides", []),
+                "timeout": metadata.get("timeout"),
+            }
+        )
+
+    if orchestrated:
+        # A fresh orchestrator per turn keeps concurrent sessions from sharing plan state
+        tool_orchestrator = ToolOrchestrator()
+        tool_orchestrator.set_functions(funcs)
+        results.update(await tool_orchestrator.execute_tools(orchestrated))
+
+    tool_messages = []
+    for key, tc in zip(keys, tool_calls):
+        name = tc["function"]["name"]
+        resp = results.get(key, {"error": "Tool call was not executed", "status": "error"})
+        log_function_call_result(name, resp)
+        tool_messages.append(
+            {
+                "tool_call_id": tc["id"],
+                "role": "tool",
+                "name": name,
+                "content": json.dumps(resp, default=str),
+            }
+        )
+    return tool_messages
+
+
 async def stream_openai_completion(
     client,
     model: str,
@@ -201,41 +288,7 @@ async def stream_openai_completion(
         if not stop_event.is_set() and tool_calls:
             messages.append({"role": "assistant", "tool_calls": tool_calls})
             log_tool_calls(tool_calls)
-            funcs = get_available_functions()
-            for tc in tool_calls:
-                try:
-                    fn, fn_args = get_function_and_args(tc, funcs)
-                    
-                    # Execute the function with a timeout based on function type
-                    # Chat, weather, and external API calls get longer timeouts
-                    timeout = None
-                    if fn.__name__ in ['get_weather_current', 'get_weather_forecast']:
-                        timeout = 15.0  # Weather API calls get 15 seconds
-                    elif fn.__name__ in ['navigate_to_screen']:
-                        timeout = 5.0   # Navigation gets 5 seconds
-                    elif fn.__name__ in ['get_time', 'get_sunrise_sunset']:
-                        timeout = 10.0  # Time-related API calls get 10 seconds
-                    
-                    # If this is a navigation function and we have a connection, add it to the args
-                    if fn.__name__ == 'navigate_to_screen' and connection:
-                        fn_args['connection'] = connection
-                    
-                    # Execute with appropriate timeout
-                    resp = await execute_function(fn, fn_args, timeout=timeout)
-                    
-                    log_function_call_result(fn.__name__, resp)
-                    messages.append(
-                        {
-                            "tool_call_id": tc["id"],
-                            "role": "tool",
-                            "name": fn.__name__,
-                            "content": json.dumps(resp),
-                        }
-                    )
-                except ValueError as e:
-                    messages.append(
-                        {"role": "assistant", "content": f"[Error]: {str(e)}"}
-                    )
+            messages.extend(await run_tool_calls(tool_calls, connection))
             if not stop_event.is_set():
                 follow_up = await client.chat.completions.create(
                     model=model,
@@ -180,7 +180,8 @@ def get_schema():
             # Dependency metadata for parallel execution
             "dependencies": [],  # Navigation doesn't depend on other tools
             "provides": ["navigation_result"],  # Provides navigation result
-            "parallel_safe": True  # Can be run in parallel with other operations
+            "parallel_safe": True,  # Can be run in parallel with other operations
+            "timeout": 5.0  # Seconds before the orchestrator gives up on this call
         }
     }
 
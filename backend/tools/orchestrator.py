@@ -12,6 +12,7 @@ Tool call results are keyed by a unique 'id' field if present in the tool call d
 
 
 import asyncio
+import inspect
 import logging
 from typing import Dict, List, Any, Callable, Optional, Set, Tuple, Union
 
@@ -57,7 +58,8 @@ class ToolExecutionPlan:
 
     def add_tool(self, tool_name: str, 
                  depends_on: Optional[List[str]] = None, 
-                 provides: Optional[List[str]] = None) -> None:
+                 provides: Optional[List[str]] = None,
+                 key: Optional[str] = None) -> None:
         logger.debug(f"Adding tool to plan: {tool_name}, depends_on={depends_on}, provides={provides}")
         """
         Add a tool to the execution plan with its dependencies
@@ -65,15 +67,22 @@ class ToolExecutionPlan:
         
         Args:
             tool_name: Name of the tool
-            depends_on: List of tool names this tool depends on
+            depends_on: List of plan keys this tool depends on
             provides: List of data keys this tool provides
+            key: Unique plan key (e.g. the tool call id). Defaults to tool_name.
         """
-        if tool_name not in self.tool_dependencies:
-            self.tool_dependencies[tool_name] = ToolDependency(tool_name, provides)
+        key = key or tool_name
+        if key not in self.tool_dependencies:
+            self.tool_dependencies[key] = ToolDependency(tool_name, provides)
+        else:
+            # May have been registered earlier as another tool's dependency
+            self.tool_dependencies[key].tool_name = tool_name
+            if provides:
+                self.tool_dependencies[key].provides = provides
         
         if depends_on:
             for dep in depends_on:
-                self.tool_dependencies[tool_name].add_dependency(dep)
+                self.tool_dependencies[key].add_dependency(dep)
                 
                 # Ensure the dependency exists in our registry
                 if dep not in self.tool_dependencies:
@@ -94,8 +103,9 @@ class ToolExecutionPlan:
         
         # Special handling for navigation - always put it in its own batch
         # that can run in parallel with other operations
-        navigation_tools = {t for t in remaining_tools 
-                           if t == "navigate_to_screen" or "navigation" in t.lower()}
+        navigation_tools = {t for t in remaining_tools
+                           if self.tool_dependencies[t].tool_name == "navigate_to_screen"
+                           or "navigation" in self.tool_dependencies[t].tool_name.lower()}
         logger.debug(f"Navigation tools detected: {navigation_tools}")
 
         # If we have navigation tools, put them in their own batch right away
@@ -198,20 +208,41 @@ class ToolOrchestrator:
         """
         Analyzes a list of tool calls and creates a dependency map.
         
+        Each call is planned under its 'id' (or its name if it has none), so the
+        same tool can appear several times in one batch. 'depends_on' entries
+        name tools; they are resolved to the calls of those tools in this list,
+        and dependencies on tools that are not being called are ignored.
+        
         Args:
             tool_calls: List of tool call dictionaries, each containing at least
-                       'name' and optionally 'depends_on' and 'provides' keys
+                       'name' and optionally 'id', 'depends_on' and 'provides' keys
         """
         self.execution_plan = ToolExecutionPlan()
         
-        # First pass: register all tools
+        # Map tool names (and explicit keys) to the plan keys of this batch
+        keys_by_name: Dict[str, List[str]] = {}
         for tool_call in tool_calls:
             name = tool_call.get('name')
-            depends_on = tool_call.get('depends_on', [])
-            provides = tool_call.get('provides', [])
-            
             if name:
-                self.execution_plan.add_tool(name, depends_on, provides)
+                key = tool_call.get('id', name)
+                keys_by_name.setdefault(name, []).append(key)
+                if key != name:
+                    keys_by_name.setdefault(key, []).append(key)
+        
+        # Register all tools with their resolved dependencies
+        for tool_call in tool_calls:
+            name = tool_call.get('name')
+            if not name:
+                continue
+            key = tool_call.get('id', name)
+            depends_on = []
+            for dep in tool_call.get('depends_on', []):
+                dep_keys = [k for k in keys_by_name.get(dep, []) if k != key]
+                if not dep_keys:
+                    logger.debug(f"Ignoring dependency '{dep}' of {name}: not part of this batch")
+                depends_on.extend(dep_keys)
+            provides = tool_call.get('provides', [])
+            self.execution_plan.add_tool(name, depends_on, provides, key=key)
         
         # Build the execution plan
         self.execution_plan.build_execution_plan()
@@ -223,24 +254,21 @@ class ToolOrchestrator:
         Execute tool calls based on the dependency plan.
         
         Args:
-            tool_calls: List of tool call dictionaries containing 'name' and 'params'
-            timeout: Maximum time to wait for execution in seconds
+            tool_calls: List of tool call dictionaries containing 'name' and 'params',
+                        and optionally 'id' and a per-call 'timeout' in seconds
+            timeout: Default time limit in seconds for calls without their own timeout
             
         Returns:
-            Dictionary mapping tool names to their results
+            Dictionary mapping tool call ids (or tool names) to their results
         """
         # Create dependency map if not already done
         self.create_tool_dependency_map(tool_calls)
         
-        # Create lookup for tool parameters and ids
-        tool_params = {}
-        tool_ids = {}
+        # Create lookup for tool calls by plan key
+        calls_by_key = {}
         for tc in tool_calls:
             if 'name' in tc:
-                tool_params[tc['name']] = tc.get('params', {})
-                # Use id if present, else fallback to name
-                key = tc.get('id', tc['name'])
-                tool_ids[tc['name']] = key
+                calls_by_key[tc.get('id', tc['name'])] = tc
         
         # Prepare results dictionary
         results = {}
@@ -248,66 +276,70 @@ class ToolOrchestrator:
         # Execute batches in sequence
         for batch_idx, batch in enumerate(self.execution_plan.execution_batches):
             logger.info(f"Executing batch {batch_idx+1}/{len(self.execution_plan.execution_batches)}: {batch}")
-            for tool_name in batch:
-                logger.info(f"Batch {batch_idx+1}: tool {tool_name}")
             
             # Prepare coroutines for this batch
             batch_coros = []
-            for tool_name in batch:
+            for key in batch:
+                tc = calls_by_key.get(key)
+                if tc is None:
+                    continue
+                tool_name = tc['name']
+                logger.info(f"Batch {batch_idx+1}: tool {tool_name} ({key})")
                 # Get function to execute
                 func = self.functions.get(tool_name)
                 if not func:
                     logger.error(f"Tool function '{tool_name}' not found")
-                    key = tool_ids.get(tool_name, tool_name)
                     results[key] = {"error": f"Tool function '{tool_name}' not found"}
                     continue
                 # Get parameters for this tool
-                params = tool_params.get(tool_name, {})
+                params = tc.get('params', {})
                 # Get inputs from dependencies
-                dep_inputs = self.execution_plan.get_tool_inputs(tool_name)
+                dep_inputs = self.execution_plan.get_tool_inputs(key)
                 # Merge dependency inputs with explicit parameters
-                merged_params = {**dep_inputs, **params}
+                merged_params = _filter_params(func, {**dep_inputs, **params})
                 # Create coroutine
                 if asyncio.iscoroutinefunction(func):
                     coro = func(**merged_params)
                 else:
                     coro = asyncio.to_thread(func, **merged_params)
-                batch_coros.append((tool_name, coro))
+                call_timeout = tc.get('timeout') or timeout
+                batch_coros.append((key, asyncio.wait_for(coro, timeout=call_timeout)))
             
-            # Execute batch with timeout
-            try:
-                # Wait for all coroutines in the batch with a timeout
-                batch_results = await asyncio.wait_for(
-                    asyncio.gather(
-                        *[coro for _, coro in batch_coros],
-                        return_exceptions=True
-                    ),
-                    timeout=timeout
-                )
-                
-                # Process results
-                for (tool_name, _), result in zip(batch_coros, batch_results):
-                    key = tool_ids.get(tool_name, tool_name)
-                    if isinstance(result, Exception):
-                        logger.error(f"Error executing tool '{tool_name}': {result}")
-                        results[key] = {"error": str(result)}
-                    else:
-                        # Store the result
-                        results[key] = result
-                        # Also store in the dependency for use by subsequent tools
-                        if tool_name in self.execution_plan.tool_dependencies:
-                            self.execution_plan.tool_dependencies[tool_name].output = result
-                            
-            except asyncio.TimeoutError:
-                logger.error(f"Timeout executing batch {batch_idx+1}")
-                for tool_name, _ in batch_coros:
-                    key = tool_ids.get(tool_name, tool_name)
-                    if key not in results:
-                        results[key] = {"error": "Execution timed out"}
+            # Execute batch; each call is bounded by its own timeout
+            batch_results = await asyncio.gather(
+                *[coro for _, coro in batch_coros],
+                return_exceptions=True
+            )
+            
+            # Process results
+            for (key, _), result in zip(batch_coros, batch_results):
+                if isinstance(result, asyncio.TimeoutError):
+                    logger.error(f"Timeout executing tool '{key}'")
+                    results[key] = {"error": "Execution timed out", "status": "timeout"}
+                elif isinstance(result, Exception):
+                    logger.error(f"Error executing tool '{key}': {result}")
+                    results[key] = {"error": str(result)}
+                else:
+                    # Store the result
+                    results[key] = result
+                    # Also store in the dependency for use by subsequent tools
+                    if key in self.execution_plan.tool_dependencies:
+                        self.execution_plan.tool_dependencies[key].output = result
         
         return results
 
 
+def _filter_params(func: Callable, params: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop parameters the function does not accept (unless it takes **kwargs)."""
+    try:
+        sig = inspect.signature(func)
+    except (TypeError, ValueError):
+        return params
+    if any(p.kind == inspect.Parameter.VAR_KEYWORD for p in sig.parameters.values()):
+        return params
+    return {k: v for k, v in params.items() if k in sig.parameters}
+
+
 # Create a singleton instance
 orchestrator = ToolOrchestrator()
 
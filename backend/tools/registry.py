@@ -19,6 +19,12 @@ _TOOL_FUNCTIONS: Dict[str, Callable] = {}
 # List to store tool schemas
 _TOOL_SCHEMAS: List[Dict[str, Any]] = []
 
+# Orchestration metadata per tool name (kept out of the schemas sent to the LLM)
+_TOOL_METADATA: Dict[str, Dict[str, Any]] = {}
+
+# Schema keys that describe orchestration rather than the function itself
+_METADATA_KEYS = ("dependencies", "provides", "parallel_safe", "timeout")
+
 def _discover_and_register_tools():
     """
     Auto-discover tool modules and register their functions.
@@ -55,17 +61,26 @@ def _discover_and_register_tools():
             # Get schema if available
             if hasattr(module, 'get_schema'):
                 schema = module.get_schema()
+                
+                # Split orchestration metadata from the schema sent to the LLM
+                function_data = schema.get('function', {})
+                metadata = {
+                    key: function_data.pop(key)
+                    for key in _METADATA_KEYS
+                    if key in function_data
+                }
                 _TOOL_SCHEMAS.append(schema)
                 logger.info(f"Registered schema for: {schema['function']['name']}")
                 
                 # Register the tool with the orchestrator
                 # Check if schema has dependency metadata
-                function_data = schema.get('function', {})
                 function_name = function_data.get('name')
                 if function_name:
+                    _TOOL_METADATA[function_name] = metadata
+                    
                     # Look for dependency metadata
-                    dependencies = function_data.get('dependencies', [])
-                    provides = function_data.get('provides', [])
+                    dependencies = metadata.get('dependencies', [])
+                    provides = metadata.get('provides', [])
                     
                     # Register with orchestrator if we have dependency info
                     if dependencies or provides:
@@ -99,6 +114,21 @@ def get_available_functions() -> Dict[str, Callable]:
         _discover_and_register_tools()
     return _TOOL_FUNCTIONS
 
+def get_tool_metadata(name: str) -> Dict[str, Any]:
+    """
+    Get the orchestration metadata declared in a tool's schema.
+    
+    Args:
+        name: Tool function name
+        
+    Returns:
+        Dictionary with any of 'dependencies', 'provides', 'parallel_safe' and 'timeout'
+    """
+    # Ensure tools are discovered
+    if not _TOOL_SCHEMAS:
+        _discover_and_register_tools()
+    return _TOOL_METADATA.get(name, {})
+
 async def execute_tools_parallel(tool_calls: List[Dict[str, Any]], 
                                timeout: float = 30.0) -> Dict[str, Any]:
     """
@@ -70,6 +70,11 @@ def get_schema():
                 },
                 "required": ["lat", "lon"],
                 "additionalProperties": False
-            }
+            },
+            # Dependency metadata
+            "dependencies": [],
+            "provides": ["sunrise_sunset"],
+            "parallel_safe": True,
+            "timeout": 10.0  # Time-related API calls get 10 seconds
         }
     } 
\ No newline at end of file
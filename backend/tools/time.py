@@ -212,6 +212,11 @@ def get_schema():
                     }
                 },
                 "required": []
-            }
+            },
+            # Dependency metadata
+            "dependencies": [],
+            "provides": ["time_context"],
+            "parallel_safe": True,
+            "timeout": 10.0  # Time-related API calls get 10 seconds
         }
     } 
\ No newline at end of file
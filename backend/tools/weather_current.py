@@ -2,8 +2,8 @@ import os
 import logging
 from dotenv import load_dotenv
 
-# Import existing fetcher function for OpenWeatherMap data
-from backend.weather.openweather_fetcher import fetch_openweather_data
+# OpenWeatherMap data is read through the shared weather cache
+from backend.weather.cache import OPENWEATHER, weather_cache
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +22,8 @@ async def get_weather_current(
 ):
     """
     Get current weather conditions for a specific location.
-    Uses OpenWeatherMap API for current conditions data.
+    Uses OpenWeatherMap API for current conditions data, served from
+    the shared weather cache when it is fresh.
     
     Args:
         lat: Latitude coordinate as a string or number
@@ -40,8 +41,8 @@ async def get_weather_current(
         lat_str = str(lat) if not isinstance(lat, str) else lat
         lon_str = str(lon) if not isinstance(lon, str) else lon
         
-        # Use existing fetcher for OpenWeatherMap data
-        ow_data = await fetch_openweather_data(lat_str, lon_str)
+        # Read OpenWeatherMap data through the shared cache
+        ow_data = await weather_cache.get(OPENWEATHER, lat_str, lon_str)
         
         if ow_data:
             current_processed = {}
@@ -111,6 +112,7 @@ def get_schema():
             # Dependency metadata
             "dependencies": [],  # Current weather doesn't depend on other tools
             "provides": ["current_weather"],  # Provides current weather data
-            "parallel_safe": True  # Can be run in parallel with other operations
+            "parallel_safe": True,  # Can be run in parallel with other operations
+            "timeout": 15.0  # Weather API calls get 15 seconds
         }
     } 
\ No newline at end of file
@@ -2,8 +2,8 @@ import os
 import logging
 from dotenv import load_dotenv
 
-# Import existing fetcher function for National Weather Service data
-from backend.weather.fetcher import fetch_weather_data
+# National Weather Service data is read through the shared weather cache
+from backend.weather.cache import NWS, weather_cache
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +20,8 @@ async def get_weather_forecast(
 ):
     """
     Get weather forecast data for a specific location.
-    Uses the National Weather Service API for forecast data.
+    Uses the National Weather Service API for forecast data, served from
+    the shared weather cache when it is fresh.
     
     Args:
         lat: Latitude coordinate as a string or number
@@ -36,8 +37,8 @@ async def get_weather_forecast(
         lat_str = str(lat) if not isinstance(lat, str) else lat
         lon_str = str(lon) if not isinstance(lon, str) else lon
         
-        # Use existing fetcher for NWS data
-        nws_data = await fetch_weather_data(lat_str, lon_str)
+        # Read NWS data through the shared cache
+        nws_data = await weather_cache.get(NWS, lat_str, lon_str)
         
         if nws_data:
             forecast_processed = {}
@@ -90,6 +91,11 @@ def get_schema():
                 },
                 "required": ["lat", "lon", "detail_level"],
                 "additionalProperties": False
-            }
+            },
+            # Dependency metadata
+            "dependencies": [],
+            "provides": ["weather_forecast"],
+            "parallel_safe": True,
+            "timeout": 15.0  # Weather API calls get 15 seconds
         }
     } 
\ No newline at end of file
@@ -0,0 +1,240 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from backend.config.config import CONFIG
+from backend.tts.pipeline import Synthesizer
+
+logger = logging.getLogger(__name__)
+
+# Cached phrases are replayed in chunks of this size, like a live stream
+REPLAY_CHUNK_SIZE = 16384
+
+
+class _RecordingSink:
+    """Forwards audio chunks to the real sink while keeping a copy for the cache."""
+
+    def __init__(self, sink: asyncio.Queue):
+        self.sink = sink
+        self.chunks: List[bytes] = []
+
+    def put_nowait(self, chunk: bytes):
+        self.chunks.append(chunk)
+        self.sink.put_nowait(chunk)
+
+
+class TTSAudioCache:
+    """
+    Content-addressed cache of synthesized phrase audio.
+
+    Entries are keyed by a hash of (provider, voice, format, prosody, text), so a
+    change to any synthesis setting is a different entry. Recently used audio is
+    kept in a memory LRU; everything is also written to a size-bounded directory
+    that survives restarts. Both tiers evict least recently used entries first.
+    """
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        settings = settings or CONFIG["TTS_CACHE"]
+        self.enabled = settings["ENABLED"]
+        self.directory = settings["DIRECTORY"]
+        self.memory_max_bytes = settings["MEMORY_MAX_BYTES"]
+        self.disk_max_bytes = settings["DISK_MAX_BYTES"]
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk: "OrderedDict[str, int]" = OrderedDict()  # key -> file size
+        self._disk_bytes = 0
+        self._disk_loaded = False
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(provider: str, voice: str, audio_format: str, prosody: Any, text: str) -> str:
+        payload = json.dumps([provider, voice, audio_format, prosody, text.strip()], sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.audio")
+
+    def _scan_directory(self) -> List[tuple]:
+        """List (key, size) of the files already on disk, oldest access first (blocking)."""
+        os.makedirs(self.directory, exist_ok=True)
+        entries = []
+        for name in os.listdir(self.directory):
+            if not name.endswith(".audio"):
+                continue
+            try:
+                stat = os.stat(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, name[: -len(".audio")], stat.st_size))
+        return [(key, size) for _, key, size in sorted(entries)]
+
+    async def _ensure_disk_index(self):
+        if self._disk_loaded:
+            return
+        entries = await asyncio.to_thread(self._scan_directory)
+        # Index bookkeeping only happens on the event loop thread
+        if self._disk_loaded:
+            return
+        for key, size in entries:
+            self._disk[key] = size
+            self._disk_bytes += size
+        self._disk_loaded = True
+        logger.info(f"[TTSAudioCache] Indexed {len(self._disk)} cached phrases ({self._disk_bytes} bytes) in {self.directory}")
+
+    def _read_file(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # Mark as recently used
+            return data
+        except OSError:
+            return None
+
+    def _write_file(self, key: str, audio: bytes) -> bool:
+        path = self._path(key)
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "wb") as f:
+                f.write(audio)
+            os.replace(tmp_path, path)
+            return True
+        except OSError as e:
+            logger.warning(f"[TTSAudioCache] Could not write {path}: {e}")
+            return False
+
+    def _remove_files(self, keys: List[str]):
+        for key in keys:
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+
+    def _remember(self, key: str, audio: bytes):
+        if len(audio) > self.memory_max_bytes:
+            return
+        self._memory_bytes += len(audio) - len(self._memory.pop(key, b""))
+        self._memory[key] = audio
+        while self._memory_bytes > self.memory_max_bytes:
+            _, old_audio = self._memory.popitem(last=False)
+            self._memory_bytes -= len(old_audio)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        """Return cached audio for a key, or None."""
+        audio = self._memory.get(key)
+        if audio is not None:
+            self._memory.move_to_end(key)
+            self.memory_hits += 1
+            return audio
+
+        await self._ensure_disk_index()
+        if key in self._disk:
+            audio = await asyncio.to_thread(self._read_file, key)
+            if audio is not None:
+                self._disk.move_to_end(key)
+                self._remember(key, audio)
+                self.disk_hits += 1
+                return audio
+            # File vanished underneath us
+            self._disk_bytes -= self._disk.pop(key, 0)
+
+        self.misses += 1
+        return None
+
+    async def put(self, key: str, audio: bytes):
+        """Store audio for a key in memory and on disk."""
+        if not audio:
+            return
+        self._remember(key, audio)
+        await self._ensure_disk_index()
+        if not await asyncio.to_thread(self._write_file, key, audio):
+            return
+
+        self._disk_bytes += len(audio) - self._disk.pop(key, 0)
+        self._disk[key] = len(audio)
+        evicted = []
+        while self._disk_bytes > self.disk_max_bytes and len(self._disk) > 1:
+            old_key, size = self._disk.popitem(last=False)
+            self._disk_bytes -= size
+            evicted.append(old_key)
+        if evicted:
+            await asyncio.to_thread(self._remove_files, evicted)
+
+    def wrap(
+        self,
+        synthesize: Synthesizer,
+        stop_event: asyncio.Event,
+        provider: str,
+        voice: str,
+        audio_format: str,
+        prosody: Any,
+    ) -> Synthesizer:
+        """
+        Put the cache in front of a phrase synthesizer.
+
+        Hits are written to the sink immediately; misses are synthesized and
+        stored once the phrase completes without being stopped.
+        """
+        if not self.enabled:
+            return synthesize
+
+        async def cached_synthesize(phrase: str, sink: asyncio.Queue):
+            key = self.make_key(provider, voice, audio_format, prosody, phrase)
+            audio = await self.get(key)
+            if audio is not None:
+                logger.debug(f"[TTSAudioCache] Hit for '{phrase[:40]}'")
+                for i in range(0, len(audio), REPLAY_CHUNK_SIZE):
+                    sink.put_nowait(audio[i:i + REPLAY_CHUNK_SIZE])
+                return
+
+            recorder = _RecordingSink(sink)
+            await synthesize(phrase, recorder)
+            if not stop_event.is_set():
+                await self.put(key, b"".join(recorder.chunks))
+
+        return cached_synthesize
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "memory_entries": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "disk_entries": len(self._disk),
+            "disk_bytes": self._disk_bytes,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 3) if lookups else 0.0,
+        }
+
+
+# Create a singleton instance
+tts_audio_cache = TTSAudioCache()
+
+
+async def warm_tts_cache(phrases: Optional[List[str]] = None):
+    """
+    Pre-synthesize common phrases so their first use is already a cache hit.
+    Phrases that are already cached cost nothing.
+    """
+    from backend.tts.processor import process_streams
+
+    phrases = CONFIG["TTS_CACHE"]["WARMUP_PHRASES"] if phrases is None else phrases
+    if not phrases or not tts_audio_cache.enabled:
+        return
+
+    phrase_queue: asyncio.Queue = asyncio.Queue()
+    for phrase in phrases:
+        phrase_queue.put_nowait(phrase)
+    phrase_queue.put_nowait(None)
+
+    # The audio itself is discarded; the cache keeps it
+    await process_streams(phrase_queue, asyncio.Queue(), asyncio.Event())
+    logger.info(f"[TTSAudioCache] Warm-up finished: {tts_audio_cache.get_stats()}")
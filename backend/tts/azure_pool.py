@@ -0,0 +1,233 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from typing import Dict, List, Optional
+
+import azure.cognitiveservices.speech as speechsdk
+
+from backend.config.config import CONFIG
+
+logger = logging.getLogger(__name__)
+
+
+class PooledSynthesizer:
+    """
+    A long-lived SpeechSynthesizer with a pre-opened connection.
+
+    The synthesizer has no audio output of its own; audio chunks arrive through
+    the `synthesizing` event and are routed to whichever phrase is currently
+    bound to it.
+    """
+
+    def __init__(self, speech_config: speechsdk.SpeechConfig):
+        self.synthesizer = speechsdk.SpeechSynthesizer(
+            speech_config=speech_config, audio_config=None
+        )
+        self.connection = speechsdk.Connection.from_speech_synthesizer(self.synthesizer)
+        self.synthesizer.synthesizing.connect(self._on_synthesizing)
+        self._lock = threading.Lock()
+        self._sink: Optional[asyncio.Queue] = None
+        self._stop_event: Optional[asyncio.Event] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.first_chunk_at: Optional[float] = None
+
+    def open(self):
+        """Open the connection to the service ahead of the first phrase (blocking)."""
+        self.connection.open(True)
+
+    def bind(self, sink: asyncio.Queue, stop_event: asyncio.Event, loop: asyncio.AbstractEventLoop):
+        with self._lock:
+            self._sink = sink
+            self._stop_event = stop_event
+            self._loop = loop
+            self.first_chunk_at = None
+
+    def unbind(self):
+        with self._lock:
+            self._sink = None
+            self._stop_event = None
+            self._loop = None
+
+    def _on_synthesizing(self, evt):
+        # Called on an SDK thread
+        with self._lock:
+            if self._sink is None or self._stop_event.is_set():
+                return
+            if self.first_chunk_at is None:
+                self.first_chunk_at = time.perf_counter()
+            self._loop.call_soon_threadsafe(self._sink.put_nowait, bytes(evt.result.audio_data))
+
+    def speak(self, ssml: str):
+        """Synthesize SSML, blocking until the service finishes."""
+        result = self.synthesizer.speak_ssml_async(ssml).get()
+        if result.reason == speechsdk.ResultReason.Canceled:
+            details = result.cancellation_details
+            raise RuntimeError(f"Synthesis canceled: {details.reason} {details.error_details or ''}".strip())
+        return result
+
+    def stop(self):
+        try:
+            self.synthesizer.stop_speaking_async()
+        except Exception as e:
+            logger.debug(f"[AzureSynthesizerPool] stop_speaking_async failed: {e}")
+
+
+class AzureSynthesizerPool:
+    """
+    Small pool of pre-warmed Azure synthesizers shared by all chat sessions.
+
+    Building a SpeechSynthesizer and connecting to the endpoint for every phrase
+    costs a round-trip before the first audio byte. The pool keeps a few
+    synthesizers connected and hands them out per phrase instead.
+    """
+
+    def __init__(self, size: Optional[int] = None):
+        self.size = size or CONFIG["TTS_MODELS"]["AZURE_TTS"].get("SYNTHESIZER_POOL_SIZE", 3)
+        self._speech_config: Optional[speechsdk.SpeechConfig] = None
+        self._idle: Optional[asyncio.Queue] = None
+        self._created = 0
+        self._create_lock: Optional[asyncio.Lock] = None
+        # Per-phrase timing history, in seconds
+        self._setup_times: List[float] = []
+        self._first_byte_times: List[float] = []
+        self._synthesis_times: List[float] = []
+
+    def _ensure_initialized(self):
+        if self._idle is None:
+            self._idle = asyncio.Queue()
+            self._create_lock = asyncio.Lock()
+        if self._speech_config is None:
+            speech_config = speechsdk.SpeechConfig(
+                subscription=os.getenv("AZURE_SPEECH_KEY"),
+                region=os.getenv("AZURE_SPEECH_REGION"),
+            )
+            audio_format = getattr(
+                speechsdk.SpeechSynthesisOutputFormat,
+                CONFIG["TTS_MODELS"]["AZURE_TTS"]["AUDIO_FORMAT"],
+            )
+            speech_config.set_speech_synthesis_output_format(audio_format)
+            self._speech_config = speech_config
+
+    def _create_synthesizer(self) -> PooledSynthesizer:
+        synthesizer = PooledSynthesizer(self._speech_config)
+        synthesizer.open()
+        return synthesizer
+
+    async def warm_up(self):
+        """Create and connect all synthesizers up front (call at startup)."""
+        self._ensure_initialized()
+        loop = asyncio.get_running_loop()
+        missing = self.size - self._created
+        if missing <= 0:
+            return
+        start = time.perf_counter()
+        self._created += missing
+        results = await asyncio.gather(
+            *(loop.run_in_executor(None, self._create_synthesizer) for _ in range(missing)),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                self._created -= 1
+                logger.error(f"[AzureSynthesizerPool] Failed to warm synthesizer: {result}")
+            else:
+                self._idle.put_nowait(result)
+        logger.info(
+            f"[AzureSynthesizerPool] Warmed {self._idle.qsize()} synthesizer(s) in {time.perf_counter() - start:.2f}s"
+        )
+
+    async def _acquire(self) -> PooledSynthesizer:
+        self._ensure_initialized()
+        if self._idle.empty() and self._created < self.size:
+            async with self._create_lock:
+                if self._idle.empty() and self._created < self.size:
+                    self._created += 1
+                    try:
+                        return await asyncio.get_running_loop().run_in_executor(
+                            None, self._create_synthesizer
+                        )
+                    except Exception:
+                        self._created -= 1
+                        raise
+        return await self._idle.get()
+
+    def _release(self, synthesizer: PooledSynthesizer, healthy: bool = True):
+        synthesizer.unbind()
+        if healthy:
+            self._idle.put_nowait(synthesizer)
+        else:
+            # Let a fresh one be created on demand
+            self._created -= 1
+
+    async def synthesize(self, ssml: str, sink: asyncio.Queue, stop_event: asyncio.Event):
+        """
+        Synthesize one phrase through a pooled synthesizer, streaming audio into sink.
+
+        Raises:
+            RuntimeError: If the service cancels the synthesis
+        """
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        synthesizer = await self._acquire()
+        acquired = time.perf_counter()
+        synthesizer.bind(sink, stop_event, loop)
+
+        future = loop.run_in_executor(None, synthesizer.speak, ssml)
+        try:
+            await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # Stop the service side too, and only hand the synthesizer back once it is idle
+            synthesizer.stop()
+            future.add_done_callback(
+                lambda f: self._release(synthesizer, healthy=not f.cancelled() and f.exception() is None)
+            )
+            raise
+        except Exception:
+            self._release(synthesizer, healthy=False)
+            raise
+
+        finished = time.perf_counter()
+        first_chunk_at = synthesizer.first_chunk_at
+        self._release(synthesizer)
+        self._record(acquired - start, (first_chunk_at or finished) - acquired, finished - acquired)
+
+    def _record(self, setup: float, first_byte: float, synthesis: float):
+        for history, value in (
+            (self._setup_times, setup),
+            (self._first_byte_times, first_byte),
+            (self._synthesis_times, synthesis),
+        ):
+            history.append(value)
+            del history[:-100]  # Keep the last 100 phrases
+        logger.info(
+            f"[AzureSynthesizerPool] Phrase setup {setup * 1000:.0f}ms, "
+            f"first audio {first_byte * 1000:.0f}ms, synthesis {synthesis * 1000:.0f}ms"
+        )
+
+    def get_stats(self) -> Dict[str, float]:
+        """
+        Average per-phrase timings over the last 100 phrases.
+
+        Returns:
+            Dictionary with pool size/idle count and average setup, first-audio
+            and synthesis times in milliseconds.
+        """
+
+        def _avg_ms(values: List[float]) -> float:
+            return round(sum(values) / len(values) * 1000, 1) if values else 0.0
+
+        return {
+            "pool_size": self.size,
+            "synthesizers": self._created,
+            "idle": self._idle.qsize() if self._idle else 0,
+            "phrases": len(self._synthesis_times),
+            "avg_setup_ms": _avg_ms(self._setup_times),
+            "avg_first_audio_ms": _avg_ms(self._first_byte_times),
+            "avg_synthesis_ms": _avg_ms(self._synthesis_times),
+        }
+
+
+# Create a singleton instance
+azure_synthesizer_pool = AzureSynthesizerPool()
@@ -2,6 +2,9 @@ import os
 import asyncio
 import azure.cognitiveservices.speech as speechsdk
 from backend.config.config import CONFIG
+from backend.tts.audio_cache import tts_audio_cache
+from backend.tts.azure_pool import azure_synthesizer_pool
+from backend.tts.pipeline import run_synthesis_pipeline
 
 
 class AzureTTS:
@@ -77,30 +80,14 @@ async def azure_text_to_speech_processor(
     phrase_queue: asyncio.Queue, audio_queue: asyncio.Queue, stop_event: asyncio.Event
 ):
     try:
-        speech_config = speechsdk.SpeechConfig(
-            subscription=os.getenv("AZURE_SPEECH_KEY"),
-            region=os.getenv("AZURE_SPEECH_REGION"),
-        )
         prosody = CONFIG["TTS_MODELS"]["AZURE_TTS"]["PROSODY"]
         voice = CONFIG["TTS_MODELS"]["AZURE_TTS"]["TTS_VOICE"]
-        audio_format = getattr(
-            speechsdk.SpeechSynthesisOutputFormat,
-            CONFIG["TTS_MODELS"]["AZURE_TTS"]["AUDIO_FORMAT"],
-        )
-        speech_config.set_speech_synthesis_output_format(audio_format)
-
-        while True:
-            if stop_event.is_set():
-                await audio_queue.put(None)
-                return
-
-            phrase = await phrase_queue.get()
-            if phrase is None or phrase.strip() == "":
-                await audio_queue.put(None)
-                return
+    except KeyError:
+        await audio_queue.put(None)
+        return
 
-            try:
-                ssml_phrase = f"""
+    async def synthesize(phrase: str, sink: asyncio.Queue):
+        ssml_phrase = f"""
 <speak version='1.0' xml:lang='en-US'>
     <voice name='{voice}'>
         <prosody rate='{prosody["rate"]}' pitch='{prosody["pitch"]}' volume='{prosody["volume"]}'>
@@ -109,21 +96,19 @@ async def azure_text_to_speech_processor(
     </voice>
 </speak>
 """
-                push_stream_callback = PushAudioOutputStreamCallback(
-                    audio_queue, stop_event
-                )
-                push_stream = speechsdk.audio.PushAudioOutputStream(
-                    push_stream_callback
-                )
-                audio_cfg = speechsdk.audio.AudioOutputConfig(stream=push_stream)
-                synthesizer = speechsdk.SpeechSynthesizer(
-                    speech_config=speech_config, audio_config=audio_cfg
-                )
-                result_future = synthesizer.speak_ssml_async(ssml_phrase)
-                await asyncio.get_event_loop().run_in_executor(None, result_future.get)
-            except Exception:
-                await audio_queue.put(None)
-                return
-
-    except Exception:
-        await audio_queue.put(None)
+        # Pre-warmed synthesizers skip per-phrase setup and connection cost
+        await azure_synthesizer_pool.synthesize(ssml_phrase, sink, stop_event)
+
+    # Repeated phrases are served from the audio cache without calling Azure
+    synthesize = tts_audio_cache.wrap(
+        synthesize,
+        stop_event,
+        provider="azure",
+        voice=voice,
+        audio_format=CONFIG["TTS_MODELS"]["AZURE_TTS"]["AUDIO_FORMAT"],
+        prosody=prosody,
+    )
+
+    await run_synthesis_pipeline(
+        phrase_queue, audio_queue, stop_event, synthesize, name="AzureTTS"
+    )
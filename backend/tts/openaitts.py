@@ -3,6 +3,8 @@ import asyncio
 import openai
 from typing import Optional
 from ..config.config import CONFIG
+from .audio_cache import tts_audio_cache
+from .pipeline import run_synthesis_pipeline
 
 
 class OpenAITTS:
@@ -55,56 +57,48 @@ async def openai_text_to_speech_processor(
         await audio_queue.put(None)
         return
 
-    try:
+    async def synthesize(phrase: str, sink: asyncio.Queue):
         audio_buffer = bytearray()
+        async with openai_client.audio.speech.with_streaming_response.create(
+            model=model,
+            voice=voice,
+            input=phrase,
+            speed=speed,
+            response_format=response_format,
+        ) as response:
+            async for audio_chunk in response.iter_bytes(chunk_size):
+                if stop_event.is_set():
+                    return
+
+                # Add chunk to buffer
+                audio_buffer.extend(audio_chunk)
+
+                # When buffer reaches threshold, send it
+                if len(audio_buffer) >= buffer_size:
+                    sink.put_nowait(bytes(audio_buffer))
+                    audio_buffer.clear()
+
+            # Send any remaining buffered audio
+            if audio_buffer:
+                sink.put_nowait(bytes(audio_buffer))
+
+            # Add a small silence gap between phrases
+            sink.put_nowait(b"\x00" * chunk_size)
+
+    # Repeated phrases are served from the audio cache without calling OpenAI
+    synthesize = tts_audio_cache.wrap(
+        synthesize,
+        stop_event,
+        provider=f"openai:{model}",
+        voice=voice,
+        audio_format=response_format,
+        prosody={"speed": speed},
+    )
 
-        while True:
-            if stop_event.is_set():
-                await audio_queue.put(None)
-                return
-
-            phrase = await phrase_queue.get()
-            if phrase is None:
-                await audio_queue.put(None)
-                return
-
-            stripped_phrase = phrase.strip()
-            if not stripped_phrase:
-                continue
-
-            try:
-                async with openai_client.audio.speech.with_streaming_response.create(
-                    model=model,
-                    voice=voice,
-                    input=stripped_phrase,
-                    speed=speed,
-                    response_format=response_format,
-                ) as response:
-                    async for audio_chunk in response.iter_bytes(chunk_size):
-                        if stop_event.is_set():
-                            break
-
-                        # Add chunk to buffer
-                        audio_buffer.extend(audio_chunk)
-
-                        # When buffer reaches threshold, send it
-                        if len(audio_buffer) >= buffer_size:
-                            await audio_queue.put(bytes(audio_buffer))
-                            audio_buffer.clear()
-
-                    # Send any remaining buffered audio
-                    if audio_buffer:
-                        await audio_queue.put(bytes(audio_buffer))
-                        audio_buffer.clear()
-
-                    # Add a small silence gap between phrases
-                    await audio_queue.put(b"\x00" * chunk_size)
-
-            except Exception as e:
-                print(f"Error in OpenAI TTS streaming: {e}")
-                await audio_queue.put(None)
-                return
-
+    try:
+        await run_synthesis_pipeline(
+            phrase_queue, audio_queue, stop_event, synthesize, name="OpenAITTS"
+        )
     except Exception as e:
         print(f"Error in OpenAI TTS processor: {e}")
         await audio_queue.put(None)
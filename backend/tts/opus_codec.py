@@ -0,0 +1,112 @@
+"""
+Optional Opus encoding of TTS audio for the websocket transport.
+
+Opus packets are bundled into one payload per PCM chunk, each packet
+prefixed with its length as a big-endian u16:
+
+    | len (u16) | packet | len (u16) | packet | ...
+
+The frontend decoder (frontend/logic/opus_decoder.py) reverses this.
+Requires the optional `opuslib` package (and the system libopus); without it
+the transport stays PCM.
+"""
+import asyncio
+import logging
+import struct
+from typing import Optional
+
+from backend.config.config import CONFIG
+
+try:
+    import opuslib
+except Exception:  # ImportError, or libopus missing
+    opuslib = None
+
+logger = logging.getLogger(__name__)
+
+# Sample rates Opus can encode natively
+OPUS_SAMPLE_RATES = (8000, 12000, 16000, 24000, 48000)
+
+PACKET_LENGTH = struct.Struct("!H")
+
+
+def opus_available(sample_rate: int) -> bool:
+    return opuslib is not None and sample_rate in OPUS_SAMPLE_RATES
+
+
+class OpusStreamEncoder:
+    """
+    Encodes a stream of 16-bit mono PCM chunks into bundles of Opus packets.
+    Samples that don't fill a whole Opus frame are carried into the next chunk.
+    """
+
+    def __init__(self, sample_rate: int, bitrate: int, frame_ms: int = 20):
+        self.encoder = opuslib.Encoder(sample_rate, 1, opuslib.APPLICATION_VOIP)
+        self.encoder.bitrate = bitrate
+        self.frame_samples = sample_rate * frame_ms // 1000
+        self.frame_bytes = self.frame_samples * 2
+        self._pending = bytearray()
+
+    def _encode_frames(self, pcm: memoryview) -> bytes:
+        bundle = bytearray()
+        for offset in range(0, len(pcm) - self.frame_bytes + 1, self.frame_bytes):
+            packet = self.encoder.encode(bytes(pcm[offset:offset + self.frame_bytes]), self.frame_samples)
+            bundle += PACKET_LENGTH.pack(len(packet))
+            bundle += packet
+        return bytes(bundle)
+
+    def encode(self, pcm_chunk) -> bytes:
+        """Encode all whole frames available after appending pcm_chunk."""
+        self._pending += pcm_chunk
+        usable = len(self._pending) - len(self._pending) % self.frame_bytes
+        if not usable:
+            return b""
+        bundle = self._encode_frames(memoryview(self._pending)[:usable])
+        del self._pending[:usable]
+        return bundle
+
+    def flush(self) -> bytes:
+        """Encode the remaining samples, padded with silence to a whole frame."""
+        if not self._pending:
+            return b""
+        self._pending += bytes(self.frame_bytes - len(self._pending) % self.frame_bytes)
+        bundle = self._encode_frames(memoryview(self._pending))
+        self._pending.clear()
+        return bundle
+
+
+async def encode_opus_stream(
+    pcm_queue: asyncio.Queue,
+    audio_queue: asyncio.Queue,
+    sample_rate: int,
+    settings: Optional[dict] = None,
+):
+    """
+    Read PCM chunks from pcm_queue and write Opus bundles to audio_queue.
+    Ends (forwarding the None) when pcm_queue yields None.
+    """
+    settings = settings or CONFIG["AUDIO_TRANSPORT"]
+    encoder = OpusStreamEncoder(sample_rate, settings["OPUS_BITRATE"], settings["OPUS_FRAME_MS"])
+    pcm_bytes = 0
+    opus_bytes = 0
+    try:
+        while True:
+            chunk = await pcm_queue.get()
+            if chunk is None:
+                bundle = encoder.flush()
+                if bundle:
+                    opus_bytes += len(bundle)
+                    await audio_queue.put(bundle)
+                break
+            pcm_bytes += len(chunk)
+            bundle = encoder.encode(chunk)
+            if bundle:
+                opus_bytes += len(bundle)
+                await audio_queue.put(bundle)
+    finally:
+        await audio_queue.put(None)
+        if pcm_bytes:
+            logger.info(
+                f"[Opus] Encoded {pcm_bytes} PCM bytes into {opus_bytes} bytes "
+                f"({opus_bytes / pcm_bytes:.1%})"
+            )
@@ -0,0 +1,100 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+from backend.config.config import CONFIG
+
+logger = logging.getLogger(__name__)
+
+# synthesize(phrase, sink) streams the phrase's audio chunks into sink
+Synthesizer = Callable[[str, asyncio.Queue], Awaitable[None]]
+
+
+async def run_synthesis_pipeline(
+    phrase_queue: asyncio.Queue,
+    audio_queue: asyncio.Queue,
+    stop_event: asyncio.Event,
+    synthesize: Synthesizer,
+    lookahead: Optional[int] = None,
+    name: str = "TTS",
+):
+    """
+    Synthesize phrases concurrently while writing their audio in phrase order.
+
+    While phrase N is being played out, up to `lookahead` following phrases are
+    already being requested, so the provider's first-byte latency no longer
+    shows up as a gap between sentences. Each phrase streams into its own
+    buffer queue; the writer drains those buffers into audio_queue strictly in
+    the order the phrases arrived.
+
+    Setting stop_event cancels all in-flight synthesis immediately. A None is
+    always put on audio_queue when the pipeline ends.
+
+    Args:
+        phrase_queue: Phrases to speak, terminated by None
+        audio_queue: Destination for audio chunks
+        stop_event: Cancels the pipeline when set
+        synthesize: Coroutine function streaming one phrase into a queue
+        lookahead: Number of phrases synthesized ahead of the one being written
+        name: Provider name for log messages
+    """
+    if lookahead is None:
+        lookahead = CONFIG["TTS_MODELS"].get("SYNTHESIS_LOOKAHEAD", 2)
+    # Phrase buffers in arrival order; the bound limits how far ahead we synthesize
+    pending: asyncio.Queue = asyncio.Queue(maxsize=max(1, lookahead))
+    synth_tasks = set()
+
+    async def _synthesize_into(phrase: str, sink: asyncio.Queue):
+        try:
+            await synthesize(phrase, sink)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Skip the phrase rather than cutting off the rest of the answer
+            logger.error(f"[{name}] Synthesis failed for phrase '{phrase[:40]}': {e}")
+        finally:
+            sink.put_nowait(None)
+
+    async def _read_phrases():
+        while not stop_event.is_set():
+            phrase = await phrase_queue.get()
+            if phrase is None:
+                break
+            phrase = phrase.strip()
+            if not phrase:
+                continue
+
+            sink: asyncio.Queue = asyncio.Queue()
+            # Waits while `lookahead` phrases are already queued ahead of the writer
+            await pending.put(sink)
+            task = asyncio.create_task(_synthesize_into(phrase, sink))
+            synth_tasks.add(task)
+            task.add_done_callback(synth_tasks.discard)
+        # Not in a finally: when cancelled, the writer is cancelled in the same
+        # step and would never make room in a full queue for the end marker
+        await pending.put(None)
+
+    async def _write_audio():
+        while True:
+            sink = await pending.get()
+            if sink is None:
+                return
+            while True:
+                chunk = await sink.get()
+                if chunk is None:
+                    break
+                await audio_queue.put(chunk)
+
+    reader = asyncio.create_task(_read_phrases())
+    writer = asyncio.create_task(_write_audio())
+    stopper = asyncio.create_task(stop_event.wait())
+    try:
+        await asyncio.wait({writer, stopper}, return_when=asyncio.FIRST_COMPLETED)
+        if stop_event.is_set():
+            logger.debug(f"[{name}] Stop requested, cancelling {len(synth_tasks)} in-flight phrase(s)")
+    finally:
+        tasks = [reader, writer, stopper, *synth_tasks]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await audio_queue.put(None)
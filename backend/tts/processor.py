@@ -4,25 +4,46 @@ import logging
 from backend.config.config import CONFIG
 from backend.tts.azuretts import AzureTTS
 from backend.tts.openaitts import OpenAITTS
+from backend.tts.opus_codec import encode_opus_stream, opus_available
 
 logger = logging.getLogger(__name__)
 
 
-def format_audio_message(audio_data: bytes) -> bytes:
-    """Ensures consistent audio message formatting with the 'audio:' prefix"""
-    if audio_data is None:
-        return b"audio:"  # End of stream marker
-    return (
-        b"audio:" + audio_data if not audio_data.startswith(b"audio:") else audio_data
-    )
+def get_playback_rate() -> int:
+    """Sample rate of the PCM the configured TTS provider produces."""
+    if CONFIG["TTS_MODELS"]["PROVIDER"].lower() == "openai":
+        return CONFIG["TTS_MODELS"]["OPENAI_TTS"]["PLAYBACK_RATE"]
+    return CONFIG["TTS_MODELS"]["AZURE_TTS"]["PLAYBACK_RATE"]
+
+
+def select_audio_codec(client_codecs) -> str:
+    """
+    Pick the audio transport codec for a client.
+
+    Args:
+        client_codecs: Codecs the frontend said it can decode
+
+    Returns:
+        "opus" if configured and supported by both ends, otherwise "pcm"
+    """
+    if CONFIG["AUDIO_TRANSPORT"]["CODEC"] != "opus" or "opus" not in client_codecs:
+        return "pcm"
+    if not opus_available(get_playback_rate()):
+        logger.warning("Opus transport requested but unavailable here, using PCM")
+        return "pcm"
+    return "opus"
 
 
 async def process_streams(
-    phrase_queue: asyncio.Queue, audio_queue: asyncio.Queue, stop_event: asyncio.Event
+    phrase_queue: asyncio.Queue,
+    audio_queue: asyncio.Queue,
+    stop_event: asyncio.Event,
+    audio_codec: str = "pcm",
 ):
     """
     Orchestrates TTS tasks, with an external stop_event.
     Ensures that a termination signal is sent to the audio_queue.
+    With audio_codec "opus" the PCM is encoded before it reaches audio_queue.
     """
     logger.debug(f"TTS enabled: {CONFIG['GENERAL_AUDIO']['TTS_ENABLED']}")
     logger.debug(f"TTS provider: {CONFIG['TTS_MODELS']['PROVIDER']}")
@@ -36,19 +57,28 @@ async def process_streams(
         await audio_queue.put(None)
         return
 
+    # The TTS processor writes PCM; in Opus mode an encoder sits in between
+    tts_queue = audio_queue
+    encoder_task = None
+    if audio_codec == "opus":
+        tts_queue = asyncio.Queue()
+        encoder_task = asyncio.create_task(
+            encode_opus_stream(tts_queue, audio_queue, get_playback_rate())
+        )
+
     try:
         provider = CONFIG["TTS_MODELS"]["PROVIDER"].lower()
         if provider == "azure":
             from backend.tts.azuretts import azure_text_to_speech_processor
 
             tts_task = azure_text_to_speech_processor(
-                phrase_queue, audio_queue, stop_event
+                phrase_queue, tts_queue, stop_event
             )
         elif provider == "openai":
             from backend.tts.openaitts import openai_text_to_speech_processor
 
             tts_task = openai_text_to_speech_processor(
-                phrase_queue, audio_queue, stop_event
+                phrase_queue, tts_queue, stop_event
             )
         else:
             logger.error(f"Unknown TTS provider: {provider}")
@@ -63,6 +93,9 @@ async def process_streams(
     finally:
         # Signal termination
         logger.debug("Signaling audio queue termination")
+        if encoder_task is not None:
+            await tts_queue.put(None)
+            await asyncio.gather(encoder_task, return_exceptions=True)
         await audio_queue.put(None)
 
 
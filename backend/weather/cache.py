@@ -0,0 +1,152 @@
+"""
+Location-keyed read-through cache for weather data.
+
+The periodic updater, the /api/weather endpoints and the LLM weather tools all
+read through this cache, so a weather question costs no HTTP round-trips while
+the data for that location is still fresh.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from backend.weather.fetcher import DEFAULT_LAT, DEFAULT_LON, fetch_weather_data
+from backend.weather.openweather_fetcher import fetch_openweather_data
+
+logger = logging.getLogger(__name__)
+
+# Data sources
+NWS = "nws"
+OPENWEATHER = "openweather"
+
+# Seconds a cache entry counts as fresh for each source
+MAX_AGE: Dict[str, float] = {
+    NWS: 1800,  # Matches the periodic update interval
+    OPENWEATHER: 900,  # Current conditions change faster
+}
+
+# Coordinates are rounded to this many decimals (~1 km) to build the cache key
+LOCATION_PRECISION = 2
+
+_FETCHERS: Dict[str, Callable[[str, str], Awaitable[Optional[dict]]]] = {
+    NWS: fetch_weather_data,
+    OPENWEATHER: fetch_openweather_data,
+}
+
+
+class CacheEntry:
+    """A cached weather payload plus when it was fetched."""
+
+    def __init__(self, data: dict):
+        self.data = data
+        self.fetched_at = time.monotonic()
+        self.fetched_at_utc = datetime.now(timezone.utc)
+
+    def age(self) -> float:
+        return time.monotonic() - self.fetched_at
+
+    def is_fresh(self, max_age: float) -> bool:
+        return self.age() < max_age
+
+
+class WeatherCache:
+    """
+    Read-through cache keyed by (source, rounded lat, rounded lon).
+
+    Concurrent misses for the same key share a single fetch. If a refresh fails,
+    the last known data is served (stale) rather than nothing.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, float, float], CacheEntry] = {}
+        self._locks: Dict[Tuple[str, float, float], asyncio.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(source: str, lat, lon) -> Tuple[str, float, float]:
+        return (
+            source,
+            round(float(lat), LOCATION_PRECISION),
+            round(float(lon), LOCATION_PRECISION),
+        )
+
+    async def get(
+        self,
+        source: str,
+        lat=DEFAULT_LAT,
+        lon=DEFAULT_LON,
+        max_age: Optional[float] = None,
+        force: bool = False,
+    ) -> Optional[dict]:
+        """
+        Return weather data for a location, fetching it only when needed.
+
+        Args:
+            source: NWS or OPENWEATHER
+            lat: Latitude as a string or number
+            lon: Longitude as a string or number
+            max_age: Freshness limit in seconds (defaults to MAX_AGE[source])
+            force: Always refetch (the periodic updater and /weather/refresh use this)
+
+        Returns:
+            The cached or freshly fetched data, or None if nothing is available.
+        """
+        key = self._key(source, lat, lon)
+        max_age = MAX_AGE[source] if max_age is None else max_age
+
+        entry = self._entries.get(key)
+        if not force and entry and entry.is_fresh(max_age):
+            self.hits += 1
+            logger.debug(f"Weather cache hit for {key} (age {entry.age():.0f}s)")
+            return entry.data
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            # Another caller may have refreshed the entry while we waited
+            entry = self._entries.get(key)
+            if not force and entry and entry.is_fresh(max_age):
+                self.hits += 1
+                return entry.data
+
+            self.misses += 1
+            logger.info(f"Weather cache miss for {key}, fetching")
+            data = await _FETCHERS[source](str(lat), str(lon))
+            if data:
+                self._entries[key] = CacheEntry(data)
+                return data
+
+            if entry:
+                logger.warning(f"Weather fetch for {key} failed, serving stale data ({entry.age():.0f}s old)")
+                return entry.data
+            return None
+
+    def put(self, source: str, lat, lon, data: dict) -> None:
+        """Store data fetched elsewhere."""
+        self._entries[self._key(source, lat, lon)] = CacheEntry(data)
+
+    def freshness(self, source: str, lat=DEFAULT_LAT, lon=DEFAULT_LON) -> Optional[Dict[str, Any]]:
+        """
+        Describe how fresh the cached data for a location is.
+
+        Returns:
+            Dictionary with "fetched_at" (ISO 8601), "age_seconds" and "fresh",
+            or None if nothing is cached for the location.
+        """
+        entry = self._entries.get(self._key(source, lat, lon))
+        if entry is None:
+            return None
+        return {
+            "fetched_at": entry.fetched_at_utc.isoformat(),
+            "age_seconds": round(entry.age(), 1),
+            "fresh": entry.is_fresh(MAX_AGE[source]),
+        }
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+# Create a singleton instance
+weather_cache = WeatherCache()
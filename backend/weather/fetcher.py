@@ -4,6 +4,8 @@ import logging
 import asyncio
 from dotenv import load_dotenv
 
+from backend.weather.nws_cache import conditional_cache, get_nws_cache_metrics, resolution_cache
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -102,6 +104,80 @@ async def fetch_sunrise_sunset(lat: str, lon: str) -> dict | None:
     return None
 
 
+async def _resolve_forecast_urls(client, base_url: str, headers: dict, lat: str, lon: str) -> dict | None:
+    """
+    Resolve the forecast, hourly and grid URLs for a point.
+    Uses the persistent resolution cache and only calls /points on a miss.
+    """
+    cached = resolution_cache.get(lat, lon)
+    if cached and all(cached.get(k) for k in ("forecast", "forecastHourly", "forecastGridData")):
+        logger.debug(f"Using cached gridpoint resolution for lat={lat}, lon={lon}")
+        return cached
+
+    points_url = f"{base_url}/points/{lat},{lon}"
+    logger.info(f"Fetching gridpoints for Winter Park lat={lat}, lon={lon} from {points_url}")
+    points_response = await client.get(points_url, headers=headers)
+    points_response.raise_for_status()
+    properties = points_response.json().get("properties", {})
+
+    return resolution_cache.put(
+        lat,
+        lon,
+        forecast=properties.get("forecast"),
+        forecastHourly=properties.get("forecastHourly"),
+        forecastGridData=properties.get("forecastGridData"),
+    )
+
+
+async def _resolve_observation_station(client, base_url: str, headers: dict) -> dict | None:
+    """
+    Resolve the observation station near KMCO.
+    Uses the persistent resolution cache and only calls /points and the
+    station list on a miss.
+    """
+    cached = resolution_cache.get(KMCO_LAT, KMCO_LON)
+    if cached and cached.get("station_url"):
+        logger.debug(f"Using cached observation station {cached.get('station_id')}")
+        return cached
+
+    kmco_points_url = f"{base_url}/points/{KMCO_LAT},{KMCO_LON}"
+    logger.info(f"Fetching gridpoints for KMCO lat={KMCO_LAT}, lon={KMCO_LON} from {kmco_points_url}")
+    kmco_points_response = await client.get(kmco_points_url, headers=headers)
+    kmco_points_response.raise_for_status()
+    observation_stations_url = kmco_points_response.json().get("properties", {}).get("observationStations")
+    if not observation_stations_url:
+        return None
+
+    stations_response = await client.get(observation_stations_url, headers=headers)
+    stations_response.raise_for_status()
+    features = stations_response.json().get("features") or []
+    if not features:
+        return None
+
+    # Look for KMCO station in the list or use the first one as fallback
+    station = None
+    for feature in features:
+        if feature["properties"].get("stationIdentifier", "") == "KMCO":
+            logger.info("Found KMCO station in observation stations list")
+            station = feature
+            break
+    if not station:
+        logger.info("KMCO station not found, using first available station")
+        station = features[0]
+
+    station_url = station["properties"].get("@id") or station.get("id")
+    if not station_url:
+        return None
+
+    return resolution_cache.put(
+        KMCO_LAT,
+        KMCO_LON,
+        observationStations=observation_stations_url,
+        station_url=station_url,
+        station_id=station["properties"].get("stationIdentifier", "Unknown"),
+    )
+
+
 async def fetch_weather_data(
     lat: str = DEFAULT_LAT, lon: str = DEFAULT_LON
 ) -> dict | None:
@@ -109,6 +185,10 @@ async def fetch_weather_data(
     Fetches weather data from National Weather Service API.
     Uses Winter Park for forecasts but gets observations from KMCO.
 
+    Gridpoint and station resolution comes from a persistent cache, and the
+    forecast/observation products are fetched with conditional GETs, so an
+    unchanged product costs a 304 instead of a full download.
+
     Args:
         lat: Latitude for the weather location (forecasts).
         lon: Longitude for the weather location (forecasts).
@@ -131,155 +211,95 @@ async def fetch_weather_data(
     try:
         # Create a client with extended timeout for NWS API
         client = await get_http_client(timeout=15.0)
-            
-        # First, get the grid point information for Winter Park (for forecasts)
-        points_url = f"{base_url}/points/{lat},{lon}"
-        logger.info(f"Fetching gridpoints for Winter Park lat={lat}, lon={lon} from {points_url}")
-        
-        # Use explicit timeout for each request stage
-        points_response = await asyncio.wait_for(
-            client.get(points_url, headers=headers),
-            timeout=12.0
-        )
-        points_response.raise_for_status()
-        points_data = points_response.json()
-
-        # Extract URLs for all needed forecast endpoints
-        properties = points_data.get("properties", {})
-        forecast_url = properties.get("forecast")
-        forecast_hourly_url = properties.get("forecastHourly")
-        grid_forecast_url = properties.get("forecastGridData")
-        
-        # Now get grid point information for KMCO (for observations)
-        kmco_points_url = f"{base_url}/points/{KMCO_LAT},{KMCO_LON}"
-        logger.info(f"Fetching gridpoints for KMCO lat={KMCO_LAT}, lon={KMCO_LON} from {kmco_points_url}")
-        
-        kmco_points_response = await asyncio.wait_for(
-            client.get(kmco_points_url, headers=headers),
-            timeout=12.0
+
+        # Resolve forecast URLs (Winter Park) and the observation station (KMCO) concurrently
+        forecast_urls, station = await asyncio.wait_for(
+            asyncio.gather(
+                _resolve_forecast_urls(client, base_url, headers, lat, lon),
+                _resolve_observation_station(client, base_url, headers),
+            ),
+            timeout=24.0
         )
-        kmco_points_response.raise_for_status()
-        kmco_points_data = kmco_points_response.json()
-        
-        # Get observation stations URL for KMCO
-        kmco_properties = kmco_points_data.get("properties", {})
-        observation_stations_url = kmco_properties.get("observationStations")
-        
+
         # Validate all required URLs are present
-        if not all([forecast_url, forecast_hourly_url, grid_forecast_url, observation_stations_url]):
-            logger.error("One or more required URLs not found in points responses")
+        if not forecast_urls or not all(
+            forecast_urls.get(k) for k in ("forecast", "forecastHourly", "forecastGridData")
+        ):
+            logger.error("One or more required forecast URLs not found in points response")
             return None
 
         # Create tasks for concurrent fetching
-        forecast_task = client.get(forecast_url, headers=headers)
-        forecast_hourly_task = client.get(forecast_hourly_url, headers=headers)
-        grid_forecast_task = client.get(grid_forecast_url, headers=headers)
-        stations_task = client.get(observation_stations_url, headers=headers)
-        
+        forecast_task = conditional_cache.get_json(client, forecast_urls["forecast"], headers)
+        forecast_hourly_task = conditional_cache.get_json(client, forecast_urls["forecastHourly"], headers)
+        grid_forecast_task = conditional_cache.get_json(client, forecast_urls["forecastGridData"], headers)
+
+        # Observations no longer wait for the station lookup once it is cached
+        if station:
+            logger.info(f"Using observation station: {station.get('station_id', 'Unknown')}")
+            observations_task = conditional_cache.get_json(
+                client, f"{station['station_url']}/observations/latest", headers
+            )
+        else:
+            logger.error("No observation station available")
+            observations_task = asyncio.sleep(0, result={})
+
         # Also fetch sunrise/sunset data
         sunrise_sunset_task = fetch_sunrise_sunset(lat, lon)
-        
+
         logger.info(f"Fetching all forecast data concurrently")
-        
+
         # Use wait_for with gather to apply timeout to all concurrent tasks
         responses = await asyncio.wait_for(
             asyncio.gather(
                 forecast_task,
                 forecast_hourly_task,
                 grid_forecast_task,
-                stations_task,
+                observations_task,
                 sunrise_sunset_task,
                 return_exceptions=True
             ),
             timeout=20.0  # Overall timeout for all parallel requests
         )
-        
-        # Check for exceptions
+
+        # Check for exceptions; continue with the others to get partial data
         for i, resp in enumerate(responses):
             if isinstance(resp, Exception):
                 logger.error(f"Error in concurrent request {i}: {resp}")
-                # Continue with others rather than returning None immediately
-        
-        # Process responses
-        forecast_response, forecast_hourly_response, grid_forecast_response, stations_response, sunrise_sunset_data = responses
-        
-        # Validate HTTP responses
-        for i, resp in enumerate([forecast_response, forecast_hourly_response, grid_forecast_response, stations_response]):
-            if isinstance(resp, Exception):
-                logger.error(f"Request {i} failed: {resp}")
-                continue  # Try to continue with other data
-            
-            # Only raise_for_status if not an exception
-            if not isinstance(resp, Exception):
-                resp.raise_for_status()
-        
-        # Only process data if we have valid responses
-        if (isinstance(forecast_response, Exception) or
-            isinstance(forecast_hourly_response, Exception) or
-            isinstance(grid_forecast_response, Exception) or
-            isinstance(stations_response, Exception)):
-            logger.error("One or more critical weather API requests failed")
-            # Continue anyway to get partial data
-        
-        # Parse JSON data from valid responses
-        forecast_data = forecast_response.json() if not isinstance(forecast_response, Exception) else {}
-        forecast_hourly_data = forecast_hourly_response.json() if not isinstance(forecast_hourly_response, Exception) else {}
-        grid_forecast_data = grid_forecast_response.json() if not isinstance(grid_forecast_response, Exception) else {}
-        stations_data = stations_response.json() if not isinstance(stations_response, Exception) else {}
-
-        # Process stations data from KMCO (if available)
-        if not isinstance(stations_response, Exception) and stations_data.get("features") and len(stations_data["features"]) > 0:
-            # Look for KMCO station in the list or use the first one as fallback
-            station = None
-            for feature in stations_data["features"]:
-                station_id = feature["properties"].get("stationIdentifier", "")
-                if station_id == "KMCO":
-                    logger.info("Found KMCO station in observation stations list")
-                    station = feature
-                    break
-            
-            # If KMCO not found, use the first station as fallback
-            if not station:
-                logger.info("KMCO station not found, using first available station")
-                station = stations_data["features"][0]
-                
-            station_url = station["properties"].get("@id") or station.get("id")
-            if station_url:
-                station_id = station["properties"].get("stationIdentifier", "Unknown")
-                logger.info(f"Using observation station: {station_id}")
-
-                observations_url = f"{station_url}/observations/latest"
-                logger.info(f"Fetching latest observations from {observations_url}")
-                
-                try:
-                    obs_response = await asyncio.wait_for(
-                        client.get(observations_url, headers=headers),
-                        timeout=10.0
-                    )
-                    obs_response.raise_for_status()
-                    obs_data = obs_response.json()
-                    
-                    # Return the combined data
-                    combined_data = {
-                        "properties": obs_data.get("properties", {}),
-                        "forecast": forecast_data,
-                        "forecast_hourly": forecast_hourly_data,
-                        "grid_forecast": grid_forecast_data,
-                        "sunrise_sunset": sunrise_sunset_data
-                    }
-                    logger.info(f"Successfully fetched observations from {station_id} and forecast data for Winter Park")
-                    return combined_data
-                    
-                except (asyncio.TimeoutError, httpx.RequestError, httpx.HTTPStatusError) as e:
-                    logger.error(f"Error fetching observations: {e}")
-                    # Return partial data even if observations fail
-                    return {
-                        "properties": {},
-                        "forecast": forecast_data,
-                        "forecast_hourly": forecast_hourly_data,
-                        "grid_forecast": grid_forecast_data,
-                        "sunrise_sunset": sunrise_sunset_data
-                    }
+
+        forecast_data, forecast_hourly_data, grid_forecast_data, obs_data, sunrise_sunset_data = [
+            {} if isinstance(resp, Exception) else resp for resp in responses[:4]
+        ] + [None if isinstance(responses[4], Exception) else responses[4]]
+
+        # A 404 on a cached forecast URL means the grid assignment moved
+        if any(
+            isinstance(resp, httpx.HTTPStatusError) and resp.response.status_code == 404
+            for resp in responses[:3]
+        ):
+            resolution_cache.invalidate(lat, lon)
+        if isinstance(responses[3], httpx.HTTPStatusError) and responses[3].response.status_code == 404:
+            resolution_cache.invalidate(KMCO_LAT, KMCO_LON)
+
+        # No forecast product at all (e.g. network down): report a failure so
+        # the weather cache keeps serving its last good entry instead
+        if all(isinstance(resp, Exception) for resp in responses[:3]):
+            logger.error("All forecast requests failed")
+            return None
+
+        metrics = get_nws_cache_metrics()
+        logger.info(
+            f"NWS cache: resolution hit rate {metrics['resolution_hit_rate']:.0%}, "
+            f"304 rate {metrics['conditional_hit_rate']:.0%}, "
+            f"{metrics['bytes_saved']} bytes saved, {metrics['bytes_transferred']} bytes transferred"
+        )
+
+        # Return the combined data - partial data even if observations failed
+        return {
+            "properties": obs_data.get("properties", {}),
+            "forecast": forecast_data,
+            "forecast_hourly": forecast_hourly_data,
+            "grid_forecast": grid_forecast_data,
+            "sunrise_sunset": sunrise_sunset_data
+        }
 
     except asyncio.TimeoutError:
         logger.error("Timeout fetching weather data")
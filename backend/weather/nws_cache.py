@@ -0,0 +1,172 @@
+"""
+Caching helpers for the National Weather Service API.
+
+- ResolutionCache: persists the /points -> forecast/hourly/grid/station URL
+  resolution on disk, since those answers almost never change.
+- ConditionalCache: remembers ETag/Last-Modified validators and bodies so that
+  unchanged forecast products come back as cheap 304 responses.
+"""
+
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Where the resolved NWS URLs are persisted between restarts
+RESOLUTION_CACHE_PATH = os.getenv(
+    "NWS_RESOLUTION_CACHE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "nws_resolution_cache.json"),
+)
+
+# Gridpoint/station assignments change very rarely
+RESOLUTION_TTL_SECONDS = 7 * 24 * 3600
+
+
+class ResolutionCache:
+    """
+    Persistent cache of NWS point resolutions keyed by "lat,lon".
+    """
+
+    def __init__(self, path: str = RESOLUTION_CACHE_PATH, ttl: float = RESOLUTION_TTL_SECONDS):
+        self.path = path
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self._load()
+
+    @staticmethod
+    def _key(lat: str, lon: str) -> str:
+        return f"{lat},{lon}"
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._entries = json.load(f)
+            logger.info(f"Loaded {len(self._entries)} NWS point resolutions from {self.path}")
+        except FileNotFoundError:
+            self._entries = {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not read NWS resolution cache {self.path}: {e}")
+            self._entries = {}
+
+    def _save(self) -> None:
+        tmp_path = f"{self.path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.warning(f"Could not write NWS resolution cache {self.path}: {e}")
+
+    def get(self, lat: str, lon: str) -> Optional[Dict[str, Any]]:
+        """Return the cached resolution for a point, or None if missing or expired."""
+        entry = self._entries.get(self._key(lat, lon))
+        if entry and time.time() - entry.get("resolved_at", 0) < self.ttl:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def put(self, lat: str, lon: str, **urls: Optional[str]) -> Dict[str, Any]:
+        """Store (or extend) the resolution for a point and persist it."""
+        key = self._key(lat, lon)
+        entry = dict(self._entries.get(key, {}))
+        entry.update({k: v for k, v in urls.items() if v})
+        entry["resolved_at"] = time.time()
+        self._entries[key] = entry
+        self._save()
+        return entry
+
+    def invalidate(self, lat: str, lon: str) -> None:
+        """Forget a point, e.g. after one of its URLs stopped working."""
+        if self._entries.pop(self._key(lat, lon), None) is not None:
+            logger.info(f"Invalidated NWS resolution for {lat},{lon}")
+            self._save()
+
+
+class ConditionalCache:
+    """
+    In-memory store of response validators and bodies for conditional GETs.
+    """
+
+    def __init__(self):
+        self._entries: Dict[str, Dict[str, Any]] = {}
+        self.not_modified = 0
+        self.modified = 0
+        self.bytes_saved = 0
+        self.bytes_transferred = 0
+
+    async def get_json(self, client: httpx.AsyncClient, url: str, headers: Dict[str, str]) -> Any:
+        """
+        GET a JSON resource, revalidating a previously seen copy.
+
+        Returns:
+            The parsed JSON body (cached body on 304).
+
+        Raises:
+            httpx.HTTPStatusError: For error responses
+        """
+        request_headers = dict(headers)
+        cached = self._entries.get(url)
+        if cached:
+            if cached.get("etag"):
+                request_headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                request_headers["If-Modified-Since"] = cached["last_modified"]
+
+        response = await client.get(url, headers=request_headers)
+
+        if response.status_code == 304 and cached:
+            self.not_modified += 1
+            self.bytes_saved += cached["size"]
+            logger.debug(f"NWS 304 Not Modified: {url}")
+            return cached["body"]
+
+        response.raise_for_status()
+        content = response.content
+        body = response.json()
+        self.modified += 1
+        self.bytes_transferred += len(content)
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self._entries[url] = {
+                "etag": etag,
+                "last_modified": last_modified,
+                "body": body,
+                "size": len(content),
+            }
+        return body
+
+
+# Shared instances
+resolution_cache = ResolutionCache()
+conditional_cache = ConditionalCache()
+
+
+def get_nws_cache_metrics() -> Dict[str, Any]:
+    """
+    Summarize how effective the NWS caches are.
+
+    Returns:
+        Dictionary with resolution hit rate and conditional GET statistics.
+    """
+    lookups = resolution_cache.hits + resolution_cache.misses
+    requests = conditional_cache.not_modified + conditional_cache.modified
+    return {
+        "resolution_hits": resolution_cache.hits,
+        "resolution_misses": resolution_cache.misses,
+        "resolution_hit_rate": round(resolution_cache.hits / lookups, 3) if lookups else 0.0,
+        "conditional_not_modified": conditional_cache.not_modified,
+        "conditional_modified": conditional_cache.modified,
+        "conditional_hit_rate": round(conditional_cache.not_modified / requests, 3) if requests else 0.0,
+        "bytes_saved": conditional_cache.bytes_saved,
+        "bytes_transferred": conditional_cache.bytes_transferred,
+    }
@@ -0,0 +1,151 @@
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Conversations idle for longer than this are dropped
+CONVERSATION_TTL_SECONDS = 6 * 3600
+
+# Upper bound on conversations kept in memory (least recently used go first)
+MAX_CONVERSATIONS = 32
+
+
+class ConversationOutOfSync(Exception):
+    """Raised when a delta does not start where the server's copy ends."""
+
+    def __init__(self, conversation_id: str, expected_seq: int, received_seq: int):
+        super().__init__(
+            f"Conversation {conversation_id} is at seq {expected_seq}, delta starts at {received_seq}"
+        )
+        self.conversation_id = conversation_id
+        self.expected_seq = expected_seq
+        self.received_seq = received_seq
+
+
+class Conversation:
+    """
+    Server-side copy of one conversation.
+
+    Messages are stored already validated in OpenAI format (role/content),
+    without the system prompt. The sequence number of a message is its
+    1-based position, so `seq` is the number of messages stored.
+    """
+
+    def __init__(self, conversation_id: str):
+        self.conversation_id = conversation_id
+        self.messages: List[Dict[str, Any]] = []
+        self.last_active = time.monotonic()
+        # Rolling summary of the messages that fell out of the context window
+        self.summary: Optional[str] = None
+        self.summary_seq = 0  # Number of leading messages the summary covers
+        self.summary_task = None
+
+    @property
+    def seq(self) -> int:
+        return len(self.messages)
+
+    def touch(self):
+        self.last_active = time.monotonic()
+
+
+class ConversationStore:
+    """
+    In-memory conversations keyed by client-generated conversation id.
+
+    Conversations outlive websocket connections, so a client that reconnects
+    keeps sending deltas against the same history.
+    """
+
+    def __init__(self, ttl: float = CONVERSATION_TTL_SECONDS, max_conversations: int = MAX_CONVERSATIONS):
+        self.ttl = ttl
+        self.max_conversations = max_conversations
+        self._conversations: "OrderedDict[str, Conversation]" = OrderedDict()
+        logger.info("[ConversationStore] Initialized")
+
+    def get(self, conversation_id: str) -> Optional[Conversation]:
+        self._evict_expired()
+        conversation = self._conversations.get(conversation_id)
+        if conversation is not None:
+            self._conversations.move_to_end(conversation_id)
+            conversation.touch()
+        return conversation
+
+    def append(self, conversation_id: str, base_seq: int, messages: List[Dict[str, Any]]) -> Conversation:
+        """
+        Append a delta of validated messages to a conversation.
+
+        Args:
+            conversation_id: Client-generated conversation id
+            base_seq: Number of messages the client believes the server already has
+            messages: The new messages, in order
+
+        Returns:
+            The updated conversation
+
+        Raises:
+            ConversationOutOfSync: If base_seq does not match the stored history
+        """
+        conversation = self.get(conversation_id)
+        if conversation is None:
+            if base_seq != 0:
+                raise ConversationOutOfSync(conversation_id, 0, base_seq)
+            conversation = self._create(conversation_id)
+
+        if base_seq != conversation.seq:
+            raise ConversationOutOfSync(conversation_id, conversation.seq, base_seq)
+
+        conversation.messages.extend(messages)
+        logger.debug(
+            f"[ConversationStore] Appended {len(messages)} message(s) to {conversation_id}, seq now {conversation.seq}"
+        )
+        return conversation
+
+    def replace(self, conversation_id: str, messages: List[Dict[str, Any]]) -> Conversation:
+        """Replace a conversation's history with a full copy sent by the client (resync)."""
+        conversation = self.get(conversation_id) or self._create(conversation_id)
+        conversation.messages = list(messages)
+        conversation.summary = None
+        conversation.summary_seq = 0
+        logger.info(f"[ConversationStore] Resynced {conversation_id} with {conversation.seq} message(s)")
+        return conversation
+
+    def append_reply(self, conversation_id: str, content: str) -> Optional[int]:
+        """
+        Record the assistant's completed reply.
+
+        Returns:
+            The new sequence number, or None if the conversation is gone
+        """
+        conversation = self._conversations.get(conversation_id)
+        if conversation is None or not content.strip():
+            return None
+        conversation.messages.append({"role": "assistant", "content": content})
+        conversation.touch()
+        return conversation.seq
+
+    def remove(self, conversation_id: str):
+        if self._conversations.pop(conversation_id, None) is not None:
+            logger.info(f"[ConversationStore] Conversation {conversation_id} removed")
+
+    def _create(self, conversation_id: str) -> Conversation:
+        conversation = Conversation(conversation_id)
+        self._conversations[conversation_id] = conversation
+        while len(self._conversations) > self.max_conversations:
+            evicted_id, _ = self._conversations.popitem(last=False)
+            logger.info(f"[ConversationStore] Evicted least recently used conversation {evicted_id}")
+        return conversation
+
+    def _evict_expired(self):
+        now = time.monotonic()
+        expired = [
+            cid for cid, conv in self._conversations.items() if now - conv.last_active > self.ttl
+        ]
+        for cid in expired:
+            del self._conversations[cid]
+            logger.info(f"[ConversationStore] Conversation {cid} expired")
+
+
+# Create a singleton instance
+conversation_store = ConversationStore()
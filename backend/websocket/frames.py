@@ -0,0 +1,108 @@
+"""
+Binary frame protocol for streaming audio over the chat websocket.
+
+Every binary websocket message is one frame:
+
+    | type (u8) | flags (u8) | stream id (u16) | seq (u32) | length (u32) | payload |
+
+All header fields are big-endian. A stream is one chat turn; seq counts the
+frames of a stream starting at 0. AUDIO frames carry PCM (or Opus packets
+when FLAG_OPUS is set), END marks the normal end of a stream's audio and ABORT
+marks a stream that was stopped.
+
+Text chunks stay JSON text messages (compressed by permessage-deflate) and
+carry the same stream id.
+"""
+import asyncio
+import logging
+import struct
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+FRAME_AUDIO = 1
+FRAME_END = 2
+FRAME_ABORT = 3
+
+# Frame flags
+FLAG_OPUS = 0x01  # AUDIO payload is a bundle of Opus packets instead of PCM
+
+HEADER = struct.Struct("!BBHII")
+HEADER_SIZE = HEADER.size
+
+
+def encode_frame(frame_type: int, stream_id: int, seq: int, payload=b"", flags: int = 0) -> bytearray:
+    """
+    Build a frame in a single buffer.
+
+    The payload is copied once, straight from a memoryview into the frame;
+    no intermediate prefix concatenation.
+    """
+    view = memoryview(payload)
+    frame = bytearray(HEADER_SIZE + view.nbytes)
+    HEADER.pack_into(frame, 0, frame_type, flags, stream_id & 0xFFFF, seq & 0xFFFFFFFF, view.nbytes)
+    frame[HEADER_SIZE:] = view.cast("B")
+    return frame
+
+
+class StreamWriter:
+    """
+    Writes one chat turn's audio frames and text chunks to a websocket.
+
+    Sends are serialized so frames go out in seq order. Text chunks that arrive
+    while a send is in progress are coalesced into the next message, which
+    keeps the number of websocket messages per answer down on slow links.
+    """
+
+    def __init__(self, websocket, stream_id: int, audio_flags: int = 0):
+        self.websocket = websocket
+        self.stream_id = stream_id
+        self.audio_flags = audio_flags
+        self._seq = 0
+        self._send_lock = asyncio.Lock()
+        self._pending_text: List[str] = []
+        self._flush_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def _send_frame(self, frame_type: int, payload=b"", flags: int = 0):
+        async with self._send_lock:
+            frame = encode_frame(frame_type, self.stream_id, self._seq, payload, flags)
+            self._seq += 1
+            await self.websocket.send_bytes(frame)
+
+    async def send_audio(self, audio_data):
+        if self._closed:
+            return
+        await self._send_frame(FRAME_AUDIO, audio_data, self.audio_flags)
+
+    async def end(self):
+        """Mark the end of this stream's audio (idempotent)."""
+        if not self._closed:
+            self._closed = True
+            await self._send_frame(FRAME_END)
+
+    async def abort(self):
+        """Mark this stream as stopped (idempotent)."""
+        if not self._closed:
+            self._closed = True
+            await self._send_frame(FRAME_ABORT)
+
+    def queue_text(self, text: str):
+        """Queue a text chunk; it is sent as soon as the socket is free."""
+        self._pending_text.append(text)
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_text())
+
+    async def _flush_text(self):
+        while self._pending_text:
+            async with self._send_lock:
+                content = "".join(self._pending_text)
+                self._pending_text.clear()
+                await self.websocket.send_json(
+                    {"content": content, "is_chunk": True, "stream_id": self.stream_id}
+                )
+
+    async def flush_text(self):
+        """Wait until all queued text chunks have been sent."""
+        if self._flush_task is not None:
+            await self._flush_task
@@ -0,0 +1,161 @@
+import asyncio
+import logging
+import uuid
+from typing import Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+
+class ChatSession:
+    """
+    Per-connection chat state.
+
+    Each websocket connection gets its own cancellation tokens, phrase/audio
+    queues and task set so that one client starting or stopping a chat never
+    affects another client's stream.
+    """
+
+    def __init__(self, websocket):
+        self.session_id = uuid.uuid4().hex
+        self.websocket = websocket
+        self.stop_event = asyncio.Event()  # Cancels text generation (and TTS)
+        self.tts_stop_event = asyncio.Event()  # Cancels audio forwarding only
+        self.phrase_queue: asyncio.Queue = asyncio.Queue()
+        self.audio_queue: asyncio.Queue = asyncio.Queue()
+        self._tasks: Set[asyncio.Task] = set()
+        self._generation_task: Optional[asyncio.Task] = None
+        self._stream_id = 0
+        self.audio_codecs = {"pcm"}  # Audio codecs the client can decode
+
+    def begin_generation(self):
+        """
+        Reset the session for a new chat turn.
+        Clears the cancellation tokens and creates fresh queues.
+        """
+        self.stop_event.clear()
+        self.tts_stop_event.clear()
+        self.phrase_queue = asyncio.Queue()
+        self.audio_queue = asyncio.Queue()
+
+    def next_stream_id(self) -> int:
+        """Allocate the frame stream id for the next chat turn (wraps at 16 bits)."""
+        self._stream_id = (self._stream_id + 1) & 0xFFFF
+        return self._stream_id
+
+    def create_task(self, coro) -> asyncio.Task:
+        """Create a task owned by this session; it is cancelled when the session closes."""
+        task = asyncio.create_task(coro)
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+        return task
+
+    def start_generation(self, coro) -> asyncio.Task:
+        """Run a chat turn as a session task and remember it as the active generation."""
+        self._generation_task = self.create_task(coro)
+        return self._generation_task
+
+    def is_generating(self) -> bool:
+        return self._generation_task is not None and not self._generation_task.done()
+
+    async def wait_for_generation(self):
+        """Wait for the active generation (if any) to finish its cleanup."""
+        if self.is_generating():
+            try:
+                await self._generation_task
+            except asyncio.CancelledError:
+                pass
+            except Exception as e:
+                logger.error(f"[SessionManager] Generation task for {self.session_id} failed: {e}")
+
+    def stop_generation(self):
+        """Signal the active generation of this session to stop."""
+        self.stop_event.set()
+
+    def stop_audio(self):
+        """Signal this session to stop forwarding TTS audio."""
+        self.tts_stop_event.set()
+
+    async def close(self):
+        """Stop everything and cancel all tasks owned by this session."""
+        self.stop_event.set()
+        self.tts_stop_event.set()
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._generation_task = None
+
+
+class SessionManager:
+    """
+    Registry of chat sessions keyed by session id.
+    """
+
+    def __init__(self):
+        self._sessions: Dict[str, ChatSession] = {}
+        logger.info("[SessionManager] Initialized")
+
+    def create_session(self, websocket) -> ChatSession:
+        """Create and register a session for a new websocket connection."""
+        session = ChatSession(websocket)
+        self._sessions[session.session_id] = session
+        logger.info(f"[SessionManager] Session {session.session_id} created. Total sessions: {len(self._sessions)}")
+        return session
+
+    def get_session(self, session_id: str) -> Optional[ChatSession]:
+        return self._sessions.get(session_id)
+
+    def get_sessions(self):
+        return list(self._sessions.values())
+
+    async def remove_session(self, session: ChatSession):
+        """Close a session and drop it from the registry."""
+        self._sessions.pop(session.session_id, None)
+        await session.close()
+        logger.info(f"[SessionManager] Session {session.session_id} removed. Remaining sessions: {len(self._sessions)}")
+
+    def stop_generation(self, session_id: Optional[str] = None, all_sessions: bool = False) -> int:
+        """
+        Stop generation for one session, or for every session if all_sessions is set.
+        Without either nothing is stopped.
+
+        Returns:
+            Number of sessions signalled
+        """
+        sessions = self._select(session_id, all_sessions)
+        for session in sessions:
+            session.stop_generation()
+        return len(sessions)
+
+    def stop_audio(self, session_id: Optional[str] = None, all_sessions: bool = False) -> int:
+        """
+        Stop audio forwarding for one session, or for every session if all_sessions is set.
+        Without either nothing is stopped.
+
+        Returns:
+            Number of sessions signalled
+        """
+        sessions = self._select(session_id, all_sessions)
+        for session in sessions:
+            session.stop_audio()
+        return len(sessions)
+
+    def _select(self, session_id: Optional[str], all_sessions: bool):
+        if all_sessions:
+            return self.get_sessions()
+        if session_id is None:
+            # A client without a session id yet (or reconnecting) must not
+            # stop the other clients' streams
+            logger.warning("[SessionManager] Stop requested without a session id; ignored")
+            return []
+        session = self._sessions.get(session_id)
+        if session is None:
+            logger.warning(f"[SessionManager] Unknown session id: {session_id}")
+            return []
+        return [session]
+
+
+# Create a singleton instance
+session_manager = SessionManager()
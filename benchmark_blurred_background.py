@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Benchmark creating the slideshow's blurred backgrounds: the previous
+create_blurred_background (20x20 grid scaled back up to the full photo
+resolution, full-resolution Gaussian blur and brightness enhance) against
+frontend.photo_blur, which works at display resolution.
+
+Reports the time per photo for both, how far the new background is from the
+old one (mean absolute difference per channel, 0-255, after scaling the old
+one to display resolution), and the time to build a whole library serially
+and in the process pool.
+
+Without a folder, synthetic camera-sized JPEGs are generated. Run it on the
+Pi for representative numbers.
+
+Usage:
+    python benchmark_blurred_background.py [folder] [--photos N] [--size WxH] [--workers N]
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from PIL import Image, ImageChops, ImageDraw, ImageEnhance, ImageFilter, ImageStat
+
+from frontend.photo_blur import (
+    IMAGE_EXTENSIONS,
+    create_blurred_background_file,
+    create_blurred_backgrounds,
+)
+
+
+def legacy_blurred_background(image_path, output_path):
+    """The previous create_blurred_background."""
+    img = Image.open(image_path)
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+    small = img.resize((20, 20), Image.LANCZOS)
+    blurred = small.resize(img.size, Image.LANCZOS)
+    blurred = blurred.filter(ImageFilter.GaussianBlur(radius=5))
+    blurred = ImageEnhance.Brightness(blurred).enhance(0.7)
+    blurred.save(output_path, quality=90)
+    return output_path
+
+
+def generate_photos(folder, count, size, seed=1):
+    """Camera-sized JPEGs with shapes and noise, so they compress like photos."""
+    rng = random.Random(seed)
+    paths = []
+    for i in range(count):
+        img = Image.effect_noise(size, 40).convert("RGB")
+        draw = ImageDraw.Draw(img, "RGBA")
+        for _ in range(30):
+            x, y = rng.randrange(size[0]), rng.randrange(size[1])
+            r = rng.randrange(size[0] // 20, size[0] // 3)
+            color = tuple(rng.randrange(256) for _ in range(3)) + (160,)
+            draw.ellipse((x - r, y - r, x + r, y + r), fill=color)
+        path = os.path.join(folder, f"photo{i}.jpg")
+        img.save(path, quality=90)
+        paths.append(path)
+    return paths
+
+
+def difference(legacy_path, new_path):
+    with Image.open(new_path) as new, Image.open(legacy_path) as legacy:
+        legacy = legacy.convert("RGB").resize(new.size, Image.LANCZOS)
+        return sum(ImageStat.Stat(ImageChops.difference(legacy, new.convert("RGB"))).mean) / 3
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("folder", nargs="?", help="Folder with photos (default: generate synthetic ones)")
+    parser.add_argument("--photos", type=int, default=8, help="Number of synthetic photos")
+    parser.add_argument("--size", default="4032x3024", help="Size of the synthetic photos")
+    parser.add_argument("--workers", type=int, default=None, help="Processes for the batch (default: one per CPU)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.folder:
+            paths = sorted(
+                os.path.join(args.folder, name) for name in os.listdir(args.folder)
+                if name.lower().endswith(IMAGE_EXTENSIONS) and not name.endswith("_blurred.jpg")
+            )
+        else:
+            width, height = map(int, args.size.split("x"))
+            paths = generate_photos(tmp, args.photos, (width, height))
+        if not paths:
+            parser.error("no photos found")
+
+        legacy_times, new_times, differences = [], [], []
+        for i, path in enumerate(paths):
+            legacy_path = os.path.join(tmp, f"legacy{i}.jpg")
+            new_path = os.path.join(tmp, f"new{i}.jpg")
+            legacy_times.append(timed(legacy_blurred_background, path, legacy_path)[0])
+            new_times.append(timed(create_blurred_background_file, path, new_path)[0])
+            differences.append(difference(legacy_path, new_path))
+
+        legacy_ms = sum(legacy_times) / len(paths) * 1000
+        new_ms = sum(new_times) / len(paths) * 1000
+        print(f"{len(paths)} photos")
+        print(f"{'Per photo':<22}{'Previous':>12}{'Display res':>14}{'Speedup':>10}")
+        print(f"{'':<22}{legacy_ms:>9.1f} ms{new_ms:>11.1f} ms{legacy_ms / new_ms:>9.0f}x")
+        print(f"Mean difference from the previous background: {sum(differences) / len(differences):.1f} / 255")
+
+        serial_jobs = [(path, os.path.join(tmp, f"serial{i}.jpg")) for i, path in enumerate(paths)]
+        pool_jobs = [(path, os.path.join(tmp, f"pool{i}.jpg")) for i, path in enumerate(paths)]
+        serial_time, _ = timed(lambda: create_blurred_backgrounds(serial_jobs, workers=1))
+        pool_time, results = timed(lambda: create_blurred_backgrounds(pool_jobs, workers=args.workers))
+        assert all(results), "batch failed"
+        print(f"Library batch: serial {serial_time:.2f} s, process pool {pool_time:.2f} s "
+              f"({serial_time / pool_time:.1f}x, {args.workers or os.cpu_count()} workers)")
+
+
+if __name__ == "__main__":
+    main()
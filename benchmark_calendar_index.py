@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Benchmark building the calendar day models: scanning every event for every
+day (the previous _create_standard_range_days) against CalendarEventIndex.
+
+A synthetic calendar is generated: weekly and daily recurring series expanded
+into single events (like Google returns with singleEvents=True), timed and
+all-day, plus some multi-day and long events. For a week view (7 days) and a
+month grid (42 days) it reports the time per model build. The index build is
+reported separately; it runs once per event change (sync, visibility toggle),
+not per view.
+
+Usage:
+    python benchmark_calendar_index.py [--events N] [--repeats N]
+"""
+
+import argparse
+import random
+import time
+from datetime import date, datetime, timedelta
+
+from PySide6.QtCore import QDate
+
+from frontend.logic.calendar_event_index import CalendarEventIndex
+from frontend.logic.date_utils import DateUtils
+
+FIRST_DAY = date(2025, 1, 6)  # A Monday
+SPAN_DAYS = 730
+
+
+def generate_events(count, seed=1):
+    """Recurring series expanded into instances, plus multi-day and long events."""
+    rng = random.Random(seed)
+    events = []
+    series = 0
+    while len(events) < count:
+        series += 1
+        interval = rng.choice([1, 7, 7, 7, 14])  # Daily, weekly, every other week
+        first = FIRST_DAY + timedelta(days=rng.randrange(interval))
+        all_day = rng.random() < 0.2
+        hour = rng.randrange(7, 20)
+        day = first
+        instance = 0
+        while day < FIRST_DAY + timedelta(days=SPAN_DAYS) and len(events) < count:
+            if all_day:
+                start_time, end_time = day.isoformat(), (day + timedelta(days=1)).isoformat()
+            else:
+                start = datetime(day.year, day.month, day.day, hour)
+                start_time, end_time = start.isoformat(), (start + timedelta(hours=1)).isoformat()
+            events.append({
+                "id": f"series{series}_{instance}",
+                "calendar_id": f"cal{series % 5}",
+                "title": f"Series {series}",
+                "start_time": start_time,
+                "end_time": end_time,
+                "all_day": all_day,
+                "color": "#1a73e8",
+            })
+            day += timedelta(days=interval)
+            instance += 1
+
+    # Trips and conferences, and a few events longer than a month
+    for i in range(count // 50):
+        start = FIRST_DAY + timedelta(days=rng.randrange(SPAN_DAYS))
+        length = rng.choice([2, 3, 5, 10, 45]) if i % 10 else 120
+        events.append({
+            "id": f"multi{i}",
+            "calendar_id": "cal0",
+            "title": f"Trip {i}",
+            "start_time": start.isoformat(),
+            "end_time": (start + timedelta(days=length)).isoformat(),
+            "all_day": True,
+            "color": "#0b8043",
+        })
+    return events
+
+
+def prepare_legacy(events):
+    """The start_date/end_date the previous month model left on every event."""
+    for event in events:
+        event["start_date"] = DateUtils.extract_iso_date(event["start_time"])
+        end = DateUtils.to_qdate(DateUtils.extract_iso_date(event["end_time"]))
+        if event["all_day"]:
+            end = end.addDays(-1)
+        event["end_date"] = DateUtils.to_string(end, DateUtils.FORMAT_ISO)
+
+
+def legacy_range_events(events, range_start, range_end):
+    """The previous per-day scan of every event (day data left out)."""
+    days = []
+    current_date = range_start
+    while current_date <= range_end:
+        regular_events = []
+        multi_day_events = []
+        for event in events:
+            event_start_date = DateUtils.to_qdate(event.get("start_date", ""))
+            event_end_date = DateUtils.to_qdate(event.get("end_date", ""))
+            if not event_start_date or not event_end_date or not event_start_date.isValid() or not event_end_date.isValid():
+                continue
+            if event_start_date <= current_date and current_date <= event_end_date:
+                event_copy = event.copy()
+                if DateUtils.days_between(event_start_date, event_end_date) > 0:
+                    event_copy["is_multi_day"] = True
+                    event_copy["isStart"] = DateUtils.is_same_day(event_start_date, current_date)
+                    event_copy["isEnd"] = DateUtils.is_same_day(event_end_date, current_date)
+                    multi_day_events.append(event_copy)
+                else:
+                    event_copy["is_multi_day"] = False
+                    try:
+                        start_time = datetime.fromisoformat(event["start_time"])
+                        event_copy["timeDisplay"] = DateUtils.to_string(start_time, DateUtils.FORMAT_TIME)
+                    except (ValueError, TypeError):
+                        event_copy["timeDisplay"] = ""
+                    regular_events.append(event_copy)
+        days.append((regular_events, multi_day_events))
+        current_date = current_date.addDays(1)
+    return days
+
+
+def indexed_range_events(index, range_start, range_end):
+    """What CalendarController._create_standard_range_days does now (day data left out)."""
+    days = []
+    current_date = range_start
+    while current_date <= range_end:
+        day = CalendarEventIndex.ordinal(current_date)
+        regular_events = []
+        multi_day_events = []
+        for record in index.events_on(day):
+            event_copy = record.event.copy()
+            if record.is_multi_day:
+                event_copy["is_multi_day"] = True
+                event_copy["isStart"] = record.start == day
+                event_copy["isEnd"] = record.end == day
+                multi_day_events.append(event_copy)
+            else:
+                event_copy["is_multi_day"] = False
+                event_copy["timeDisplay"] = record.time_display
+                regular_events.append(event_copy)
+        days.append((regular_events, multi_day_events))
+        current_date = current_date.addDays(1)
+    return days
+
+
+def summarize(days):
+    return [([e["id"] for e in regular], [(e["id"], e["isStart"], e["isEnd"]) for e in multi])
+            for regular, multi in days]
+
+
+def best_of(repeats, fn, *args):
+    best = float("inf")
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn(*args)
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=5000, help="Number of recurring event instances")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    events = generate_events(args.events)
+    prepare_legacy(events)
+    index_time, index = best_of(args.repeats, CalendarEventIndex, events)
+    print(f"{len(events)} events over {SPAN_DAYS} days; index build {index_time * 1000:.1f} ms")
+
+    reference = QDate(2025, 6, 2)  # A Monday in the middle of the data
+    print(f"{'View':<14}{'Scan all events':>18}{'Index':>14}{'Speedup':>10}")
+    for name, days in (("Week", 7), ("Month grid", 42)):
+        range_end = reference.addDays(days - 1)
+        legacy_time, legacy_days = best_of(args.repeats, legacy_range_events, events, reference, range_end)
+        indexed_time, indexed_days = best_of(args.repeats, indexed_range_events, index, reference, range_end)
+        assert summarize(legacy_days) == summarize(indexed_days), f"{name}: results differ"
+        print(f"{name:<14}{legacy_time * 1000:>15.2f} ms{indexed_time * 1000:>11.2f} ms{legacy_time / indexed_time:>9.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+"""
+Benchmark streaming markdown rendering: full re-render per chunk vs the
+incremental StreamingMarkdownRenderer.
+
+The assistant messages of the saved chat_history/*.json conversations are
+joined into one long answer (repeated up to --min-chars) and fed in chunks
+the size of LLM tokens. For each tenth of the answer it reports the average
+cost per chunk; with full re-rendering it grows with the answer, with the
+incremental renderer it stays flat.
+
+Usage:
+    python benchmark_markdown_streaming.py [--chunk-chars N] [--min-chars N]
+"""
+
+import argparse
+import glob
+import json
+import os
+import re
+import time
+
+from frontend.utils.markdown_utils import StreamingMarkdownRenderer, render_markdown
+
+HISTORY_DIR = os.path.join(os.path.dirname(__file__), "chat_history")
+BUCKETS = 10
+
+
+def legacy_markdown_to_html(text):
+    """The previous whole-string MarkdownUtils.markdownToHtml."""
+    if not text:
+        return ""
+    html = text.replace('\n', '<br>')
+    html = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', html)
+    html = re.sub(r'(?<!\*)\*(?!\*)(.*?)(?<!\*)\*(?!\*)', r'<i>\1</i>', html)
+    html = re.sub(r'`(.*?)`', r'<code>\1</code>', html)
+    html = re.sub(r'\[(.*?)\]\((.*?)\)', r'<a href="\2">\1</a>', html)
+    return html
+
+
+def load_answer(min_chars):
+    messages = []
+    for path in sorted(glob.glob(os.path.join(HISTORY_DIR, "*.json"))):
+        try:
+            with open(path, encoding="utf-8") as f:
+                history = json.load(f)
+        except (OSError, ValueError):
+            continue
+        messages.extend(m.get("text", "") for m in history if not m.get("isUser"))
+    messages = [m for m in messages if m.strip()]
+    if not messages:
+        raise SystemExit(f"No assistant messages found in {HISTORY_DIR}")
+    answer = "\n\n".join(messages)
+    while len(answer) < min_chars:
+        answer += "\n\n" + answer
+    return answer, len(messages)
+
+
+def time_full_rerender(chunks):
+    costs = []
+    accumulated = ""
+    for chunk in chunks:
+        start = time.perf_counter()
+        accumulated += chunk
+        legacy_markdown_to_html(accumulated)
+        costs.append(time.perf_counter() - start)
+    return costs
+
+
+def time_incremental(chunks):
+    costs = []
+    renderer = StreamingMarkdownRenderer()
+    for chunk in chunks:
+        start = time.perf_counter()
+        if renderer.feed(chunk):
+            renderer.stable_html
+        renderer.pending_html
+        costs.append(time.perf_counter() - start)
+    return costs, renderer
+
+
+def bucket_means(costs):
+    size = max(1, len(costs) // BUCKETS)
+    return [sum(costs[i:i + size]) / len(costs[i:i + size]) for i in range(0, size * BUCKETS, size) if costs[i:i + size]]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunk-chars", type=int, default=4, help="Characters per streamed chunk")
+    parser.add_argument("--min-chars", type=int, default=20000, help="Minimum answer length")
+    args = parser.parse_args()
+
+    answer, message_count = load_answer(args.min_chars)
+    chunks = [answer[i:i + args.chunk_chars] for i in range(0, len(answer), args.chunk_chars)]
+
+    full_costs = time_full_rerender(chunks)
+    incremental_costs, renderer = time_incremental(chunks)
+    renderer.finish()
+    assert renderer.stable_html == render_markdown(answer)
+
+    print(f"Answer: {len(answer)} chars from {message_count} saved messages, {len(chunks)} chunks of {args.chunk_chars} chars")
+    print(f"{'Part of answer':<16}{'Full re-render':>18}{'Incremental':>16}")
+    for i, (full, incremental) in enumerate(zip(bucket_means(full_costs), bucket_means(incremental_costs))):
+        print(f"{f'{i * 10}-{(i + 1) * 10}%':<16}{full * 1e6:>15.1f} us{incremental * 1e6:>13.1f} us")
+    print(f"{'Total':<16}{sum(full_costs) * 1000:>15.1f} ms{sum(incremental_costs) * 1000:>13.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
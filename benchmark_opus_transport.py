@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Opus TTS transport against raw PCM.
+
+Reports bytes on the wire (including frame headers) and the CPU time spent
+encoding on the backend and decoding on the frontend, per second of audio.
+Run it on the Pi to get ARM numbers for the decode side.
+
+Usage:
+    python benchmark_opus_transport.py [pcm_file] [--chunk-bytes N]
+
+The input must be 16-bit mono PCM at 24 kHz (e.g. frontend/sounds/alarm.raw).
+Requires the opuslib package and the system libopus.
+"""
+
+import argparse
+import os
+import time
+
+from backend.tts.opus_codec import OpusStreamEncoder, opus_available
+from backend.websocket.frames import HEADER_SIZE
+from frontend.logic.opus_decoder import OpusStreamDecoder
+
+SAMPLE_RATE = 24000
+DEFAULT_INPUT = os.path.join(os.path.dirname(__file__), "frontend", "sounds", "alarm.raw")
+
+
+def run_benchmark(pcm: bytes, chunk_bytes: int, bitrate: int, repeats: int):
+    seconds = len(pcm) / (SAMPLE_RATE * 2)
+    chunks = [pcm[i:i + chunk_bytes] for i in range(0, len(pcm), chunk_bytes)]
+
+    pcm_wire = sum(len(c) + HEADER_SIZE for c in chunks)
+
+    encode_cpu = 0.0
+    decode_cpu = 0.0
+    opus_wire = 0
+    for _ in range(repeats):
+        encoder = OpusStreamEncoder(SAMPLE_RATE, bitrate)
+        start = time.process_time()
+        bundles = [encoder.encode(c) for c in chunks]
+        bundles.append(encoder.flush())
+        encode_cpu += time.process_time() - start
+        bundles = [b for b in bundles if b]
+        opus_wire = sum(len(b) + HEADER_SIZE for b in bundles)
+
+        decoder = OpusStreamDecoder(SAMPLE_RATE)
+        start = time.process_time()
+        for bundle in bundles:
+            decoder.decode(memoryview(bundle))
+        decode_cpu += time.process_time() - start
+
+    encode_cpu /= repeats
+    decode_cpu /= repeats
+
+    print(f"Audio:            {seconds:.2f} s in {len(chunks)} chunks of {chunk_bytes} bytes")
+    print(f"PCM on the wire:  {pcm_wire} bytes ({pcm_wire / seconds / 1024:.1f} KB/s)")
+    print(f"Opus on the wire: {opus_wire} bytes ({opus_wire / seconds / 1024:.1f} KB/s) at {bitrate} bps")
+    print(f"Reduction:        {1 - opus_wire / pcm_wire:.1%}")
+    print(f"Encode CPU:       {encode_cpu * 1000 / seconds:.2f} ms per audio second")
+    print(f"Decode CPU:       {decode_cpu * 1000 / seconds:.2f} ms per audio second "
+          f"({decode_cpu / seconds:.2%} of one core)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("pcm_file", nargs="?", default=DEFAULT_INPUT)
+    parser.add_argument("--chunk-bytes", type=int, default=16384, help="PCM chunk size from the TTS provider")
+    parser.add_argument("--bitrate", type=int, default=24000)
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    if not opus_available(SAMPLE_RATE):
+        raise SystemExit("opuslib/libopus is not installed")
+
+    with open(args.pcm_file, "rb") as f:
+        pcm = f.read()
+    pcm = pcm[: len(pcm) - len(pcm) % 2]
+    run_benchmark(pcm, args.chunk_bytes, args.bitrate, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Qt-driven asyncio loop against the old 10 ms polling timer.
+
+For each integration it reports:
+- idle CPU: process CPU time while the loop only has a far-off timer pending
+- message latency: time from a background thread writing a message to a
+  socket until the asyncio reader callback runs (like a websocket frame)
+- threadsafe latency: time from call_soon_threadsafe() in a background thread
+  until the callback runs (like an STT or wake word callback)
+
+Usage:
+    python benchmark_qt_event_loop.py [--idle-seconds N] [--messages N]
+
+Run it on the Pi for representative numbers.
+"""
+
+import argparse
+import asyncio
+import socket
+import statistics
+import struct
+import threading
+import time
+
+from PySide6.QtCore import QCoreApplication, QTimer
+
+from frontend.utils.qt_event_loop import new_qt_event_loop
+
+TIMESTAMP = struct.Struct("!d")
+
+
+def make_polling_loop():
+    """The previous integration: run asyncio for one iteration every 10 ms."""
+    loop = asyncio.new_event_loop()
+    timer = QTimer()
+    timer.setInterval(10)
+
+    def process_asyncio_events():
+        loop.call_soon(loop.stop)
+        loop.run_forever()
+
+    timer.timeout.connect(process_asyncio_events)
+    timer.start()
+    return loop, timer
+
+
+def make_qt_loop():
+    return new_qt_event_loop(), None
+
+
+def run_qt(app, seconds):
+    QTimer.singleShot(int(seconds * 1000), app.quit)
+    app.exec()
+
+
+def measure_idle_cpu(app, loop, seconds):
+    # A pending far-off timer, like the keepalive tasks in the app
+    handle = loop.call_later(3600, lambda: None)
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    run_qt(app, seconds)
+    cpu = time.process_time() - cpu_start
+    wall = time.perf_counter() - wall_start
+    handle.cancel()
+    return cpu / wall
+
+
+def measure_socket_latency(app, loop, messages, interval):
+    reader, writer = socket.socketpair()
+    reader.setblocking(False)
+    latencies = []
+
+    def on_readable():
+        data = reader.recv(TIMESTAMP.size * 64)
+        now = time.perf_counter()
+        for offset in range(0, len(data) - TIMESTAMP.size + 1, TIMESTAMP.size):
+            (sent,) = TIMESTAMP.unpack_from(data, offset)
+            latencies.append(now - sent)
+
+    def send_messages():
+        for _ in range(messages):
+            time.sleep(interval)
+            writer.send(TIMESTAMP.pack(time.perf_counter()))
+
+    loop.add_reader(reader.fileno(), on_readable)
+    sender = threading.Thread(target=send_messages, daemon=True)
+    sender.start()
+    run_qt(app, messages * interval + 0.5)
+    sender.join()
+    loop.remove_reader(reader.fileno())
+    reader.close()
+    writer.close()
+    return latencies
+
+
+def measure_threadsafe_latency(app, loop, messages, interval):
+    latencies = []
+
+    def callback(sent):
+        latencies.append(time.perf_counter() - sent)
+
+    def post_callbacks():
+        for _ in range(messages):
+            time.sleep(interval)
+            loop.call_soon_threadsafe(callback, time.perf_counter())
+
+    poster = threading.Thread(target=post_callbacks, daemon=True)
+    poster.start()
+    run_qt(app, messages * interval + 0.5)
+    poster.join()
+    return latencies
+
+
+def describe(latencies):
+    if not latencies:
+        return "no samples"
+    ordered = sorted(latencies)
+    p95 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    return (
+        f"mean {statistics.mean(ordered) * 1000:.2f} ms, "
+        f"p95 {p95 * 1000:.2f} ms, max {ordered[-1] * 1000:.2f} ms ({len(ordered)} samples)"
+    )
+
+
+def run_benchmark(app, name, make_loop, idle_seconds, messages, interval):
+    loop, driver = make_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        idle = measure_idle_cpu(app, loop, idle_seconds)
+        socket_latencies = measure_socket_latency(app, loop, messages, interval)
+        threadsafe_latencies = measure_threadsafe_latency(app, loop, messages, interval)
+    finally:
+        if driver is not None:
+            driver.stop()
+        loop.close()
+
+    print(f"{name}")
+    print(f"  Idle CPU:            {idle:.2%} of one core")
+    print(f"  Message latency:     {describe(socket_latencies)}")
+    print(f"  Threadsafe latency:  {describe(threadsafe_latencies)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--idle-seconds", type=float, default=5.0)
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--interval", type=float, default=0.013, help="Seconds between messages")
+    args = parser.parse_args()
+
+    app = QCoreApplication([])
+    run_benchmark(app, "10 ms polling timer (before)", make_polling_loop,
+                  args.idle_seconds, args.messages, args.interval)
+    run_benchmark(app, "Qt-driven event loop (after)", make_qt_loop,
+                  args.idle_seconds, args.messages, args.interval)
+
+
+if __name__ == "__main__":
+    main()
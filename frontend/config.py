@@ -6,6 +6,7 @@ This module provides centralized configuration for all aspects of the applicatio
 including server settings, logging, and speech-to-text functionality.
 """
 import logging
+import os
 from typing import Dict, Any
 
 # ========================
@@ -96,8 +97,57 @@ logger = setup_logger(level=logging.DEBUG)
 # ========================
 CHAT_CONFIG: Dict[str, Any] = {
     "show_input_box": True,  # Whether to show the text input field on the chat screen
+    "history_page_size": 30,  # Messages loaded per page when scrolling back through history
 }
 
+# SQLite chat history, stored next to the project by default
+CHAT_HISTORY_DB_PATH = os.environ.get(
+    "CHAT_HISTORY_DB",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "chat_history", "chat_history.db"),
+)
+
+# ========================
+# CALENDAR CONFIGURATION
+# ========================
+CALENDAR_CONFIG: Dict[str, Any] = {
+    "sync_workers": 4,  # Calendars fetched from Google concurrently during a sync
+    "sync_interval_minutes": 5,  # Incremental sync in the background; only changed events are transferred
+    "prefetch_max_events": 5000,  # Neighbouring ranges with more events aren't kept ready (memory cap)
+}
+
+# Local copy of the Google calendars, kept next to the Google token
+CALENDAR_CACHE_DB_PATH = os.environ.get(
+    "CALENDAR_CACHE_DB",
+    os.path.join(os.path.expanduser("~"), ".config", "pyside_raspi", "calendar_cache.db"),
+)
+
+# ========================
+# PHOTO CONFIGURATION
+# ========================
+PHOTO_CONFIG: Dict[str, Any] = {
+    "display_width": 800,  # Photos are scaled down to fit the screen once and cached at this size
+    "display_height": 480,
+    "derivative_format": "JPEG",  # JPEG or WEBP; photos with transparency are always stored as PNG
+    "derivative_quality": 85,
+    "preload_count": 3,  # Upcoming slideshow items prepared ahead of time
+    "preload_workers": 2,
+    "predecode_images": True,  # Decode upcoming photos ahead too (about 1.5 MB of memory each at 800x480)
+    "order": "name",  # Slideshow order: "name" (file name) or "date" (creation time)
+    "rescan_delay_ms": 1000,  # The library is updated this long after the last change in the media folder
+}
+
+# Screen-sized photo renditions; they survive restarts, so each photo is only scaled once
+PHOTO_CACHE_DIR = os.environ.get(
+    "PHOTO_CACHE_DIR",
+    os.path.join(os.path.expanduser("~"), ".cache", "pyside_raspi", "photos"),
+)
+
+# Index of the media folder (files, dimensions, dates, renditions)
+PHOTO_LIBRARY_DB_PATH = os.environ.get(
+    "PHOTO_LIBRARY_DB",
+    os.path.join(os.path.expanduser("~"), ".config", "pyside_raspi", "photo_library.db"),
+)
+
 # ========================
 # APPLICATION INSTANCE
 # ========================
@@ -3,21 +3,22 @@ import os
 import sys
 import pickle
 import requests
-import json
-from PIL import Image, ImageFilter, ImageEnhance
-from datetime import datetime
 
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 
+# Make the frontend package importable when run as a script
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from frontend.photo_blur import blurred_path_for, create_blurred_backgrounds  # noqa: E402
+from frontend.photo_library import PhotoLibrary  # noqa: E402
+
 # OAuth scope and paths.
 SCOPES = ["https://www.googleapis.com/auth/photoslibrary.readonly"]
 CREDENTIALS_PATH = "/home/jack/PYSIDE_RASPI_FRONTEND/google_credentials.json"
 TOKEN_PICKLE = "token.pickle"
 ALBUM_NAME = "test"  # Change this to your desired album title.
 DOWNLOAD_DIR = "/home/jack/PYSIDE_RASPI_FRONTEND/frontend/downloaded_media"
-METADATA_FILE = os.path.join(DOWNLOAD_DIR, "photo_metadata.json")
 
 
 def authenticate_google_photos():
@@ -75,103 +76,6 @@ def fetch_all_media_items(service, album_id):
     return all_items
 
 
-def create_blurred_background(image_path):
-    """
-    Create a blurred background version of the image
-
-    Args:
-        image_path: Path to the original image
-
-    Returns:
-        Path to the blurred image
-    """
-    try:
-        # Skip if not an image
-        if not image_path.lower().endswith((".jpg", ".jpeg", ".png")):
-            print(f"Skipping non-image file for blur: {image_path}")
-            return None
-
-        # Create output path for the blurred image
-        filename = os.path.basename(image_path)
-        name, ext = os.path.splitext(filename)
-        # Always use JPG for blurred backgrounds (no need for transparency)
-        blurred_filename = f"{name}_blurred.jpg"
-        blurred_path = os.path.join(os.path.dirname(image_path), blurred_filename)
-
-        # Check if blurred version already exists
-        if os.path.exists(blurred_path):
-            print(f"Blurred background already exists: {blurred_path}")
-            return blurred_path
-
-        # Open the image
-        print(f"Creating blurred background for: {image_path}")
-        img = Image.open(image_path)
-
-        # Convert to RGB mode if needed
-        if img.mode != "RGB":
-            img = img.convert("RGB")
-
-        # Create a low-resolution version first (for faster processing)
-        small_size = (20, 20)
-        small = img.resize(small_size, Image.LANCZOS)
-
-        # Scale back up to create pixelation effect
-        blurred = small.resize(img.size, Image.LANCZOS)
-
-        # Apply additional Gaussian blur
-        blurred = blurred.filter(ImageFilter.GaussianBlur(radius=5))
-
-        # Darken the image for better contrast with foreground content
-        enhancer = ImageEnhance.Brightness(blurred)
-        blurred = enhancer.enhance(0.7)  # 70% brightness
-
-        # Save the blurred image
-        blurred.save(blurred_path, quality=90)
-        print(f"Saved blurred background to: {blurred_path}")
-
-        return blurred_path
-
-    except Exception as e:
-        print(f"Error creating blurred background for {image_path}: {e}")
-        return None
-
-
-def format_creation_date(creation_time):
-    """Format creation date to a user-friendly string."""
-    if not creation_time:
-        return ""
-
-    try:
-        # Parse the ISO date string from Google Photos
-        dt = datetime.fromisoformat(creation_time.replace("Z", "+00:00"))
-        # Format as "Thursday, April 3, 2025"
-        return dt.strftime("%A, %B %-d, %Y")
-    except Exception as e:
-        print(f"Error formatting date {creation_time}: {e}")
-        return ""
-
-
-def save_metadata(metadata_dict):
-    """Save metadata to a JSON file."""
-    try:
-        with open(METADATA_FILE, "w") as f:
-            json.dump(metadata_dict, f, indent=2)
-        print(f"Saved metadata to {METADATA_FILE}")
-    except Exception as e:
-        print(f"Error saving metadata: {e}")
-
-
-def load_metadata():
-    """Load metadata from the JSON file if it exists."""
-    if os.path.exists(METADATA_FILE):
-        try:
-            with open(METADATA_FILE, "r") as f:
-                return json.load(f)
-        except Exception as e:
-            print(f"Error loading metadata: {e}")
-    return {}
-
-
 def download_media_item(media, download_dir, metadata_dict):
     """
     Download a media item (image or video) to the specified folder.
@@ -191,13 +95,11 @@ def download_media_item(media, download_dir, metadata_dict):
     filename = media.get("id") + ext
     file_path = os.path.join(download_dir, filename)
 
-    # Extract and format the creation date/time
+    # Extract the creation date/time
     creation_time = media.get("mediaMetadata", {}).get("creationTime", "")
-    formatted_date = format_creation_date(creation_time)
 
     # Store the metadata
     metadata_dict[filename] = {
-        "date": formatted_date,
         "title": media.get("filename", ""),
         "description": media.get("description", ""),
         "creation_time": creation_time,
@@ -205,9 +107,6 @@ def download_media_item(media, download_dir, metadata_dict):
 
     if os.path.exists(file_path):
         print("File exists:", file_path)
-        # For images, create blurred background if it doesn't exist yet
-        if mime.startswith("image/"):
-            create_blurred_background(file_path)
         return file_path
     try:
         print("Downloading media from:", url)
@@ -218,11 +117,6 @@ def download_media_item(media, download_dir, metadata_dict):
                     if chunk:
                         f.write(chunk)
             print("Downloaded", file_path)
-
-            # For images, create a blurred background version
-            if mime.startswith("image/"):
-                create_blurred_background(file_path)
-
             return file_path
         else:
             print("Failed to download", url, "Status code:", response.status_code)
@@ -241,17 +135,33 @@ def download_all_media_items(service, album, download_dir):
     if not os.path.exists(download_dir):
         os.makedirs(download_dir)
 
-    # Load existing metadata
-    metadata_dict = load_metadata()
+    # Metadata of the album's items, stored in the photo library at the end
+    metadata_dict = {}
 
+    blur_jobs = []
     for media in media_items:
         if media.get("mimeType", "").startswith("image/") or media.get(
             "mimeType", ""
         ).startswith("video/"):
-            download_media_item(media, download_dir, metadata_dict)
-
-    # Save updated metadata
-    save_metadata(metadata_dict)
+            file_path = download_media_item(media, download_dir, metadata_dict)
+            # Blurred backgrounds of images that don't have one yet
+            if file_path and media.get("mimeType", "").startswith("image/"):
+                blurred_path = blurred_path_for(file_path)
+                if not os.path.exists(blurred_path):
+                    blur_jobs.append((file_path, blurred_path))
+
+    # Save the metadata in the library the slideshow reads; the app picks up
+    # the new files themselves from the folder
+    library = PhotoLibrary(download_dir)
+    library.record_metadata(metadata_dict)
+    library.close()
+    print(f"Saved metadata of {len(metadata_dict)} items to {library.db_path}")
+
+    # Build the missing blurred backgrounds in parallel, one process per CPU
+    if blur_jobs:
+        print(f"Creating {len(blur_jobs)} blurred backgrounds")
+        results = create_blurred_backgrounds(blur_jobs)
+        print(f"Created {sum(1 for result in results if result)} blurred backgrounds")
 
 
 def main():
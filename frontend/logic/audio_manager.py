@@ -10,17 +10,43 @@ from PySide6.QtMultimedia import QAudioFormat, QAudioSink, QMediaDevices, QAudio
 from frontend.config import logger
 
 
+# Playback format of the QAudioSink (16-bit mono PCM)
+SAMPLE_RATE = 24000
+BYTES_PER_SECOND = SAMPLE_RATE * 2
+
+# Initial ring buffer size (~22 s of audio); it grows up to MAX_BUFFER_BYTES
+# before the oldest audio is overwritten
+INITIAL_BUFFER_BYTES = 1 << 20
+MAX_BUFFER_BYTES = 1 << 24
+
+# Extra time allowed for the sink to drain beyond the buffered audio length
+DRAIN_GRACE_SECONDS = 1.0
+
+
 class QueueAudioDevice(QIODevice):
     """
     A queue-like QIODevice for feeding PCM audio data to QAudioSink.
+
+    Audio is kept in a preallocated ring buffer, so reads and writes only copy
+    the bytes they move. `drained` is emitted once the sink has consumed all
+    audio after mark_end_of_stream().
     """
 
-    def __init__(self):
+    drained = Signal()
+
+    def __init__(self, capacity=INITIAL_BUFFER_BYTES, max_capacity=MAX_BUFFER_BYTES):
         super().__init__()
-        self.audio_buffer = bytearray()
+        self._ring = bytearray(capacity)
+        self._read_pos = 0
+        self._size = 0
+        self.max_capacity = max(capacity, max_capacity)
         self.mutex = QMutex()
         self.end_of_stream = False
         self.is_active = False
+        self._streaming = False  # Audio has been written since the last drain/clear
+        self._drain_pending = False
+        self.underruns = 0  # Sink pulled while a stream was starved of audio
+        self.overruns = 0  # Writes that overwrote audio not yet played
 
     def open(self, mode):
         success = super().open(mode)
@@ -36,49 +62,137 @@ class QueueAudioDevice(QIODevice):
     def seek(self, pos):
         return False
 
+    def _take(self, size):
+        """Remove and return `size` bytes from the front of the ring (mutex held)."""
+        capacity = len(self._ring)
+        view = memoryview(self._ring)
+        end = self._read_pos + size
+        if end <= capacity:
+            data = bytes(view[self._read_pos:end])
+        else:
+            data = b"".join((view[self._read_pos:], view[:end - capacity]))
+        self._read_pos = end % capacity
+        self._size -= size
+        return data
+
+    def _grow(self, needed):
+        """Reallocate the ring to hold `needed` bytes, up to max_capacity (mutex held)."""
+        capacity = len(self._ring)
+        new_capacity = capacity
+        while new_capacity < needed and new_capacity < self.max_capacity:
+            new_capacity *= 2
+        new_capacity = min(new_capacity, self.max_capacity)
+        if new_capacity == capacity:
+            return
+        size = self._size
+        ring = bytearray(new_capacity)
+        ring[:size] = self._take(size)
+        self._ring = ring
+        self._read_pos = 0
+        self._size = size
+        logger.info(f"[QueueAudioDevice] Grew ring buffer from {capacity} to {new_capacity} bytes")
+
     def readData(self, maxSize):
+        emit_drained = False
         with QMutexLocker(self.mutex):
-            if not self.audio_buffer:
-                if self.end_of_stream:
-                    logger.debug(
-                        "[QueueAudioDevice] End of stream reached with empty buffer"
-                    )
-                    return bytes()
-                return bytes(maxSize)
-            data = bytes(self.audio_buffer[:maxSize])
-            self.audio_buffer = self.audio_buffer[maxSize:]
-            return data
+            if self._size:
+                data = self._take(min(maxSize, self._size))
+            elif self.end_of_stream:
+                logger.debug(
+                    "[QueueAudioDevice] End of stream reached with empty buffer"
+                )
+                emit_drained = self._drain_pending
+                self._drain_pending = False
+                self._streaming = False
+                data = bytes()
+            else:
+                if self._streaming:
+                    self.underruns += 1
+                data = bytes(maxSize)
+        if emit_drained:
+            self.drained.emit()
+        return data
 
     def writeData(self, data):
+        view = memoryview(data).cast("B")
+        length = len(view)
+        if not length:
+            return 0
         with QMutexLocker(self.mutex):
-            self.audio_buffer.extend(data)
-            return len(data)
+            if self._size + length > len(self._ring):
+                self._grow(self._size + length)
+            capacity = len(self._ring)
+            if length > capacity:
+                # Only the newest audio fits
+                self.overruns += 1
+                view = view[length - capacity:]
+            overflow = self._size + len(view) - capacity
+            if overflow > 0:
+                # Drop the oldest audio to make room
+                if len(view) == length:
+                    self.overruns += 1
+                self._read_pos = (self._read_pos + overflow) % capacity
+                self._size -= overflow
+                logger.warning(f"[QueueAudioDevice] Buffer overrun, dropped {overflow} bytes")
+
+            write_pos = (self._read_pos + self._size) % capacity
+            first = min(len(view), capacity - write_pos)
+            self._ring[write_pos:write_pos + first] = view[:first]
+            if first < len(view):
+                self._ring[:len(view) - first] = view[first:]
+            self._size += len(view)
+            self._streaming = True
+            return length
 
     def bytesAvailable(self):
         with QMutexLocker(self.mutex):
-            return len(self.audio_buffer) + super().bytesAvailable()
+            return self._size + super().bytesAvailable()
 
     def isSequential(self):
         return True
 
+    def buffered_bytes(self):
+        """Return the number of bytes waiting to be played."""
+        with QMutexLocker(self.mutex):
+            return self._size
+
+    def get_stats(self):
+        with QMutexLocker(self.mutex):
+            return {
+                "buffered_bytes": self._size,
+                "capacity": len(self._ring),
+                "underruns": self.underruns,
+                "overruns": self.overruns,
+            }
+
     def mark_end_of_stream(self):
         with QMutexLocker(self.mutex):
             logger.info(
-                f"[QueueAudioDevice] Marking end of stream, buffer size: {len(self.audio_buffer)}"
+                f"[QueueAudioDevice] Marking end of stream, buffer size: {self._size}"
             )
             self.end_of_stream = True
+            # Nothing left to play: report the drain right away
+            emit_drained = self._size == 0
+            self._drain_pending = not emit_drained
+            if emit_drained:
+                self._streaming = False
+        if emit_drained:
+            self.drained.emit()
 
     def clear_buffer(self):
         with QMutexLocker(self.mutex):
             logger.info(
-                f"[QueueAudioDevice] Clearing buffer, previous size: {len(self.audio_buffer)}"
+                f"[QueueAudioDevice] Clearing buffer, previous size: {self._size}"
             )
-            self.audio_buffer.clear()
+            self._read_pos = 0
+            self._size = 0
+            self._streaming = False
 
     def reset_end_of_stream(self):
         with QMutexLocker(self.mutex):
             prev_state = self.end_of_stream
             self.end_of_stream = False
+            self._drain_pending = False
             logger.info(
                 f"[QueueAudioDevice] Reset end-of-stream flag from {prev_state} to {self.end_of_stream}"
             )
@@ -96,16 +210,18 @@ class AudioManager(QObject):
         self.tts_audio_playing = False
         self._repeat_timer = None
         self._current_sound_data = None
+        self._drained = asyncio.Event()
         self.setup_audio()
 
     def setup_audio(self):
         """Set up audio devices and sink"""
         self.audioDevice = QueueAudioDevice()
+        self.audioDevice.drained.connect(self._on_audio_drained)
         # Use OpenModeFlag.ReadOnly instead of ReadOnly
         self.audioDevice.open(QIODevice.OpenModeFlag.ReadOnly)
 
         audio_format = QAudioFormat()
-        audio_format.setSampleRate(24000)
+        audio_format.setSampleRate(SAMPLE_RATE)
         audio_format.setChannelCount(1)
         audio_format.setSampleFormat(QAudioFormat.SampleFormat.Int16)
 
@@ -125,18 +241,33 @@ class AudioManager(QObject):
         """Handle audio state changes"""
         logger.info(f"[AudioManager] Audio state changed to: {state}")
 
-        def get_audio_state():
-            with QMutexLocker(self.audioDevice.mutex):
-                return (
-                    len(self.audioDevice.audio_buffer),
-                    self.audioDevice.end_of_stream,
-                )
-
-        buffer_size, is_end_of_stream = get_audio_state()
+        stats = self.audioDevice.get_stats()
         logger.info(
-            f"[AudioManager] Buffer size: {buffer_size}, End of stream: {is_end_of_stream}"
+            f"[AudioManager] Buffer size: {stats['buffered_bytes']}, End of stream: {self.audioDevice.end_of_stream}, "
+            f"underruns: {stats['underruns']}, overruns: {stats['overruns']}"
         )
 
+    @Slot()
+    def _on_audio_drained(self):
+        """Called once the sink has played everything up to the end of stream"""
+        self._drained.set()
+
+    async def _wait_for_drain(self):
+        """
+        Wait for the drained signal. Times out if the sink stops pulling data,
+        so a stalled sink can't block the consumer forever.
+        """
+        timeout = self.audioDevice.buffered_bytes() / BYTES_PER_SECOND + DRAIN_GRACE_SECONDS
+        try:
+            await asyncio.wait_for(self._drained.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"[AudioManager] Audio buffer did not drain within {timeout:.1f}s, discarding remaining audio"
+            )
+            self.audioDevice.clear_buffer()
+            return False
+
     async def start_audio_consumer(self):
         """
         Continuously writes PCM audio data from the queue to the audio device.
@@ -147,23 +278,21 @@ class AudioManager(QObject):
                 pcm_chunk = await self._audio_queue.get()
                 if pcm_chunk is None:
                     logger.info("[AudioManager] Received end-of-stream marker.")
-                    await asyncio.to_thread(self.audioDevice.mark_end_of_stream)
-
-                    # Wait until buffer is empty
-                    while True:
-                        buffer_len = await asyncio.to_thread(
-                            lambda: len(self.audioDevice.audio_buffer)
-                        )
-                        if buffer_len == 0:
-                            logger.info(
-                                "[AudioManager] Audio buffer is empty, stopping sink."
-                            )
-                            self.audioSink.stop()
-                            break
-                        await asyncio.sleep(0.05)
+                    # Clear first: an empty buffer reports the drain immediately
+                    self._drained.clear()
+                    self.audioDevice.mark_end_of_stream()
+
+                    # Wait until the sink has played the buffer
+                    if await self._wait_for_drain():
+                        logger.info("[AudioManager] Audio buffer is empty, stopping sink.")
+                    stats = self.audioDevice.get_stats()
+                    logger.info(
+                        f"[AudioManager] Stream drained (underruns: {stats['underruns']}, overruns: {stats['overruns']})"
+                    )
+                    self.audioSink.stop()
 
                     # Reset end-of-stream flag
-                    await asyncio.to_thread(self.audioDevice.reset_end_of_stream)
+                    self.audioDevice.reset_end_of_stream()
                     continue
 
                 # Check if audio sink needs to be restarted
@@ -176,10 +305,8 @@ class AudioManager(QObject):
                     self.audioDevice.open(QIODevice.OpenModeFlag.ReadOnly)
                     self.audioSink.start(self.audioDevice)
 
-                # Write data to device
-                bytes_written = await asyncio.to_thread(
-                    self.audioDevice.writeData, pcm_chunk
-                )
+                # Write data to device; a ring buffer copy, cheap enough for the loop thread
+                bytes_written = self.audioDevice.writeData(pcm_chunk)
                 logger.debug(f"[AudioManager] Wrote {bytes_written} bytes to device.")
                 await asyncio.sleep(0)
 
@@ -233,8 +360,8 @@ class AudioManager(QObject):
             )
 
         # Clear the buffer and mark end of stream
-        await asyncio.to_thread(self.audioDevice.clear_buffer)
-        await asyncio.to_thread(self.audioDevice.mark_end_of_stream)
+        self.audioDevice.clear_buffer()
+        self.audioDevice.mark_end_of_stream()
 
         # Clear the queue
         while not self._audio_queue.empty():
@@ -349,7 +476,7 @@ class AudioManager(QObject):
         self._current_sound_data = sound_data
         
         # Calculate approximate duration (24000Hz, 16-bit mono)
-        duration_ms = (len(sound_data) / (24000 * 2)) * 1000  # Convert to milliseconds
+        duration_ms = (len(sound_data) / BYTES_PER_SECOND) * 1000  # Convert to milliseconds
         
         # Add a small buffer (250ms) to ensure the sound completes before repeating
         repeat_interval = int(duration_ms + 250)
@@ -1,7 +1,15 @@
+import sqlite3
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from PySide6.QtCore import QObject, Signal, Slot, Property, QDate, QLocale, QTimer
 from datetime import datetime, timedelta
 import calendar
+from frontend.config import CALENDAR_CONFIG
+from .calendar_event_index import CalendarEventIndex
+from .calendar_event_store import CalendarEventStore
+from .calendar_layout import MultiDayLayoutEngine
+from .calendar_prefetch import CalendarPrefetcher
 from .google_calendar import GoogleCalendarClient
 from .date_utils import DateUtils
 from .calendar_view_strategies import (
@@ -16,6 +24,15 @@ class CalendarController(QObject):
     Controller class to manage calendar data and logic for the QML frontend.
     Handles month navigation, event fetching from Google Calendar, and calendar visibility.
     Pre-calculates event positions for efficient rendering.
+
+    Events are read from a local store (CalendarEventStore), so navigation
+    never waits for Google. The store is kept up to date by incremental syncs
+    that never run on the GUI thread: a coordinator thread fetches the changes
+    of every calendar concurrently on a worker pool, stores them, and tells the
+    GUI thread through a queued signal, which reloads the range in one update.
+
+    After each navigation the previous and next ranges are built in the
+    background (CalendarPrefetcher), so flipping to them needs no work.
     """
     # Signal declarations
     currentMonthYearChanged = Signal()
@@ -25,6 +42,8 @@ class CalendarController(QObject):
     viewModeChanged = Signal(str)
     currentRangeDaysChanged = Signal()
     currentRangeDisplayChanged = Signal()
+    # Internal: carries a finished sync from the coordinator thread to the GUI thread
+    _syncFinished = Signal(object)
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -34,8 +53,37 @@ class CalendarController(QObject):
         self._available_calendars = []
         self._all_events = []
         self._filtered_events = []
+        self._event_index = CalendarEventIndex([])  # Day index over _filtered_events
+        self._layout_engine = MultiDayLayoutEngine()  # Memoized multi-day bar rows per week
         self._days_in_month_model = []
         self._sync_status = "Not synced"
+
+        # Local event store and background sync state
+        self._event_store = CalendarEventStore()
+        self._sync_coordinator = ThreadPoolExecutor(max_workers=1, thread_name_prefix="calendar-sync")
+        self._fetch_executor = ThreadPoolExecutor(
+            max_workers=CALENDAR_CONFIG["sync_workers"], thread_name_prefix="calendar-fetch"
+        )
+        self._closing = False
+        self._calendar_list_stale = True  # Refetch the calendar list on the next sync
+        self._sync_metrics = {
+            "last_duration_ms": 0.0,
+            "average_duration_ms": 0.0,
+            "max_duration_ms": 0.0,
+            "sync_count": 0,
+            "calendar_count": 0,
+            "changed_events": 0,
+            "failed_calendars": 0,
+        }
+        self._syncFinished.connect(self._apply_sync_result)
+
+        # Models of the neighbouring ranges, built in the background
+        self._prefetcher = CalendarPrefetcher(self._build_models, CALENDAR_CONFIG["prefetch_max_events"])
+
+        # Periodic incremental sync; only changed events are transferred
+        self._sync_timer = QTimer(self)
+        self._sync_timer.setInterval(CALENDAR_CONFIG["sync_interval_minutes"] * 60 * 1000)
+        self._sync_timer.timeout.connect(self._start_sync)
         
         # Initialize view strategies
         self._view_strategies = {
@@ -53,11 +101,16 @@ class CalendarController(QObject):
         self._range_end_date = None
         self._range_days = []
         
+        # Calendars stored by the previous run, so the grid is drawn before the first sync
+        self._available_calendars = self._load_stored_calendars()
+
         # Initialize date range
         self._update_date_range()
 
-        # Initial data load
+        # Initial data load from the local store, then sync what changed since the last run
         self._update_events_and_model()
+        self._start_sync()
+        self._sync_timer.start()
 
     # --- Properties exposed to QML ---
 
@@ -107,6 +160,11 @@ class CalendarController(QObject):
     def syncStatus(self):
         return self._sync_status
 
+    @Property("QVariantMap", notify=syncStatusChanged)
+    def syncMetrics(self):
+        """Durations (ms) and counts of the Google Calendar syncs."""
+        return self._sync_metrics
+
     # --- Slots callable from QML ---
     
     @Slot(str)
@@ -212,15 +270,14 @@ class CalendarController(QObject):
             self._current_date = strategy.navigate_forward(self, self._current_date)
             self._update_date_range()
             
+            # Load the new range (prefetched models when ready)
+            self._update_events_and_model()
+            
             # Update signals
             self.currentMonthYearChanged.emit()
             self.currentRangeDaysChanged.emit()
             self.currentRangeDisplayChanged.emit()
-            
-            # For month view, we need to update the events and model
-            if self._view_mode == "month":
-                self._update_events_and_model()
-                self.daysInMonthModelChanged.emit()
+            self.daysInMonthModelChanged.emit()
         else:
             print(f"Warning: Unknown view mode '{self._view_mode}' for navigation")
 
@@ -235,15 +292,14 @@ class CalendarController(QObject):
             self._current_date = strategy.navigate_backward(self, self._current_date)
             self._update_date_range()
             
+            # Load the new range (prefetched models when ready)
+            self._update_events_and_model()
+            
             # Update signals
             self.currentMonthYearChanged.emit()
             self.currentRangeDaysChanged.emit()
             self.currentRangeDisplayChanged.emit()
-            
-            # For month view, we need to update the events and model
-            if self._view_mode == "month":
-                self._update_events_and_model()
-                self.daysInMonthModelChanged.emit()
+            self.daysInMonthModelChanged.emit()
         else:
             print(f"Warning: Unknown view mode '{self._view_mode}' for navigation")
 
@@ -277,34 +333,18 @@ class CalendarController(QObject):
 
     @Slot()
     def refreshEvents(self):
-        """Refresh calendar data from Google Calendar."""
-        try:
-            self._sync_status = "Syncing..."
-            self.syncStatusChanged.emit(self._sync_status)
-            
-            # Fetch calendars and events
-            self._available_calendars = self._get_google_calendars()
-            
-            # Filter out any blocked calendars that might have been previously loaded
-            blocked_names = self._google_client.BLOCKED_CALENDAR_NAMES
-            self._available_calendars = [cal for cal in self._available_calendars 
-                                        if cal["name"] not in blocked_names]
-            
-            self._all_events = self._get_google_events()
-            
-            self._update_events_and_model(fetch_new_events=False)
-            self.availableCalendarsChanged.emit()
-            QTimer.singleShot(0, self.daysInMonthModelChanged.emit)
-            
-            # Update range days for custom views
-            self._update_range_days()
-            self.currentRangeDaysChanged.emit()
-            
-            self._sync_status = "Synced"
-            self.syncStatusChanged.emit(self._sync_status)
-        except Exception as e:
-            self._sync_status = f"Error: {str(e)}"
-            self.syncStatusChanged.emit(self._sync_status)
+        """Refresh calendars and events from Google Calendar in the background."""
+        self._calendar_list_stale = True
+        self._start_sync()
+
+    def cleanup(self):
+        """Stop syncing and prefetching and close the local store; a sync still in flight is abandoned."""
+        self._closing = True
+        self._sync_timer.stop()
+        self._prefetcher.shutdown()
+        self._sync_coordinator.shutdown(wait=False, cancel_futures=True)
+        self._fetch_executor.shutdown(wait=False, cancel_futures=True)
+        self._event_store.close()
 
     @Slot(str, bool)
     def setCalendarVisibility(self, calendarId, isVisible):
@@ -318,6 +358,7 @@ class CalendarController(QObject):
                 break
 
         if updated:
+            self._event_store.set_calendar_visible(calendarId, isVisible)
             self._update_events_and_model(fetch_new_events=False)
             self.availableCalendarsChanged.emit()
             QTimer.singleShot(0, self.daysInMonthModelChanged.emit)
@@ -326,6 +367,199 @@ class CalendarController(QObject):
             self._update_range_days()
             self.currentRangeDaysChanged.emit()
 
+    # --- Background Sync ---
+
+    def _start_sync(self):
+        """Start a background incremental sync of all calendars."""
+        if self._closing:
+            return
+        calendars = None if self._calendar_list_stale else [dict(cal) for cal in self._available_calendars]
+
+        self._sync_status = "Syncing..."
+        self.syncStatusChanged.emit(self._sync_status)
+        self._sync_coordinator.submit(self._run_sync, calendars)
+
+    def _run_sync(self, calendars):
+        """
+        Coordinator thread: fetch the calendar list (if needed), then the
+        changes of every calendar concurrently, store them and post the
+        result to the GUI thread.
+
+        Args:
+            calendars: Calendars to sync, or None to fetch the calendar list first
+        """
+        if self._closing:
+            return
+
+        started = time.perf_counter()
+        result = {
+            "calendars": None,
+            "changed_events": 0,
+            "full_syncs": 0,
+            "failed_calendar_ids": [],
+            "error": None,
+        }
+        try:
+            if calendars is None:
+                calendars = self._get_google_calendars()
+                self._event_store.save_calendars(calendars).result()
+                result["calendars"] = calendars
+
+            # Calendars without a token (new, or first run) get a full sync
+            sync_tokens = self._event_store.sync_tokens()
+            futures = [
+                (cal, self._fetch_executor.submit(self._google_client.sync_events, cal["id"], sync_tokens.get(cal["id"])))
+                for cal in calendars
+            ]
+            writes = []
+            for cal, future in futures:
+                try:
+                    changes = future.result()
+                except Exception as e:
+                    # The calendar keeps its stored events
+                    print(f"Error syncing calendar '{cal['name']}': {e}")
+                    result["failed_calendar_ids"].append(cal["id"])
+                    continue
+                result["changed_events"] += len(changes["events"]) + len(changes["deleted_ids"])
+                result["full_syncs"] += int(changes["full_sync"])
+                writes.append(self._event_store.apply_changes(
+                    cal["id"], changes["events"], changes["deleted_ids"], changes["sync_token"], changes["full_sync"]
+                ))
+            for write in writes:
+                write.result()
+        except Exception as e:
+            print(f"Error syncing calendars: {e}")
+            result["error"] = str(e)
+
+        result["duration_ms"] = (time.perf_counter() - started) * 1000
+        if not self._closing:
+            self._syncFinished.emit(result)
+
+    @Slot(object)
+    def _apply_sync_result(self, result):
+        """GUI thread: reload the current range from the local store if the sync changed anything."""
+        self._record_sync_metrics(result)
+        if result["error"] is not None:
+            self._sync_status = f"Error: {result['error']}"
+            self.syncStatusChanged.emit(self._sync_status)
+            return
+
+        if result["calendars"] is not None:
+            self._calendar_list_stale = False
+            self._available_calendars = self._load_stored_calendars()
+            self.availableCalendarsChanged.emit()
+
+        if result["calendars"] is not None or result["changed_events"] or result["full_syncs"]:
+            # Prefetched ranges hold the old events
+            self._prefetcher.clear()
+            self._update_events_and_model()
+            self.daysInMonthModelChanged.emit()
+            self.currentRangeDaysChanged.emit()
+
+        failed = len(result["failed_calendar_ids"])
+        self._sync_status = f"Synced ({failed} calendars failed)" if failed else "Synced"
+        self.syncStatusChanged.emit(self._sync_status)
+
+    def _record_sync_metrics(self, result):
+        metrics = self._sync_metrics
+        duration_ms = result["duration_ms"]
+        metrics["sync_count"] += 1
+        metrics["last_duration_ms"] = round(duration_ms, 1)
+        metrics["max_duration_ms"] = round(max(metrics["max_duration_ms"], duration_ms), 1)
+        # Running mean over all syncs
+        average = metrics["average_duration_ms"]
+        metrics["average_duration_ms"] = round(average + (duration_ms - average) / metrics["sync_count"], 1)
+        if result["calendars"] is not None:
+            metrics["calendar_count"] = len(result["calendars"])
+        metrics["changed_events"] = result["changed_events"]
+        metrics["failed_calendars"] = len(result["failed_calendar_ids"])
+        print(
+            f"Calendar sync took {duration_ms:.0f} ms "
+            f"({metrics['changed_events']} changed events, {result['full_syncs']} full syncs, "
+            f"{metrics['failed_calendars']} calendars failed, "
+            f"average {metrics['average_duration_ms']:.0f} ms over {metrics['sync_count']} syncs)"
+        )
+
+    def _load_stored_calendars(self):
+        """Get the calendars from the local store (empty before the first sync)."""
+        try:
+            return self._event_store.load_calendars()
+        except sqlite3.Error as e:
+            print(f"Error loading stored calendars: {e}")
+            return []
+
+    def _load_range_events(self):
+        """Load the events of the current fetch range from the local store."""
+        start_date, end_date = self._get_event_fetch_range()
+        try:
+            self._all_events = self._event_store.events_between(
+                start_date.toString("yyyy-MM-dd"), end_date.toString("yyyy-MM-dd")
+            )
+        except sqlite3.Error as e:
+            print(f"Error loading stored events: {e}")
+
+    # --- Prefetching ---
+
+    def _visible_calendar_ids(self):
+        return frozenset(cal["id"] for cal in self._available_calendars if cal["is_visible"])
+
+    def _models_key(self, view_mode, current_date):
+        """Identifies the models of a view for a date, the calendars shown and today's date."""
+        range_start, _ = self._get_date_range(view_mode, current_date)
+        return (
+            view_mode,
+            current_date.year(),
+            current_date.month(),
+            range_start.toString("yyyy-MM-dd") if range_start else None,
+            self._visible_calendar_ids(),
+            QDate.currentDate().toString("yyyy-MM-dd"),  # For the isToday flags
+        )
+
+    def _schedule_prefetch(self):
+        """Start building the models of the previous and next range; any other prefetched range is dropped."""
+        if self._closing or self._view_mode not in self._view_strategies:
+            return
+        strategy = self._view_strategies[self._view_mode]
+        visible_ids = self._visible_calendar_ids()
+        requests = {}
+        for neighbour in (strategy.navigate_backward(self, self._current_date),
+                          strategy.navigate_forward(self, self._current_date)):
+            requests[self._models_key(self._view_mode, neighbour)] = (self._view_mode, neighbour, visible_ids)
+        self._prefetcher.prefetch(requests)
+
+    def _build_models(self, view_mode, current_date, visible_ids):
+        """
+        Build the models of a view for a date from the local store.
+        Runs on the prefetch thread, so it never changes the controller state.
+
+        Args:
+            view_mode: View mode to build for
+            current_date: Reference QDate of the range
+            visible_ids: Ids of the calendars shown
+
+        Returns:
+            Dictionary with the events, event index, days model and range days
+        """
+        start_date, end_date = self._get_event_fetch_range(view_mode, current_date)
+        all_events = self._event_store.events_between(
+            start_date.toString("yyyy-MM-dd"), end_date.toString("yyyy-MM-dd")
+        )
+        filtered_events = [event for event in all_events if event["calendar_id"] in visible_ids]
+        event_index = CalendarEventIndex(filtered_events)
+        days_model = self._calculate_days_model(view_mode, current_date, filtered_events, event_index)
+        range_start, range_end = self._get_date_range(view_mode, current_date)
+        range_days = self._build_range_days(
+            view_mode, range_start, range_end, filtered_events, event_index, QLocale()
+        )
+        return {
+            "all_events": all_events,
+            "filtered_events": filtered_events,
+            "event_index": event_index,
+            "days_model": days_model,
+            "range_days": range_days,
+            "event_count": len(all_events),
+        }
+
     # --- Helper Methods ---
     
     def _update_date_range(self):
@@ -344,85 +578,80 @@ class CalendarController(QObject):
         # Update range days
         self._update_range_days()
         
+    def _get_date_range(self, view_mode, current_date):
+        """Get the (start, end) QDates a view shows for a date, without changing the controller."""
+        if view_mode in self._view_strategies:
+            return self._view_strategies[view_mode].get_date_range(current_date)
+        return QDate(current_date), QDate(current_date)
+        
     def _update_range_days(self):
         """Update the range days model for custom views using the appropriate strategy."""
-        # If we're in month view or have invalid date range, just clear the range days
-        if self._view_mode == "month" or not self._range_start_date or not self._range_end_date:
-            self._range_days = []
-            return
+        self._range_days = self._build_range_days(
+            self._view_mode,
+            self._range_start_date,
+            self._range_end_date,
+            self._filtered_events,
+            self._event_index,
+            self._locale
+        )
+        
+    def _build_range_days(self, view_mode, start_date, end_date, filtered_events, event_index, locale):
+        """Build the range days model for custom views (also used on the prefetch thread)."""
+        # If we're in month view or have invalid date range, there are no range days
+        if view_mode == "month" or not start_date or not end_date:
+            return []
             
         # If we have a strategy for this view mode, let it handle the range days creation
-        if self._view_mode in self._view_strategies:
-            strategy = self._view_strategies[self._view_mode]
+        if view_mode in self._view_strategies:
+            strategy = self._view_strategies[view_mode]
             # Check if strategy has a custom method for handling range days
             if hasattr(strategy, 'create_range_days'):
-                self._range_days = strategy.create_range_days(
-                    self, 
-                    self._range_start_date, 
-                    self._range_end_date, 
-                    self._filtered_events,
-                    self._locale
-                )
-                return
+                return strategy.create_range_days(self, start_date, end_date, filtered_events, locale)
                 
         # Fallback: Create range days using the standard approach
-        self._create_standard_range_days()
+        return self._create_standard_range_days(start_date, end_date, event_index, locale)
             
-    def _create_standard_range_days(self):
+    def _create_standard_range_days(self, start_date, end_date, event_index, locale):
         """Standard implementation for creating range days model used as fallback."""
         # Create range days
         result = []
-        current_date = self._range_start_date
+        current_date = start_date
         today = QDate.currentDate()
         
-        while current_date <= self._range_end_date:
+        while current_date <= end_date:
             # Get events for this day
             date_str = DateUtils.to_string(current_date, DateUtils.FORMAT_ISO)
+            day = CalendarEventIndex.ordinal(current_date)
             
             # Find regular events for this day
             regular_events = []
             multi_day_events = []
             
-            for event in self._filtered_events:
-                event_start_date = DateUtils.to_qdate(event.get("start_date", ""))
-                event_end_date = DateUtils.to_qdate(event.get("end_date", ""))
+            # Only the events on this day, with their dates already parsed
+            for record in event_index.events_on(day):
+                # Clone the event to avoid modifying the original
+                event_copy = record.event.copy()
                 
-                # Skip if dates are invalid
-                if not event_start_date or not event_end_date or not event_start_date.isValid() or not event_end_date.isValid():
-                    continue
-                    
-                # Check if event is on this day
-                if event_start_date <= current_date and current_date <= event_end_date:
-                    # Clone the event to avoid modifying the original
-                    event_copy = event.copy()
-                    
-                    # Mark if this is a multi-day event
-                    is_multi_day = DateUtils.days_between(event_start_date, event_end_date) > 0
+                if record.is_multi_day:
+                    event_copy["is_multi_day"] = True
+                    event_copy["isStart"] = record.start == day
+                    event_copy["isEnd"] = record.end == day
+                    multi_day_events.append(event_copy)
+                else:
+                    event_copy["is_multi_day"] = False
                     
-                    if is_multi_day:
-                        event_copy["is_multi_day"] = True
-                        event_copy["isStart"] = DateUtils.is_same_day(event_start_date, current_date)
-                        event_copy["isEnd"] = DateUtils.is_same_day(event_end_date, current_date)
-                        multi_day_events.append(event_copy)
-                    else:
-                        event_copy["is_multi_day"] = False
-                        
-                        # Add time formatting for day view
-                        if "start_time" in event and event["start_time"]:
-                            try:
-                                start_time = datetime.fromisoformat(event["start_time"])
-                                event_copy["timeDisplay"] = DateUtils.to_string(start_time, DateUtils.FORMAT_TIME)
-                            except (ValueError, TypeError):
-                                event_copy["timeDisplay"] = ""
-                                
-                        regular_events.append(event_copy)
+                    # Add time formatting for day view
+                    if record.event.get("start_time"):
+                        event_copy["timeDisplay"] = record.time_display
+                            
+                    regular_events.append(event_copy)
             
             # Create day data
             day_data = {
                 "date": current_date.toPython(),
                 "date_str": date_str,
                 "day": str(current_date.day()),
-                "dayName": self._locale.standaloneDayName(current_date.dayOfWeek(), QLocale.ShortFormat),
+                "dayName": locale.standaloneDayName(current_date.dayOfWeek(), QLocale.ShortFormat),
                 "isToday": current_date == today,
                 "events": regular_events,
                 "multiDayEvents": multi_day_events
@@ -431,26 +660,38 @@ class CalendarController(QObject):
             result.append(day_data)
             current_date = current_date.addDays(1)
             
-        self._range_days = result
+        return result
 
     def _update_events_and_model(self, fetch_new_events=True):
-        """Fetches/refreshes events and recalculates the days model."""
+        """
+        Recalculates the days model.
+
+        Args:
+            fetch_new_events: Load the events of the current range from the local
+                              store first (milliseconds; Google is never called here).
+                              Models prefetched for the range are used if ready.
+        """
         try:
             # Keep a copy of the old model in case we need to revert
             old_model = self._days_in_month_model.copy() if self._days_in_month_model else []
             
+            models = None
             if fetch_new_events:
-                if not self._available_calendars:
-                    self._available_calendars = self._get_google_calendars()
-                    # Filter out any blocked calendars
-                    blocked_names = self._google_client.BLOCKED_CALENDAR_NAMES
-                    self._available_calendars = [cal for cal in self._available_calendars 
-                                               if cal["name"] not in blocked_names]
-                self._all_events = self._get_google_events()
+                models = self._prefetcher.take(self._models_key(self._view_mode, self._current_date))
             
-            # Process events first without changing the model
-            self._filtered_events = self._filter_events()
-            new_model = self._calculate_days_model()
+            if models is not None:
+                self._all_events = models["all_events"]
+                self._filtered_events = models["filtered_events"]
+                self._event_index = models["event_index"]
+                new_model = models["days_model"]
+            else:
+                if fetch_new_events:
+                    self._load_range_events()
+                
+                # Process events first without changing the model
+                self._filtered_events = self._filter_events()
+                self._event_index = CalendarEventIndex(self._filtered_events)
+                new_model = self._calculate_days_model()
             
             # Only update model if we have a valid new model
             if new_model:
@@ -463,19 +704,27 @@ class CalendarController(QObject):
                     self._days_in_month_model = old_model
                     
             # Update range days for custom views
-            self._update_range_days()
+            if models is not None:
+                self._range_days = models["range_days"]
+            else:
+                self._update_range_days()
         except Exception as e:
             print(f"Error updating calendar model: {e}")
             # If there was an error, make sure we have at least an empty grid
             if not self._days_in_month_model:
                 self._days_in_month_model = self._create_empty_grid()
 
-    def _create_empty_grid(self):
+        # Get the neighbouring ranges ready for the next swipe
+        self._schedule_prefetch()
+
+    def _create_empty_grid(self, current_date=None):
         """Creates a basic empty grid with just dates, no events."""
+        if current_date is None:
+            current_date = self._current_date
         days_model = []
         today = QDate.currentDate()
-        year = self._current_date.year()
-        month = self._current_date.month()
+        year = current_date.year()
+        month = current_date.month()
         first_day_of_month = QDate(year, month, 1)
         start_day_offset = first_day_of_month.dayOfWeek() - 1
         grid_start_date = first_day_of_month.addDays(-start_day_offset)
@@ -509,95 +758,47 @@ class CalendarController(QObject):
         return [event for event in self._all_events if event["calendar_id"] in visible_calendar_ids]
 
     def _get_google_calendars(self):
-        """Fetch calendars from Google Calendar API."""
-        try:
-            calendars = self._google_client.get_calendars()
-            return [{
-                "id": cal["id"],
-                "name": cal["name"],
-                "color": cal["color"],
-                "is_visible": True  # Default to visible
-            } for cal in calendars]
-        except Exception as e:
-            print(f"Error fetching calendars: {e}")
-            return []
+        """Fetch calendars from Google Calendar API (called on the sync thread)."""
+        calendars = self._google_client.get_calendars()
+        blocked_names = self._google_client.BLOCKED_CALENDAR_NAMES
+        return [{
+            "id": cal["id"],
+            "name": cal["name"],
+            "color": cal["color"],
+            "is_visible": True  # Default to visible
+        } for cal in calendars if cal["name"] not in blocked_names]
 
-    def _get_google_events(self):
-        """Fetch events from Google Calendar API for the current view."""
-        try:
-            # Determine the appropriate date range for this view mode
-            if self._view_mode in self._view_strategies and hasattr(self._view_strategies[self._view_mode], 'get_event_fetch_range'):
-                # Use the strategy to determine the date range for event fetching
-                strategy = self._view_strategies[self._view_mode]
-                start_date, end_date = strategy.get_event_fetch_range(self, self._current_date)
-            else:
-                # Fallback to standard month grid with padding if no strategy or not implemented
-                # Calculate date range for the current month view
-                first_day = QDate(self._current_date.year(), self._current_date.month(), 1)
-                last_day = QDate(self._current_date.year(), self._current_date.month(), 
-                              self._current_date.daysInMonth())
-                
-                # Add padding for the grid view (6 weeks)
-                start_date = first_day.addDays(-(first_day.dayOfWeek() - 1))
-                end_date = last_day.addDays(42 - (last_day.dayOfWeek() + last_day.daysInMonth() - first_day.day()))
-            
-            # Fetch events for all visible calendars within the date range
-            all_events = []
-            for calendar in self._available_calendars:
-                if calendar["is_visible"]:
-                    events = self._google_client.get_events(
-                        calendar["id"],
-                        datetime.combine(start_date.toPython(), datetime.min.time()),
-                        datetime.combine(end_date.toPython(), datetime.max.time())
-                    )
-                    # Ensure each event has a proper color from its calendar
-                    for event in events:
-                        # If event doesn't have a specific color, use the calendar color
-                        if not event["color"]:
-                            event["color"] = calendar["color"]
-                        # Add the calendar display name to the event
-                        event["calendar_name"] = calendar["name"]
-                    all_events.extend(events)
-            
-            return all_events
-        except Exception as e:
-            print(f"Error fetching events: {e}")
-            return []
+    def _get_event_fetch_range(self, view_mode=None, current_date=None):
+        """Get the (start, end) QDates of the events needed for a view (default: the current one)."""
+        if view_mode is None:
+            view_mode = self._view_mode
+        if current_date is None:
+            current_date = self._current_date
+        # Determine the appropriate date range for this view mode
+        if view_mode in self._view_strategies and hasattr(self._view_strategies[view_mode], 'get_event_fetch_range'):
+            # Use the strategy to determine the date range for event fetching
+            strategy = self._view_strategies[view_mode]
+            return strategy.get_event_fetch_range(self, current_date)
 
-    def _extract_event_dates(self, event):
-        """Extract and validate start/end dates from an event."""
-        try:
-            # Parse the start date using DateUtils
-            if event.get("start_time"):
-                event["start_date"] = DateUtils.extract_iso_date(event["start_time"])
-            else:
-                # Skip events without start time
-                return False
-                
-            # Parse the end date using DateUtils
-            if event.get("end_time"):
-                event["end_date"] = DateUtils.extract_iso_date(event["end_time"])
-            else:
-                # For events with no end time, use start date
-                event["end_date"] = event["start_date"]
-                
-            # Validate the dates
-            start_date = DateUtils.to_qdate(event["start_date"])
-            end_date = DateUtils.to_qdate(event["end_date"])
-            
-            return start_date and end_date and start_date.isValid() and end_date.isValid()
-        except Exception as e:
-            print(f"Error extracting event dates: {str(e)}")
-            return False
+        # Fallback to standard month grid with padding if no strategy or not implemented
+        # Calculate date range for the current month view
+        first_day = QDate(current_date.year(), current_date.month(), 1)
+        last_day = QDate(current_date.year(), current_date.month(), 
+                      current_date.daysInMonth())
+        
+        # Add padding for the grid view (6 weeks)
+        start_date = first_day.addDays(-(first_day.dayOfWeek() - 1))
+        end_date = last_day.addDays(42 - (last_day.dayOfWeek() + last_day.daysInMonth() - first_day.day()))
+        return start_date, end_date
 
-    def _create_basic_grid(self):
+    def _create_basic_grid(self, current_date):
         """Creates the basic 6x7 grid with dates for the month view."""
         weeks_data = []
         days_model = []
         
         # Setup year, month, and date constants
-        year = self._current_date.year()
-        month = self._current_date.month()
+        year = current_date.year()
+        month = current_date.month()
         today = QDate.currentDate()
         first_day_of_month = QDate(year, month, 1)
         start_day_offset = first_day_of_month.dayOfWeek() - 1
@@ -636,33 +837,20 @@ class CalendarController(QObject):
         
         return days_model, weeks_data, grid_start_date
         
-    def _assign_events_to_days(self, days_model, grid_start_date, weeks_data):
+    def _assign_events_to_days(self, days_model, grid_start_date, weeks_data, event_index):
         """Maps events to specific days in the grid."""
         event_to_days = {}  # Maps event IDs to day indices
+        grid_start = CalendarEventIndex.ordinal(grid_start_date)
         
-        for event in self._filtered_events:
-            # Get start and end dates for the event
+        # Only the events overlapping the grid; their dates are already parsed
+        # (all-day end dates made inclusive)
+        for record in event_index.events_between(grid_start, grid_start + 41):
+            event = record.event
             try:
-                # Extract and validate date information
-                if not self._extract_event_dates(event):
-                    continue
-                    
-                start_date = DateUtils.to_qdate(event["start_date"])
-                end_date = DateUtils.to_qdate(event["end_date"])
-                
-                # Adjust end date for all-day events
-                if event.get("all_day", False) and end_date and end_date.isValid():
-                    end_date = end_date.addDays(-1)
-                    event["end_date"] = DateUtils.to_string(end_date, DateUtils.FORMAT_ISO)
-                    
                 # Calculate grid positions
-                days_difference_start = grid_start_date.daysTo(start_date)
-                days_difference_end = grid_start_date.daysTo(end_date)
+                days_difference_start = record.start - grid_start
+                days_difference_end = record.end - grid_start
                 
-                # Skip events outside our grid
-                if days_difference_end < 0 or days_difference_start >= 42:
-                    continue
-                    
                 # Enforce bounds within our grid
                 grid_start_idx = max(0, days_difference_start)
                 grid_end_idx = min(41, days_difference_end)
@@ -718,45 +906,21 @@ class CalendarController(QObject):
                 
         return event_to_days, weeks_data
         
-    def _assign_event_layout_rows(self, events):
-        """Assigns layout rows to multi-day events to avoid visual overlaps."""
-        # Sort events by length (descending) and then start time
-        events.sort(key=lambda e: (-((e["end_col"] - e["start_col"]) + 1), e["start_time"]))
-        
-        # Track which positions (row,col) are used
-        used_positions = set()  # Set of (row,col) tuples
-        
-        for event in events:
-            # Find the first available row that spans all columns needed
-            found_row = -1
-            for row_idx in range(10):  # Limit to 10 rows max
-                # Check if this row is available for the entire span
-                row_available = True
-                for col in range(event["start_col"], event["end_col"] + 1):
-                    if (row_idx, col) in used_positions:
-                        row_available = False
-                        break
-                        
-                if row_available:
-                    found_row = row_idx
-                    break
-            
-            # Assign this event to the found row
-            if found_row >= 0:
-                event["layout_row"] = found_row
-                # Mark positions as used
-                for col in range(event["start_col"], event["end_col"] + 1):
-                    used_positions.add((found_row, col))
-            else:
-                # If no row found, put it in row 0 (overflows)
-                event["layout_row"] = 0
+    def _assign_event_layout_rows(self, events, week_key=None):
+        """
+        Assigns layout rows to multi-day events to avoid visual overlaps.
+        Longer events get the top rows; layouts are reused when the same week
+        shows the same events again (e.g. after a calendar is toggled back on).
+        """
+        self._layout_engine.assign_rows(week_key, events)
                 
     def _process_multi_day_events(self, weeks_data):
         """Handles layout and positioning of multi-day events."""
         # Assign layout rows for each week's events
         for week_data in weeks_data:
             if week_data["multi_day_events"]:
-                self._assign_event_layout_rows(week_data["multi_day_events"])
+                week_key = week_data["days"][0]["date_str"]
+                self._assign_event_layout_rows(week_data["multi_day_events"], week_key)
         
         # Add multi-day events to the day objects for easy reference
         for week_idx, week_data in enumerate(weeks_data):
@@ -764,41 +928,52 @@ class CalendarController(QObject):
                 # Reference the week's multi-day events from each day
                 day["multi_day_events"] = week_data["multi_day_events"]
                 
-    def _calculate_days_model(self):
+    def _calculate_days_model(self, view_mode=None, current_date=None, filtered_events=None, event_index=None):
         """ 
         Calculates the list of day dictionaries for the grid view.
         Pre-calculates event positions for the UI.
         Uses view-specific strategies when available.
+        
+        The arguments default to the current state; the prefetch thread
+        passes its own, so it never reads state the GUI thread changes.
         """
+        if view_mode is None:
+            view_mode = self._view_mode
+        if current_date is None:
+            current_date = self._current_date
+        if filtered_events is None:
+            filtered_events = self._filtered_events
+        if event_index is None:
+            event_index = self._event_index
         try:
             # First check if the current view mode has a custom implementation
-            if self._view_mode in self._view_strategies:
-                strategy = self._view_strategies[self._view_mode]
+            if view_mode in self._view_strategies:
+                strategy = self._view_strategies[view_mode]
                 if hasattr(strategy, 'calculate_days_model'):
                     # Let the strategy handle the model calculation
                     result = strategy.calculate_days_model(
                         self, 
-                        self._current_date, 
-                        self._filtered_events
+                        current_date, 
+                        filtered_events
                     )
                     if result is not None:
                         return result
                     
             # If no strategy implementation or it returned None, use the standard approach
-            return self._calculate_standard_days_model()
+            return self._calculate_standard_days_model(current_date, event_index)
             
         except Exception as e:
             print(f"Error calculating days model: {e}")
             # Fallback to empty grid on error
-            return self._create_empty_grid()
+            return self._create_empty_grid(current_date)
             
-    def _calculate_standard_days_model(self):
+    def _calculate_standard_days_model(self, current_date, event_index):
         """Standard implementation for calculating the days model grid."""
         # Create the basic grid structure
-        days_model, weeks_data, grid_start_date = self._create_basic_grid()
+        days_model, weeks_data, grid_start_date = self._create_basic_grid(current_date)
         
         # Process events and assign them to days
-        event_to_days, weeks_data = self._assign_events_to_days(days_model, grid_start_date, weeks_data)
+        event_to_days, weeks_data = self._assign_events_to_days(days_model, grid_start_date, weeks_data, event_index)
         
         # Process multi-day events and calculate their layout
         self._process_multi_day_events(weeks_data)
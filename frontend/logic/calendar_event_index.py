@@ -0,0 +1,154 @@
+"""
+Calendar Event Index Module
+
+Parses calendar events once into compact records and indexes them by day,
+so building the month, week and day models costs O(days + matching events)
+instead of re-parsing every event's dates for every day shown.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta
+
+from .date_utils import DateUtils
+
+# Events longer than this aren't put in the per-day buckets (a vacation or a
+# semester would fill hundreds of them); they're checked separately
+MAX_BUCKETED_DAYS = 31
+
+
+class EventRecord:
+    """
+    An event with its dates parsed once.
+
+    Attributes:
+        event: The original event dictionary
+        position: Position of the event in the indexed list (keeps display order)
+        start: First day, as a date ordinal
+        end: Last day (inclusive), as a date ordinal
+    """
+
+    __slots__ = ("event", "position", "start", "end", "_time_display")
+
+    def __init__(self, event, position, start, end):
+        self.event = event
+        self.position = position
+        self.start = start
+        self.end = end
+        self._time_display = None
+
+    @classmethod
+    def from_event(cls, event, position):
+        """
+        Parse an event; returns None if it has no valid start date.
+
+        Also sets the event's "start_date" and "end_date" (yyyy-MM-dd). The
+        exclusive end date Google gives all-day events is made inclusive.
+        """
+        start_time = event.get("start_time")
+        if not start_time:
+            return None
+        try:
+            start = date.fromisoformat(DateUtils.extract_iso_date(start_time))
+            end_time = event.get("end_time")
+            end = date.fromisoformat(DateUtils.extract_iso_date(end_time)) if end_time else start
+        except (TypeError, ValueError):
+            return None
+        if event.get("all_day", False):
+            end -= timedelta(days=1)
+        end = max(start, end)
+
+        event["start_date"] = start.isoformat()
+        event["end_date"] = end.isoformat()
+        return cls(event, position, start.toordinal(), end.toordinal())
+
+    @property
+    def is_multi_day(self):
+        return self.end > self.start
+
+    @property
+    def time_display(self):
+        """Start time for the day view (e.g. "09:30 AM"), formatted on first use."""
+        if self._time_display is None:
+            try:
+                start_time = datetime.fromisoformat(self.event["start_time"])
+                self._time_display = DateUtils.to_string(start_time, DateUtils.FORMAT_TIME)
+            except (ValueError, TypeError):
+                self._time_display = ""
+        return self._time_display
+
+
+class CalendarEventIndex:
+    """
+    Day index over a list of events.
+
+    Each event of up to MAX_BUCKETED_DAYS days is listed in the bucket of
+    every day it covers; longer events are kept in a separate short list.
+    Results are in the order of the indexed event list.
+    """
+
+    def __init__(self, events):
+        """
+        Args:
+            events: Event dictionaries (with start_time/end_time/all_day);
+                    events without a valid start are left out
+        """
+        self._records = []
+        self._buckets = defaultdict(list)
+        self._long_records = []
+
+        for event in events:
+            record = EventRecord.from_event(event, len(self._records))
+            if record is None:
+                continue
+            self._records.append(record)
+            if record.end - record.start < MAX_BUCKETED_DAYS:
+                for day in range(record.start, record.end + 1):
+                    self._buckets[day].append(record)
+            else:
+                self._long_records.append(record)
+
+    def __len__(self):
+        return len(self._records)
+
+    @staticmethod
+    def ordinal(day):
+        """Date ordinal of a QDate or a Python date."""
+        if hasattr(day, "toPython"):
+            day = day.toPython()
+        return day.toordinal()
+
+    def events_on(self, day):
+        """
+        Get the records of the events covering one day.
+
+        Args:
+            day: Date ordinal (see ordinal())
+
+        Returns:
+            List of EventRecord
+        """
+        records = self._buckets.get(day, [])
+        long_records = [r for r in self._long_records if r.start <= day <= r.end]
+        if not long_records:
+            return list(records)
+        return sorted(records + long_records, key=lambda r: r.position)
+
+    def events_between(self, first_day, last_day):
+        """
+        Get the records of the events overlapping a range of days, each once.
+
+        Args:
+            first_day: Date ordinal of the first day
+            last_day: Date ordinal of the last day (inclusive)
+
+        Returns:
+            List of EventRecord
+        """
+        found = {}
+        for day in range(first_day, last_day + 1):
+            for record in self._buckets.get(day, ()):
+                found[record.position] = record
+        for record in self._long_records:
+            if record.start <= last_day and record.end >= first_day:
+                found[record.position] = record
+        return [found[position] for position in sorted(found)]
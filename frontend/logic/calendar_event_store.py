@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+import time
+from datetime import date, timedelta
+
+from frontend.config import CALENDAR_CACHE_DB_PATH
+from frontend.utils.sqlite_store import SQLiteStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS calendars (
+    id TEXT PRIMARY KEY,
+    name TEXT NOT NULL,
+    color TEXT,
+    position INTEGER NOT NULL DEFAULT 0,
+    is_visible INTEGER NOT NULL DEFAULT 1,
+    sync_token TEXT,
+    synced_at REAL
+);
+CREATE TABLE IF NOT EXISTS events (
+    calendar_id TEXT NOT NULL,
+    id TEXT NOT NULL,
+    title TEXT,
+    start_time TEXT,
+    end_time TEXT,
+    all_day INTEGER NOT NULL DEFAULT 0,
+    color TEXT,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    PRIMARY KEY (calendar_id, id)
+);
+CREATE INDEX IF NOT EXISTS events_by_start ON events(start_date);
+"""
+
+
+def _event_dates(event):
+    """
+    Get the (first day, last day) of an event as yyyy-MM-dd strings.
+    Google's end date of all-day events is exclusive; the stored one isn't.
+    """
+    start = event["start_time"].split("T")[0]
+    end = (event["end_time"] or event["start_time"]).split("T")[0]
+    if event["all_day"] and end > start:
+        end = (date.fromisoformat(end) - timedelta(days=1)).isoformat()
+    return start, end
+
+
+class CalendarEventStore(SQLiteStore):
+    """
+    Persistent local copy of the Google calendars and their events (SQLite).
+
+    Each calendar keeps the Google sync token of its last sync, so a sync only
+    transfers the events that changed. Any date range is answered from the
+    local copy, and because it survives restarts the calendar can be drawn
+    before the first sync finishes.
+    """
+
+    def __init__(self, db_path=CALENDAR_CACHE_DB_PATH):
+        super().__init__(db_path, SCHEMA, "calendar-store")
+
+    # --- Reads (calling thread) ---
+
+    def load_calendars(self):
+        """
+        Get the stored calendars in Google's order.
+
+        Returns:
+            List of {"id", "name", "color", "is_visible"} dictionaries
+        """
+        rows = self._connection().execute(
+            "SELECT id, name, color, is_visible FROM calendars ORDER BY position"
+        ).fetchall()
+        return [{
+            "id": row["id"],
+            "name": row["name"],
+            "color": row["color"],
+            "is_visible": bool(row["is_visible"]),
+        } for row in rows]
+
+    def sync_tokens(self):
+        """Get {calendar_id: sync token} of the calendars synced before."""
+        rows = self._connection().execute(
+            "SELECT id, sync_token FROM calendars WHERE sync_token IS NOT NULL"
+        ).fetchall()
+        return {row["id"]: row["sync_token"] for row in rows}
+
+    def events_between(self, start_date, end_date):
+        """
+        Get the events overlapping a date range, ordered by calendar and start time.
+
+        Args:
+            start_date: First day of the range (yyyy-MM-dd)
+            end_date: Last day of the range (yyyy-MM-dd)
+
+        Returns:
+            List of event dictionaries in the format of GoogleCalendarClient.get_events,
+            plus "calendar_name"; events without a color get their calendar's color
+        """
+        rows = self._connection().execute(
+            "SELECT e.id, e.calendar_id, e.title, e.start_time, e.end_time, e.all_day, "
+            "COALESCE(NULLIF(e.color, ''), c.color) AS color, c.name AS calendar_name "
+            "FROM events e JOIN calendars c ON c.id = e.calendar_id "
+            "WHERE e.start_date <= ? AND e.end_date >= ? "
+            "ORDER BY c.position, e.start_time",
+            (end_date, start_date),
+        ).fetchall()
+        return [{
+            "id": row["id"],
+            "calendar_id": row["calendar_id"],
+            "title": row["title"],
+            "start_time": row["start_time"],
+            "end_time": row["end_time"],
+            "all_day": bool(row["all_day"]),
+            "color": row["color"],
+            "calendar_name": row["calendar_name"],
+        } for row in rows]
+
+    # --- Writes (worker thread) ---
+
+    def _save_calendars(self, calendars):
+        conn = self._connection()
+        with conn:
+            for position, cal in enumerate(calendars):
+                # Visibility and the sync token of known calendars are kept
+                conn.execute(
+                    "INSERT INTO calendars (id, name, color, position, is_visible) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT(id) DO UPDATE SET name = excluded.name, color = excluded.color, "
+                    "position = excluded.position",
+                    (cal["id"], cal["name"], cal["color"], position, int(cal.get("is_visible", True))),
+                )
+            ids = [cal["id"] for cal in calendars]
+            placeholders = ",".join("?" * len(ids))
+            removed = f"NOT IN ({placeholders})" if ids else "IS NOT NULL"
+            conn.execute(f"DELETE FROM events WHERE calendar_id {removed}", ids)
+            conn.execute(f"DELETE FROM calendars WHERE id {removed}", ids)
+
+    def _apply_changes(self, calendar_id, events, deleted_ids, sync_token, full_sync):
+        conn = self._connection()
+        with conn:
+            if full_sync:
+                conn.execute("DELETE FROM events WHERE calendar_id = ?", (calendar_id,))
+            conn.executemany(
+                "DELETE FROM events WHERE calendar_id = ? AND id = ?",
+                [(calendar_id, event_id) for event_id in deleted_ids],
+            )
+            conn.executemany(
+                "INSERT OR REPLACE INTO events "
+                "(calendar_id, id, title, start_time, end_time, all_day, color, start_date, end_date) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                [(
+                    calendar_id,
+                    event["id"],
+                    event["title"],
+                    event["start_time"],
+                    event["end_time"],
+                    int(event["all_day"]),
+                    event["color"],
+                    *_event_dates(event),
+                ) for event in events],
+            )
+            conn.execute(
+                "UPDATE calendars SET sync_token = ?, synced_at = ? WHERE id = ?",
+                (sync_token, time.time(), calendar_id),
+            )
+
+    def _set_calendar_visible(self, calendar_id, is_visible):
+        conn = self._connection()
+        with conn:
+            conn.execute("UPDATE calendars SET is_visible = ? WHERE id = ?", (int(is_visible), calendar_id))
+
+    # --- Public write API (any thread, returns a Future) ---
+
+    def save_calendars(self, calendars):
+        """
+        Store the calendar list; calendars no longer in it are removed with their events.
+
+        Args:
+            calendars: List of {"id", "name", "color"} dictionaries in display order
+        """
+        return self._submit(self._save_calendars, calendars)
+
+    def apply_changes(self, calendar_id, events, deleted_ids, sync_token, full_sync):
+        """
+        Store the result of syncing one calendar.
+
+        Args:
+            calendar_id: Calendar that was synced
+            events: New or changed events
+            deleted_ids: Ids of events that were deleted
+            sync_token: Token for the next incremental sync
+            full_sync: True if the events replace everything stored for the calendar
+        """
+        return self._submit(self._apply_changes, calendar_id, events, deleted_ids, sync_token, full_sync)
+
+    def set_calendar_visible(self, calendar_id, is_visible):
+        """Remember whether a calendar is shown."""
+        return self._submit(self._set_calendar_visible, calendar_id, is_visible)
@@ -0,0 +1,102 @@
+"""
+Calendar Layout Module
+
+Assigns layout rows to the multi-day event bars of the month grid. Row
+occupancy of a week is kept as one bitmask per row (bit n = column n), and
+layouts are memoized per week and set of visible bars, so switching months
+back and forth or toggling a calendar on and off reuses earlier layouts.
+"""
+
+import threading
+from collections import OrderedDict
+
+# Week layouts kept; one entry is a tuple of row numbers
+LAYOUT_CACHE_SIZE = 512
+
+
+class MultiDayLayoutEngine:
+    """
+    Row assignment for the multi-day event bars of a week.
+
+    Longer bars get the top rows; each bar takes the first row whose columns
+    are free over its whole span. There is no limit on the number of rows.
+    Safe to use from the GUI and prefetch threads at once.
+    """
+
+    def __init__(self, cache_size=LAYOUT_CACHE_SIZE):
+        self._cache = OrderedDict()
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _sort_key(segment):
+        # Longest first, then by start time; the ids make ties deterministic,
+        # so the same bars always get the same layout
+        return (
+            segment["start_col"] - segment["end_col"],
+            segment.get("start_time") or "",
+            segment.get("calendar_id") or "",
+            segment.get("id") or "",
+            segment["start_col"],
+        )
+
+    @staticmethod
+    def compute_rows(spans):
+        """
+        First-fit row assignment.
+
+        Args:
+            spans: (start_col, end_col) pairs in placement order
+
+        Returns:
+            Tuple with the row of each span
+        """
+        row_masks = []  # Bit n set = column n of the row is taken
+        rows = []
+        for start_col, end_col in spans:
+            mask = ((1 << (end_col - start_col + 1)) - 1) << start_col
+            for row, used in enumerate(row_masks):
+                if not used & mask:
+                    row_masks[row] = used | mask
+                    break
+            else:
+                row = len(row_masks)
+                row_masks.append(mask)
+            rows.append(row)
+        return tuple(rows)
+
+    def assign_rows(self, week_key, segments):
+        """
+        Set "layout_row" on each bar of a week.
+
+        The segments are sorted in place into placement order.
+
+        Args:
+            week_key: Identifies the week (e.g. the date of its first day)
+            segments: Bar dictionaries with start_col/end_col (0-6), start_time,
+                      calendar_id and id
+        """
+        segments.sort(key=self._sort_key)
+        key = (week_key, tuple(self._sort_key(segment) for segment in segments))
+
+        with self._lock:
+            rows = self._cache.get(key)
+            if rows is not None:
+                self.hits += 1
+                self._cache.move_to_end(key)
+        if rows is None:
+            rows = self.compute_rows([(s["start_col"], s["end_col"]) for s in segments])
+            with self._lock:
+                self.misses += 1
+                self._cache[key] = rows
+                if len(self._cache) > self._cache_size:
+                    self._cache.popitem(last=False)
+
+        for segment, row in zip(segments, rows):
+            segment["layout_row"] = row
+
+    def clear(self):
+        with self._lock:
+            self._cache.clear()
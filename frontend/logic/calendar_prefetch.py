@@ -0,0 +1,93 @@
+"""
+Calendar Prefetch Module
+
+Prepares the ranges next to the one on screen (events and ready-built
+models) on a background thread, so flipping to the previous or next month,
+week or day only swaps in models that already exist.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+from frontend.config import logger
+
+
+class CalendarPrefetcher:
+    """
+    Background builder of the models of neighbouring calendar ranges.
+
+    Only the ranges asked for by the latest prefetch() are kept: when the
+    user moves on (or jumps far away) every other range is dropped and its
+    build cancelled if it hasn't started. Together with the per-range event
+    limit this caps the memory used.
+    """
+
+    def __init__(self, build, max_events):
+        """
+        Args:
+            build: Function building the models of one range; called on the
+                   prefetch thread, returns a dictionary with "event_count"
+            max_events: Ranges with more events than this aren't kept
+        """
+        self._build = build
+        self._max_events = max_events
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="calendar-prefetch")
+        self._futures = {}  # Range key -> Future of its models
+        self.hits = 0
+        self.misses = 0
+
+    def _run(self, args):
+        models = self._build(*args)
+        if models is not None and models["event_count"] > self._max_events:
+            return None
+        return models
+
+    def prefetch(self, requests):
+        """
+        Build the given ranges in the background, and drop every other range.
+
+        Args:
+            requests: {range key: tuple of arguments for build}
+        """
+        for key in list(self._futures):
+            if key not in requests:
+                # A build that already started finishes, but is never used
+                self._futures.pop(key).cancel()
+        for key, args in requests.items():
+            if key not in self._futures:
+                self._futures[key] = self._executor.submit(self._run, args)
+
+    def take(self, key):
+        """
+        Get the models of a range if they are ready.
+
+        Args:
+            key: Range key
+
+        Returns:
+            The models, or None if the range wasn't prefetched or isn't built yet
+        """
+        future = self._futures.pop(key, None)
+        if future is None or not future.done() or future.cancelled():
+            self.misses += 1
+            return None
+        error = future.exception()
+        if error is not None:
+            logger.warning(f"[CalendarPrefetcher] Prefetch failed: {error}")
+            self.misses += 1
+            return None
+        models = future.result()
+        if models is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return models
+
+    def clear(self):
+        """Drop every prefetched range (e.g. after the events changed)."""
+        for future in self._futures.values():
+            future.cancel()
+        self._futures = {}
+
+    def shutdown(self):
+        self.clear()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -33,6 +33,19 @@ class CalendarViewStrategy(ABC):
         """
         pass
     
+    def get_date_range(self, current_date):
+        """
+        Get the date range this view shows for a reference date, without
+        changing the controller (used to prepare neighbouring ranges).
+        
+        Args:
+            current_date: The reference QDate
+            
+        Returns:
+            tuple: (start QDate, end QDate), or (None, None) if the view has no range
+        """
+        return QDate(current_date), QDate(current_date)
+    
     @abstractmethod
     def format_date_range_display(self, controller, start_date, end_date):
         """
@@ -88,6 +101,10 @@ class MonthViewStrategy(CalendarViewStrategy):
         # No specific date range to update for month view
         pass
     
+    def get_date_range(self, current_date):
+        """Month view has no range; it uses the month grid."""
+        return None, None
+    
     def format_date_range_display(self, controller, start_date, end_date):
         """Format month and year display for month view."""
         return f"{controller.currentMonthName} {controller.currentYear}"
@@ -106,9 +123,12 @@ class WeekViewStrategy(CalendarViewStrategy):
     
     def update_date_range(self, controller, current_date):
         """Update date range to show a full week."""
+        controller._range_start_date, controller._range_end_date = self.get_date_range(current_date)
+    
+    def get_date_range(self, current_date):
+        """The week containing the reference date."""
         start_date, end_date, _ = DateUtils.get_week_dates(current_date)
-        controller._range_start_date = start_date
-        controller._range_end_date = end_date
+        return start_date, end_date
     
     def format_date_range_display(self, controller, start_date, end_date):
         """Format date range for week view."""
@@ -130,8 +150,7 @@ class DayViewStrategy(CalendarViewStrategy):
     
     def update_date_range(self, controller, current_date):
         """Update date range to show a single day."""
-        controller._range_start_date = QDate(current_date)
-        controller._range_end_date = QDate(current_date)
+        controller._range_start_date, controller._range_end_date = self.get_date_range(current_date)
     
     def format_date_range_display(self, controller, start_date, end_date):
         """Format date display for single day view."""
@@ -153,8 +172,11 @@ class ThreeDayViewStrategy(CalendarViewStrategy):
     
     def update_date_range(self, controller, current_date):
         """Update date range to show three days."""
-        controller._range_start_date = QDate(current_date)
-        controller._range_end_date = QDate(current_date.addDays(2))
+        controller._range_start_date, controller._range_end_date = self.get_date_range(current_date)
+    
+    def get_date_range(self, current_date):
+        """The reference date and the two days after it."""
+        return QDate(current_date), QDate(current_date.addDays(2))
     
     def format_date_range_display(self, controller, start_date, end_date):
         """Format date range for three-day view."""
@@ -7,11 +7,13 @@ from typing import Optional
 
 from PySide6.QtCore import QObject, Signal, Slot, Property, QTimer
 
-from frontend.config import logger
+from frontend.config import CHAT_CONFIG, logger
 from frontend.logic.audio_manager import AudioManager
 from frontend.logic.websocket_client import WebSocketClient
 from frontend.logic.speech_manager import SpeechManager
 from frontend.logic.message_handler import MessageHandler
+from frontend.logic.chat_model import ChatMessageModel
+from frontend.logic.chat_history_store import ChatHistoryStore
 from frontend.logic.wake_word_handler import WakeWordHandler
 from frontend.logic.tts_controller import TTSController
 from frontend.logic.resource_manager import ResourceManager
@@ -52,7 +54,13 @@ class ChatController(QObject):
         super().__init__(parent)
         self._running = True
         self._connected = False
-        self._chat_history = []  # <-- Add history list here
+        self.chat_model = ChatMessageModel(self)  # Display history shown in ChatScreen
+        self.history_store = ChatHistoryStore()  # Every message, written as it arrives
+        self._history_cursor = None  # Id of the oldest stored message shown, None if none
+        self._loading_history = False
+        self._history_exhausted = False
+        self._history_generation = 0  # Bumped on clear; older page loads are discarded
+        self._last_chat_payload = None  # Last chat request, resent in full on resync
 
         # Get the event loop but don't start tasks immediately
         self._loop = asyncio.get_event_loop()
@@ -130,6 +138,8 @@ class ChatController(QObject):
         self.message_handler.messageChunkReceived.connect(
             self._handle_assistant_message_chunk
         )
+        # Persist every message that enters the conversation
+        self.message_handler.messageAdded.connect(self._store_message)
 
         # TTS controller signals
         self.tts_controller.ttsStateChanged.connect(self.ttsStateChanged)
@@ -245,6 +255,8 @@ class ChatController(QObject):
                 f"[ChatController] Updating STT state: listening = {is_listening}"
             )
             self.sttStateChanged.emit(is_listening)
+        elif action == "resync_required":
+            self._resync_conversation(data)
         elif action == "navigate":
             # Handle navigation request from backend
             screen = data.get("screen", "")
@@ -342,6 +354,25 @@ class ChatController(QObject):
             # Try to process as a message - MessageHandler will emit signals handled elsewhere
             self.message_handler.process_message(data)
 
+    def _resync_conversation(self, data):
+        """Resend the last chat request with the full history after the server lost track."""
+        conversation_id = data.get("conversation_id")
+        if conversation_id != self.message_handler.get_conversation_id() or not self._last_chat_payload:
+            logger.debug(f"[ChatController] Ignoring resync for stale conversation {conversation_id}")
+            return
+
+        logger.info(
+            f"[ChatController] Server is at seq {data.get('seq')}, resending full history"
+        )
+        payload = dict(self._last_chat_payload)
+        payload.pop("base_seq", None)
+        payload["messages"] = self.message_handler.get_messages()
+        payload["resync"] = True
+        self.message_handler.mark_delta_sent()
+        self.resource_manager.schedule_coroutine(
+            self.websocket_client.send_message(payload)
+        )
+
     def _handle_audio_data_signal(self, audio_data):
         """
         Non-coroutine method that schedules the async processing of audio data.
@@ -462,8 +493,14 @@ class ChatController(QObject):
             # Clear the interrupted state now that we're continuing
             self.message_handler.clear_interrupted_response()
 
-        # Prepare payload
-        payload = {"action": "chat", "messages": self.message_handler.get_messages()}
+        # Prepare payload - only the messages the server has not seen yet
+        base_seq, delta = self.message_handler.get_message_delta()
+        payload = {
+            "action": "chat",
+            "conversation_id": self.message_handler.get_conversation_id(),
+            "base_seq": base_seq,
+            "messages": delta,
+        }
 
         # If we're continuing from an interrupted response, tell the server
         if has_interrupted:
@@ -481,6 +518,10 @@ class ChatController(QObject):
         if context:
             payload["context"] = context
 
+        # Keep the request so it can be resent with the full history on resync
+        self._last_chat_payload = payload
+        self.message_handler.mark_delta_sent()
+
         # Send asynchronously
         self.resource_manager.schedule_coroutine(
             self.websocket_client.send_message(payload)
@@ -528,8 +569,10 @@ class ChatController(QObject):
             f"[ChatController] Current TTS state before stopping: {current_tts_state}"
         )
 
-        # Stop server-side operations
-        await self.resource_manager.stop_all_services()
+        # Stop server-side operations for this connection only
+        await self.resource_manager.stop_all_services(
+            self.websocket_client.get_session_id()
+        )
 
         # Restore TTS state if needed
         if current_tts_state:
@@ -542,73 +585,29 @@ class ChatController(QObject):
 
     @Slot()
     def clearChat(self):
-        """Clear the chat history, saving the current one first."""
-        logger.info("[ChatController] Clear chat triggered. Scheduling save and clear.")
-        # Schedule the async task to save and clear
-        self.resource_manager.schedule_coroutine(self._save_and_clear_history_async())
-
-    def _save_history_to_file(self, history_to_save):
-        """Synchronously saves the given history list to a timestamped JSON file."""
-        save_path = (
-            "/home/jack/PYSIDE_RASPI_FRONTEND/chat_history"  # User specified path
+        """Clear the chat history; its messages are already in the history store."""
+        logger.info("[ChatController] Clear chat triggered. Scheduling clear.")
+        self.resource_manager.schedule_coroutine(self._clear_history_async())
+
+    async def _clear_history_async(self):
+        """Ends the current conversation and clears the displayed history."""
+        # Let the server drop its copy of the conversation
+        await self.websocket_client.send_message(
+            {
+                "action": "end_conversation",
+                "conversation_id": self.message_handler.get_conversation_id(),
+            }
         )
-        full_path = ""
-
-        if not history_to_save:
-            logger.info(
-                "[ChatController:_save_history_to_file] History is empty, skipping save."
-            )
-            return True  # Indicate success (nothing needed to be done)
-
-        try:
-            # Ensure the directory exists
-            os.makedirs(save_path, exist_ok=True)
-
-            # Generate filename with timestamp
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"conversation_{timestamp}.json"
-            full_path = os.path.join(save_path, filename)
-
-            # Save the file
-            with open(full_path, "w", encoding="utf-8") as f:
-                json.dump(history_to_save, f, indent=4, ensure_ascii=False)
-
-            logger.info(
-                f"[ChatController:_save_history_to_file] Successfully saved conversation to {full_path}"
-            )
-            return True
-
-        except OSError as e:
-            logger.error(
-                f"[ChatController:_save_history_to_file] Error creating directory {save_path}: {e}"
-            )
-            return False
-        except IOError as e:
-            logger.error(
-                f"[ChatController:_save_history_to_file] Error saving conversation to {full_path}: {e}"
-            )
-            return False
-        except Exception as e:
-            logger.error(
-                f"[ChatController:_save_history_to_file] Unexpected error saving conversation: {e}"
-            )
-            return False
-
-    async def _save_and_clear_history_async(self):
-        """Asynchronously saves the current history using a sync helper and then clears it."""
-        history_copy = list(self._chat_history)  # Make a copy
-
-        # Run the synchronous save function in a thread
-        save_success = await asyncio.to_thread(self._save_history_to_file, history_copy)
-
-        if not save_success:
-            logger.warning(
-                "[ChatController:_save_and_clear_history_async] Saving history failed, but proceeding to clear."
-            )
+        self._last_chat_payload = None
 
-        # --- Clear internal state AFTER saving attempt ---
+        # --- Clear internal state ---
         self.message_handler.clear_history()  # Clear backend context history
-        self._chat_history.clear()  # Clear display history
+        self.chat_model.clear()  # Clear display history
+        # The cleared conversation can now be paged back in from the store
+        self._history_generation += 1
+        self._history_cursor = None
+        self._history_exhausted = False
+        self._loading_history = False
         logger.info("[ChatController] Internal chat history cleared.")
         self.historyCleared.emit()  # Notify UI
 
@@ -673,6 +672,9 @@ class ChatController(QObject):
         
         # Wait for all tasks to actually complete
         await self.resource_manager.wait_for_all_tasks()
+
+        # Flush pending history writes
+        await asyncio.to_thread(self.history_store.close)
         
         logger.info("[ChatController] All resources cleaned up")
 
@@ -680,41 +682,81 @@ class ChatController(QObject):
     @Slot(result=list)
     def getChatHistory(self):
         """Return the current chat history for QML."""
+        messages = self.chat_model.messages()
         logger.debug(
-            f"[ChatController] getChatHistory called, returning {len(self._chat_history)} messages."
+            f"[ChatController] getChatHistory called, returning {len(messages)} messages."
         )
-        return list(self._chat_history)  # Return a copy
+        return messages
+
+    @Slot(result="QObject*")
+    def chatModel(self):
+        """
+        Get the list model of the displayed chat messages
+
+        Returns:
+            ChatMessageModel instance
+        """
+        return self.chat_model
+
+    def _store_message(self, sender, text):
+        """Appends a message of the current conversation to the history store (off the GUI thread)."""
+        self.history_store.append_message(
+            self.message_handler.get_conversation_id(), text, sender == "user"
+        )
+
+    @Slot()
+    def loadOlderMessages(self):
+        """Load the previous page of stored history above the displayed messages."""
+        if self._loading_history or self._history_exhausted:
+            return
+        self._loading_history = True
+        self.resource_manager.schedule_coroutine(self._load_older_messages_async())
+
+    async def _load_older_messages_async(self):
+        page_size = CHAT_CONFIG.get("history_page_size", 30)
+        generation = self._history_generation
+        try:
+            messages = await self.history_store.fetch_messages_before(
+                self._history_cursor,
+                exclude_conversation_id=self.message_handler.get_conversation_id(),
+                limit=page_size,
+            )
+            if generation != self._history_generation:
+                logger.debug("[ChatController] Chat was cleared while loading history; dropping the page")
+                return
+            if len(messages) < page_size:
+                self._history_exhausted = True
+            if messages:
+                self._history_cursor = messages[0]["id"]
+                self.chat_model.prepend_messages(messages)
+                logger.info(f"[ChatController] Loaded {len(messages)} older messages from history")
+        except Exception as e:
+            logger.error(f"[ChatController] Failed to load older messages: {e}")
+        finally:
+            # After a clear the flag belongs to the new chat's loads
+            if generation == self._history_generation:
+                self._loading_history = False
 
     def _add_user_message_to_history(self, text):
-        """Adds a user message to the internal history list."""
-        self._chat_history.append({"text": text, "isUser": True})
+        """Adds a user message to the display history."""
+        self.chat_model.append_message(text, True)
         logger.debug(
-            f"[ChatController] Added user message to history. New length: {len(self._chat_history)}"
+            f"[ChatController] Added user message to history. New length: {self.chat_model.count()}"
         )
 
     def _add_assistant_message_to_history(self, text):
-        """Adds an assistant message to the internal history list."""
-        self._chat_history.append({"text": text, "isUser": False})
+        """Adds an assistant message to the display history."""
+        self.chat_model.append_message(text, False)
         logger.debug(
-            f"[ChatController] Added assistant message to history. New length: {len(self._chat_history)}"
+            f"[ChatController] Added assistant message to history. New length: {self.chat_model.count()}"
         )
 
     def _handle_assistant_message_chunk(self, text, is_final):
-        """Handles chunks of an assistant message, appending to the last message if not final."""
-        # The problem is in this method - it's concatenating chunks in a bad way
-        # Each received chunk already has the full text via the MessageHandler
-
-        # Don't append repeatedly - just set the text directly
-        if not self._chat_history or self._chat_history[-1]["isUser"]:
-            # If history is empty or last message was user, add new assistant message
-            self._chat_history.append({"text": text, "isUser": False})
+        """Appends the new text of a streamed assistant message to the display history."""
+        if is_final:
+            self.chat_model.finish_streaming()
         else:
-            # Replace existing assistant message instead of appending
-            self._chat_history[-1]["text"] = text
-        
-        logger.debug(
-            f"[ChatController] Handled assistant message chunk. Current message: '{text[:50]}...'"
-        )
+            self.chat_model.append_chunk(text)
 
     async def handle_hey_computer_wakeword(self):
         """
@@ -0,0 +1,193 @@
+#!/usr/bin/env python3
+import asyncio
+import glob
+import json
+import os
+import time
+from datetime import datetime
+
+from frontend.config import CHAT_HISTORY_DB_PATH, logger
+from frontend.utils.sqlite_store import SQLiteStore
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS conversations (
+    id TEXT PRIMARY KEY,
+    started_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    message_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    conversation_id TEXT NOT NULL REFERENCES conversations(id),
+    seq INTEGER NOT NULL,
+    is_user INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE UNIQUE INDEX IF NOT EXISTS messages_by_conversation ON messages(conversation_id, seq);
+CREATE INDEX IF NOT EXISTS messages_by_time ON messages(created_at);
+CREATE INDEX IF NOT EXISTS conversations_by_time ON conversations(updated_at);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+class ChatHistoryStore(SQLiteStore):
+    """
+    Append-only SQLite store of chat messages, indexed by conversation and time.
+
+    Reads are submitted to the worker thread like the writes, so they never
+    block the GUI thread and see every earlier write.
+    Messages are written one by one as they arrive; pages of history are read
+    back on demand.
+    """
+
+    def __init__(self, db_path=CHAT_HISTORY_DB_PATH):
+        super().__init__(db_path, SCHEMA, "chat-history")
+
+    # --- Worker thread ---
+
+    def _opened(self, conn):
+        self._import_json_files(conn)
+        logger.info(f"[ChatHistoryStore] Opened {self.db_path}")
+
+    def _insert_message(self, conversation_id, text, is_user, created_at, conn=None):
+        conn = conn or self._connection()
+        with conn:
+            conn.execute(
+                "INSERT INTO conversations (id, started_at, updated_at, message_count) VALUES (?, ?, ?, 0) "
+                "ON CONFLICT(id) DO NOTHING",
+                (conversation_id, created_at, created_at),
+            )
+            seq = conn.execute(
+                "SELECT message_count FROM conversations WHERE id = ?", (conversation_id,)
+            ).fetchone()[0]
+            conn.execute(
+                "INSERT INTO messages (conversation_id, seq, is_user, text, created_at) VALUES (?, ?, ?, ?, ?)",
+                (conversation_id, seq, int(is_user), text, created_at),
+            )
+            conn.execute(
+                "UPDATE conversations SET message_count = message_count + 1, updated_at = ? WHERE id = ?",
+                (created_at, conversation_id),
+            )
+
+    def _import_json_files(self, conn):
+        """One-time import of the conversation_*.json files saved by earlier versions."""
+        if conn.execute("SELECT 1 FROM meta WHERE key = 'json_imported'").fetchone():
+            return
+        directory = os.path.dirname(self.db_path)
+        imported = 0
+        for path in sorted(glob.glob(os.path.join(directory, "conversation_*.json"))):
+            name = os.path.splitext(os.path.basename(path))[0]
+            try:
+                started_at = datetime.strptime(name, "conversation_%Y%m%d_%H%M%S").timestamp()
+            except ValueError:
+                started_at = os.path.getmtime(path)
+            try:
+                with open(path, encoding="utf-8") as f:
+                    history = json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"[ChatHistoryStore] Skipping {path}: {e}")
+                continue
+            for offset, message in enumerate(history):
+                text = message.get("text", "")
+                if text.strip():
+                    # Keep the saved order; the files have no per-message times
+                    self._insert_message(name, text, message.get("isUser", False), started_at + offset * 1e-3, conn)
+            imported += 1
+        with conn:
+            conn.execute("INSERT INTO meta (key, value) VALUES ('json_imported', ?)", (str(time.time()),))
+        if imported:
+            logger.info(f"[ChatHistoryStore] Imported {imported} saved JSON conversations")
+
+    def _fetch_before(self, before_id, exclude_conversation_id, limit):
+        conn = self._connection()
+        query = "SELECT id, conversation_id, is_user, text, created_at FROM messages WHERE conversation_id != ?"
+        params = [exclude_conversation_id or ""]
+        if before_id is not None:
+            query += " AND id < ?"
+            params.append(before_id)
+        query += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        rows = conn.execute(query, params).fetchall()
+        return [self._row_to_message(row) for row in reversed(rows)]
+
+    def _fetch_conversation(self, conversation_id):
+        rows = self._connection().execute(
+            "SELECT id, conversation_id, is_user, text, created_at FROM messages WHERE conversation_id = ? ORDER BY seq",
+            (conversation_id,),
+        ).fetchall()
+        return [self._row_to_message(row) for row in rows]
+
+    def _list_conversations(self, limit, before):
+        rows = self._connection().execute(
+            "SELECT id, started_at, updated_at, message_count FROM conversations "
+            "WHERE updated_at < ? ORDER BY updated_at DESC LIMIT ?",
+            (before if before is not None else float("inf"), limit),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    @staticmethod
+    def _row_to_message(row):
+        return {
+            "id": row["id"],
+            "conversation_id": row["conversation_id"],
+            "text": row["text"],
+            "isUser": bool(row["is_user"]),
+            "created_at": row["created_at"],
+        }
+
+    # --- Public API (any thread) ---
+
+    def append_message(self, conversation_id, text, is_user):
+        """
+        Queue a message for writing; returns immediately.
+
+        Args:
+            conversation_id: Conversation the message belongs to
+            text: Message text
+            is_user: True for user messages, False for assistant messages
+        """
+        future = self._submit(self._insert_message, conversation_id, text, is_user, time.time())
+        future.add_done_callback(self._log_write_error)
+
+    @staticmethod
+    def _log_write_error(future):
+        error = future.exception()
+        if error is not None:
+            logger.error(f"[ChatHistoryStore] Failed to store message: {error}")
+
+    async def fetch_messages_before(self, before_id=None, exclude_conversation_id=None, limit=30):
+        """
+        Get a page of messages older than a message id, oldest first.
+
+        Args:
+            before_id: Only return messages with a smaller id (None for the newest)
+            exclude_conversation_id: Conversation to leave out (the one on screen)
+            limit: Maximum number of messages
+
+        Returns:
+            List of message dictionaries
+        """
+        return await asyncio.wrap_future(
+            self._submit(self._fetch_before, before_id, exclude_conversation_id, limit)
+        )
+
+    async def fetch_conversation(self, conversation_id):
+        """Get all messages of one conversation in order."""
+        return await asyncio.wrap_future(self._submit(self._fetch_conversation, conversation_id))
+
+    async def list_conversations(self, limit=20, before=None):
+        """
+        Get conversations, most recently updated first.
+
+        Args:
+            limit: Maximum number of conversations
+            before: Only return conversations updated before this timestamp
+
+        Returns:
+            List of conversation dictionaries
+        """
+        return await asyncio.wrap_future(self._submit(self._list_conversations, limit, before))
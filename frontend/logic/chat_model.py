@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+from PySide6.QtCore import QAbstractListModel, Qt, QModelIndex, QByteArray
+
+from frontend.config import logger
+from frontend.utils.markdown_utils import StreamingMarkdownRenderer, render_markdown
+
+
+class ChatMessageModel(QAbstractListModel):
+    """
+    List model of the chat messages shown in ChatScreen.
+
+    Streaming assistant text is appended in place and rendered incrementally:
+    completed markdown blocks are final HTML (stableHtml) and only the block
+    still being written is re-rendered (pendingHtml). A chunk normally only
+    changes pendingHtml, so the delegate re-shapes just the last block
+    instead of the whole answer.
+    """
+
+    TextRole = Qt.ItemDataRole.UserRole + 1
+    IsUserRole = Qt.ItemDataRole.UserRole + 2
+    StableHtmlRole = Qt.ItemDataRole.UserRole + 3
+    PendingHtmlRole = Qt.ItemDataRole.UserRole + 4
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        # Each item: {"parts": [str], "isUser": bool, "renderer": StreamingMarkdownRenderer or None,
+        #             "html": cached HTML of a complete message or None}
+        self._items = []
+
+    @staticmethod
+    def _text(item):
+        if len(item["parts"]) > 1:
+            item["parts"] = ["".join(item["parts"])]
+        return item["parts"][0] if item["parts"] else ""
+
+    def _stable_html(self, item):
+        if item["renderer"] is not None:
+            return item["renderer"].stable_html
+        if item["html"] is None:
+            # Rendered lazily, so loading a long history doesn't render every message
+            item["html"] = render_markdown(self._text(item))
+        return item["html"]
+
+    def rowCount(self, parent=QModelIndex()):
+        return len(self._items)
+
+    def data(self, index, role):
+        if not index.isValid() or index.row() >= len(self._items):
+            return None
+
+        item = self._items[index.row()]
+
+        if role == self.TextRole:
+            return self._text(item)
+        elif role == self.IsUserRole:
+            return item["isUser"]
+        elif role == self.StableHtmlRole:
+            return self._stable_html(item)
+        elif role == self.PendingHtmlRole:
+            return item["renderer"].pending_html if item["renderer"] is not None else ""
+
+        return None
+
+    def roleNames(self):
+        return {
+            self.TextRole: QByteArray(b"text"),
+            self.IsUserRole: QByteArray(b"isUser"),
+            self.StableHtmlRole: QByteArray(b"stableHtml"),
+            self.PendingHtmlRole: QByteArray(b"pendingHtml"),
+        }
+
+    def _insert(self, item):
+        row = len(self._items)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._items.append(item)
+        self.endInsertRows()
+
+    def append_message(self, text, is_user):
+        """
+        Add a complete message.
+
+        Args:
+            text: Message text
+            is_user: True for user messages, False for assistant messages
+        """
+        self._insert({"parts": [text], "isUser": is_user, "renderer": None, "html": None})
+
+    def append_chunk(self, chunk):
+        """
+        Append streamed assistant text, starting a new message if the last
+        message isn't an assistant message that is still streaming.
+
+        Args:
+            chunk: Newly received text (not the accumulated response)
+        """
+        if not chunk:
+            return
+        if not self._items or self._items[-1]["renderer"] is None:
+            self._insert({"parts": [], "isUser": False, "renderer": StreamingMarkdownRenderer(), "html": None})
+
+        row = len(self._items) - 1
+        item = self._items[row]
+        item["parts"].append(chunk)
+        roles = [self.TextRole, self.PendingHtmlRole]
+        if item["renderer"].feed(chunk):
+            roles.append(self.StableHtmlRole)
+
+        index = self.index(row, 0)
+        self.dataChanged.emit(index, index, roles)
+
+    def finish_streaming(self):
+        """Complete the streaming assistant message (if any); its open block becomes stable."""
+        if not self._items or self._items[-1]["renderer"] is None:
+            return
+        row = len(self._items) - 1
+        item = self._items[row]
+        renderer = item["renderer"]
+        renderer.finish()
+        item["html"] = renderer.stable_html
+        item["renderer"] = None
+
+        index = self.index(row, 0)
+        self.dataChanged.emit(index, index, [self.StableHtmlRole, self.PendingHtmlRole])
+
+    def prepend_messages(self, messages):
+        """
+        Insert older messages above the current ones.
+
+        Args:
+            messages: List of {"text": str, "isUser": bool} dictionaries, oldest first
+        """
+        if not messages:
+            return
+        self.beginInsertRows(QModelIndex(), 0, len(messages) - 1)
+        self._items[:0] = [
+            {"parts": [m.get("text", "")], "isUser": bool(m.get("isUser")), "renderer": None, "html": None}
+            for m in messages
+        ]
+        self.endInsertRows()
+
+    def set_messages(self, messages):
+        """
+        Replace all messages.
+
+        Args:
+            messages: List of {"text": str, "isUser": bool} dictionaries
+        """
+        self.beginResetModel()
+        self._items = [
+            {"parts": [m.get("text", "")], "isUser": bool(m.get("isUser")), "renderer": None, "html": None}
+            for m in messages
+        ]
+        self.endResetModel()
+
+    def clear(self):
+        self.beginResetModel()
+        self._items = []
+        self.endResetModel()
+        logger.debug("[ChatMessageModel] Cleared")
+
+    def messages(self):
+        """
+        Get the messages as plain dictionaries.
+
+        Returns:
+            List of {"text": str, "isUser": bool} dictionaries
+        """
+        return [{"text": self._text(item), "isUser": item["isUser"]} for item in self._items]
+
+    def count(self):
+        return len(self._items)
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Decoder for the backend's binary audio frames.
+
+Every binary websocket message is one frame:
+
+    | type (u8) | flags (u8) | stream id (u16) | seq (u32) | length (u32) | payload |
+
+All header fields are big-endian. Must match backend/websocket/frames.py.
+"""
+import struct
+from typing import NamedTuple
+
+FRAME_AUDIO = 1
+FRAME_END = 2
+FRAME_ABORT = 3
+
+# Frame flags
+FLAG_OPUS = 0x01  # AUDIO payload is a bundle of Opus packets instead of PCM
+
+HEADER = struct.Struct("!BBHII")
+HEADER_SIZE = HEADER.size
+
+
+class FrameError(ValueError):
+    """Raised for binary messages that are not valid frames."""
+
+
+class Frame(NamedTuple):
+    frame_type: int
+    flags: int
+    stream_id: int
+    seq: int
+    payload: memoryview
+
+
+def decode_frame(data: bytes) -> Frame:
+    """
+    Parse a frame without copying its payload.
+
+    Returns:
+        Frame whose payload is a memoryview into data
+    """
+    if len(data) < HEADER_SIZE:
+        raise FrameError(f"Frame too short: {len(data)} bytes")
+    frame_type, flags, stream_id, seq, length = HEADER.unpack_from(data, 0)
+    if HEADER_SIZE + length != len(data):
+        raise FrameError(
+            f"Frame length mismatch: header says {length}, got {len(data) - HEADER_SIZE}"
+        )
+    return Frame(frame_type, flags, stream_id, seq, memoryview(data)[HEADER_SIZE:])
@@ -3,12 +3,20 @@ from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
+from googleapiclient.errors import HttpError
 from datetime import datetime, timedelta
 import pickle
+import threading
 from pathlib import Path
 
 class GoogleCalendarClient:
-    """Handles Google Calendar API authentication and operations."""
+    """
+    Handles Google Calendar API authentication and operations.
+
+    The client may be used from several worker threads at once. googleapiclient
+    service objects (and their httplib2 connections) are not thread-safe, so
+    each thread builds its own service from the shared credentials.
+    """
     
     # If modifying these scopes, delete the file token.pickle.
     SCOPES = ['https://www.googleapis.com/auth/calendar.readonly']
@@ -31,6 +39,8 @@ class GoogleCalendarClient:
     def __init__(self):
         self.credentials = None
         self.service = None
+        self._auth_lock = threading.Lock()
+        self._thread_local = threading.local()
         self.token_path = Path.home() / '.config' / 'pyside_raspi' / 'token.pickle'
         # Use the existing credentials file
         self.credentials_path = Path("/home/jack/PYSIDE_RASPI_FRONTEND/google_credentials.json")
@@ -40,6 +50,14 @@ class GoogleCalendarClient:
         
     def authenticate(self):
         """Authenticate with Google Calendar API."""
+        with self._auth_lock:
+            return self._authenticate()
+
+    def _authenticate(self):
+        if self.credentials and self.credentials.valid and self.service:
+            # Another thread authenticated while this one waited for the lock
+            return True
+
         if os.path.exists(self.token_path):
             with open(self.token_path, 'rb') as token:
                 self.credentials = pickle.load(token)
@@ -62,20 +80,32 @@ class GoogleCalendarClient:
             with open(self.token_path, 'wb') as token:
                 pickle.dump(self.credentials, token)
         
-        self.service = build('calendar', 'v3', credentials=self.credentials)
+        self.service = build('calendar', 'v3', credentials=self.credentials, cache_discovery=False)
+        self._thread_local.service = self.service
         return True
+
+    def _get_service(self):
+        """Get the calendar service for the calling thread, authenticating first if needed."""
+        if not self.service:
+            self.authenticate()
+        service = getattr(self._thread_local, 'service', None)
+        if service is None:
+            service = build('calendar', 'v3', credentials=self.credentials, cache_discovery=False)
+            self._thread_local.service = service
+        return service
     
     def get_calendars(self):
         """Get list of user's calendars."""
-        if not self.service:
-            self.authenticate()
+        service = self._get_service()
         
         calendars = []
         page_token = None
         while True:
-            calendar_list = self.service.calendarList().list(
+            calendar_list = service.calendarList().list(
                 pageToken=page_token,
-                fields='items(id,summary,backgroundColor)'
+                maxResults=250,
+                # nextPageToken must be requested explicitly, or paging stops after the first page
+                fields='nextPageToken,items(id,summary,backgroundColor)'
             ).execute()
             
             for calendar in calendar_list.get('items', []):
@@ -103,38 +133,103 @@ class GoogleCalendarClient:
     
     def get_events(self, calendar_id, time_min, time_max):
         """Get events for a specific calendar within a time range."""
-        if not self.service:
-            self.authenticate()
+        service = self._get_service()
         
         events = []
         page_token = None
         while True:
-            events_result = self.service.events().list(
+            events_result = service.events().list(
                 calendarId=calendar_id,
                 timeMin=time_min.isoformat() + 'Z',
                 timeMax=time_max.isoformat() + 'Z',
                 singleEvents=True,
                 orderBy='startTime',
                 pageToken=page_token,
-                fields='items(id,summary,start,end,colorId)'
+                maxResults=2500,  # The API maximum, to keep round trips per calendar down
+                fields='nextPageToken,items(id,summary,start,end,colorId)'
             ).execute()
             
             for event in events_result.get('items', []):
-                start = event['start'].get('dateTime', event['start'].get('date'))
-                end = event['end'].get('dateTime', event['end'].get('date'))
-                
-                events.append({
-                    'id': event['id'],
-                    'calendar_id': calendar_id,
-                    'title': event['summary'],
-                    'start_time': start,
-                    'end_time': end,
-                    'all_day': 'date' in event['start'],
-                    'color': event.get('colorId', None)  # Will be mapped to actual color in controller
-                })
+                events.append(self._to_event(calendar_id, event))
             
             page_token = events_result.get('nextPageToken')
             if not page_token:
                 break
         
-        return events 
\ No newline at end of file
+        return events
+
+    def sync_events(self, calendar_id, sync_token=None):
+        """
+        Get the events of a calendar that changed since the previous sync.
+
+        Without a sync token, or when Google no longer accepts it, this is a
+        full sync of the calendar (all events, no date range, because Google
+        doesn't allow a range together with sync tokens).
+
+        Args:
+            calendar_id: Calendar to sync
+            sync_token: nextSyncToken returned by the previous sync, if any
+
+        Returns:
+            dict with 'events' (new or changed events), 'deleted_ids',
+            'sync_token' (for the next sync) and 'full_sync' (True if the
+            events replace everything known about the calendar)
+        """
+        service = self._get_service()
+        try:
+            return self._list_changes(service, calendar_id, sync_token)
+        except HttpError as e:
+            if sync_token and e.resp.status == 410:
+                # The token expired (or Google reset it); start over
+                print(f"Sync token expired for calendar {calendar_id}, doing a full sync")
+                return self._list_changes(service, calendar_id, None)
+            raise
+
+    def _list_changes(self, service, calendar_id, sync_token):
+        events = []
+        deleted_ids = []
+        page_token = None
+        while True:
+            params = {
+                'calendarId': calendar_id,
+                'singleEvents': True,
+                'maxResults': 2500,
+                'pageToken': page_token,
+                'fields': 'nextPageToken,nextSyncToken,items(id,status,summary,start,end,colorId)',
+            }
+            if sync_token:
+                params['syncToken'] = sync_token
+            events_result = service.events().list(**params).execute()
+
+            for event in events_result.get('items', []):
+                if event.get('status') == 'cancelled':
+                    deleted_ids.append(event['id'])
+                else:
+                    events.append(self._to_event(calendar_id, event))
+
+            page_token = events_result.get('nextPageToken')
+            if not page_token:
+                break
+
+        return {
+            'events': events,
+            'deleted_ids': deleted_ids,
+            'sync_token': events_result.get('nextSyncToken'),
+            'full_sync': not sync_token,
+        }
+
+    @staticmethod
+    def _to_event(calendar_id, event):
+        """Convert an event resource from the API to the event dictionary used by the app."""
+        start = event['start'].get('dateTime', event['start'].get('date'))
+        end = event['end'].get('dateTime', event['end'].get('date'))
+        
+        return {
+            'id': event['id'],
+            'calendar_id': calendar_id,
+            'title': event.get('summary', ''),  # Private events may have no title
+            'start_time': start,
+            'end_time': end,
+            'all_day': 'date' in event['start'],
+            'color': event.get('colorId', None)  # Will be mapped to actual color in controller
+        } 
\ No newline at end of file
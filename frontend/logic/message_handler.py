@@ -1,4 +1,6 @@
 #!/usr/bin/env python3
+import uuid
+
 from PySide6.QtCore import QObject, Signal
 from typing import List, Dict, Any, Optional
 
@@ -14,16 +16,20 @@ class MessageHandler(QObject):
     messageReceived = Signal(str)  # Emitted when a new text message arrives
     messageChunkReceived = Signal(
         str, bool
-    )  # Emitted when a message chunk is received (text, is_final)
+    )  # Emitted when a message chunk is received (new text only, is_final)
+    messageAdded = Signal(str, str)  # Emitted when a message enters the history (sender, text)
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self._messages = []
-        self._current_response = ""  # Track the current response text
+        self._response_parts = []  # Chunks of the current response, joined on demand
         self._interrupted_response = ""  # Track interrupted response for continuity
         self._last_request_messages = []  # Track messages from last request
         self._time_context_provider = None  # Not using this directly in messages anymore
         self._processed_message_ids = set()  # Track processed message IDs to prevent duplicates
+        # The server keeps its own copy of the conversation; we only send what it hasn't seen
+        self._conversation_id = uuid.uuid4().hex
+        self._synced_seq = 0  # Number of messages the server is believed to have
         logger.info("[MessageHandler] Initialized")
 
     def set_time_context_provider(self, provider):
@@ -70,29 +76,32 @@ class MessageHandler(QObject):
 
             if is_chunk:
                 # Accumulate text for streaming
-                self._current_response += content
-                # Signal that this is a chunk (not final)
-                self.messageChunkReceived.emit(self._current_response, False)
+                self._response_parts.append(content)
+                # Only the new text is emitted; the chat model appends it
+                self.messageChunkReceived.emit(content, False)
                 logger.debug(
-                    f"[MessageHandler] Received chunk, current length: {len(self._current_response)}"
+                    f"[MessageHandler] Received chunk of {len(content)} chars, {len(self._response_parts)} chunks so far"
                 )
             elif is_final:
                 # This is the final state of a streamed message
-                self.messageChunkReceived.emit(self._current_response, True)
-                if self._current_response.strip():
-                    self.add_message("assistant", self._current_response)
+                self.messageChunkReceived.emit("", True)
+                current_response = self.get_current_response()
+                if current_response.strip():
+                    self.add_message("assistant", current_response)
                     # Add to processed messages
                     self._processed_message_ids.add(unique_id)
+                if data.get("conversation_id") == self._conversation_id:
+                    self.acknowledge_seq(data.get("seq"))
                 # Clear interrupted response since we've completed normally
                 self._interrupted_response = ""
-                self._current_response = ""
+                self._response_parts = []
                 logger.info("[MessageHandler] Received final chunk, message complete")
             else:
                 # This is a complete non-chunked message
                 self.messageReceived.emit(content)
                 # Clear interrupted response since we've completed normally
                 self._interrupted_response = ""
-                self._current_response = ""
+                self._response_parts = []
                 if content.strip():
                     self.add_message("assistant", content)
                     # Add to processed messages
@@ -112,6 +121,7 @@ class MessageHandler(QObject):
         """
         if text.strip():
             self._messages.append({"sender": sender, "text": text})
+            self.messageAdded.emit(sender, text)
             logger.info(
                 f"[MessageHandler] Added message from {sender}, length: {len(text)}"
             )
@@ -134,6 +144,50 @@ class MessageHandler(QObject):
         logger.debug(f"[MessageHandler] Returning {len(self._messages)} messages in internal format")
         return self._messages
 
+    def get_conversation_id(self):
+        """
+        Get the id the server uses to store this conversation.
+
+        Returns:
+            String conversation id
+        """
+        return self._conversation_id
+
+    def get_message_delta(self):
+        """
+        Get the messages the server has not seen yet.
+
+        Returns:
+            Tuple of (base_seq, messages) where base_seq is the number of
+            messages the delta builds on
+        """
+        return self._synced_seq, self._messages[self._synced_seq:]
+
+    def mark_delta_sent(self):
+        """
+        Record that the whole history has been sent to the server.
+        If the server disagrees it answers with resync_required.
+        """
+        self._synced_seq = len(self._messages)
+
+    def acknowledge_seq(self, seq):
+        """
+        Record the sequence number the server reported after storing its reply.
+
+        Args:
+            seq: Number of messages the server now holds
+        """
+        if seq is None:
+            return
+        if seq == len(self._messages):
+            self._synced_seq = seq
+        else:
+            # Leave the sync point behind; the next delta either fills the gap
+            # or the server asks for a resync
+            logger.warning(
+                f"[MessageHandler] Server is at seq {seq} but local history has {len(self._messages)} messages"
+            )
+
     def store_last_request_state(self):
         """
         Store the current state of messages for continuity.
@@ -158,8 +212,9 @@ class MessageHandler(QObject):
         Mark the current response as interrupted for later continuation.
         This should be called when stopping a response.
         """
-        if self._current_response.strip():
-            self._interrupted_response = self._current_response
+        current_response = self.get_current_response()
+        if current_response.strip():
+            self._interrupted_response = current_response
             logger.info(
                 f"[MessageHandler] Marked response as interrupted, length: {len(self._interrupted_response)}"
             )
@@ -173,7 +228,7 @@ class MessageHandler(QObject):
         Returns:
             String containing the current response
         """
-        return self._current_response
+        return "".join(self._response_parts)
 
     def get_interrupted_response(self):
         """
@@ -235,18 +290,21 @@ class MessageHandler(QObject):
         Clear the message history and reset all state.
         """
         self._messages = []
-        self._current_response = ""
+        self._response_parts = []
         self._interrupted_response = ""
         self._last_request_messages = []
         self._processed_message_ids.clear()  # Clear the processed message IDs
+        # Start a new server-side conversation
+        self._conversation_id = uuid.uuid4().hex
+        self._synced_seq = 0
         logger.info("[MessageHandler] History cleared")
 
     def reset_current_response(self):
         """
         Reset the current response accumulator.
         """
-        prev_len = len(self._current_response)
-        self._current_response = ""
+        prev_len = sum(len(part) for part in self._response_parts)
+        self._response_parts = []
         logger.info(
             f"[MessageHandler] Reset current response. Previous length: {prev_len}"
         )
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Decoder for Opus-compressed TTS audio frames.
+
+A frame payload is a bundle of Opus packets, each prefixed with its length as
+a big-endian u16. Must match backend/tts/opus_codec.py. Requires the optional
+`opuslib` package; without it the frontend only advertises PCM.
+"""
+import struct
+
+from frontend.config import logger
+
+try:
+    import opuslib
+except Exception:  # ImportError, or libopus missing
+    opuslib = None
+
+# Must match the QAudioSink format in AudioManager
+OPUS_SAMPLE_RATE = 24000
+
+PACKET_LENGTH = struct.Struct("!H")
+
+
+def opus_supported():
+    return opuslib is not None
+
+
+class OpusStreamDecoder:
+    """
+    Decodes bundles of Opus packets to 16-bit mono PCM.
+    """
+
+    def __init__(self, sample_rate=OPUS_SAMPLE_RATE):
+        self.sample_rate = sample_rate
+        self.decoder = opuslib.Decoder(sample_rate, 1)
+        # Largest Opus frame is 120 ms
+        self.max_frame_samples = sample_rate * 120 // 1000
+
+    def reset(self):
+        """Start fresh for the next stream (Opus decoding is stateful)."""
+        self.decoder = opuslib.Decoder(self.sample_rate, 1)
+
+    def decode(self, bundle):
+        """
+        Decode one bundle.
+
+        Args:
+            bundle: bytes or memoryview holding length-prefixed packets
+
+        Returns:
+            PCM bytes
+        """
+        view = memoryview(bundle)
+        pcm = bytearray()
+        offset = 0
+        while offset + PACKET_LENGTH.size <= len(view):
+            (length,) = PACKET_LENGTH.unpack_from(view, offset)
+            offset += PACKET_LENGTH.size
+            if offset + length > len(view):
+                logger.warning("[OpusStreamDecoder] Truncated Opus packet in bundle")
+                break
+            pcm += self.decoder.decode(bytes(view[offset:offset + length]), self.max_frame_samples)
+            offset += length
+        return bytes(pcm)
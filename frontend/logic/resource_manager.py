@@ -85,11 +85,14 @@ class ResourceManager:
     # Service Management Functions (previously in ServiceManager)
     #
 
-    async def stop_generation(self):
+    async def stop_generation(self, session_id=None):
         """Stop ongoing message generation on the server"""
+        params = {"session_id": session_id} if session_id else None
         try:
             async with aiohttp.ClientSession() as session:
-                async with session.post(f"{HTTP_BASE_URL}/api/stop-generation") as resp:
+                async with session.post(
+                    f"{HTTP_BASE_URL}/api/stop-generation", params=params
+                ) as resp:
                     resp_data = await resp.json()
                     logger.info(
                         f"[ResourceManager] Stop generation response: {resp_data}"
@@ -99,22 +102,31 @@ class ResourceManager:
             logger.error(f"[ResourceManager] Error stopping generation: {e}")
             return False
 
-    async def stop_all_services(self):
-        """Stop all ongoing services on the server side"""
+    async def stop_all_services(self, session_id=None):
+        """
+        Stop all ongoing services on the server side
+
+        Args:
+            session_id: Server session of this client. If None (no session
+                        yet, or reconnecting), the server stops nothing.
+        """
         results = {"generation_stopped": False, "audio_stopped": False}
+        params = {"session_id": session_id} if session_id else None
 
         try:
             # Create a client session for both requests
             async with aiohttp.ClientSession() as session:
                 # Stop audio first
-                async with session.post(f"{HTTP_BASE_URL}/api/stop-audio") as resp1:
+                async with session.post(
+                    f"{HTTP_BASE_URL}/api/stop-audio", params=params
+                ) as resp1:
                     resp1_data = await resp1.json()
                     results["audio_stopped"] = resp1_data.get("success", False)
                     logger.info(f"[ResourceManager] Stop audio response: {resp1_data}")
 
                 # Then stop generation
                 async with session.post(
-                    f"{HTTP_BASE_URL}/api/stop-generation"
+                    f"{HTTP_BASE_URL}/api/stop-generation", params=params
                 ) as resp2:
                     resp2_data = await resp2.json()
                     results["generation_stopped"] = resp2_data.get("success", False)
@@ -77,12 +77,13 @@ class TTSController(QObject):
         finally:
             self.is_toggling_tts = False
 
-    async def stop_tts(self):
-        """Stop TTS playback on the server"""
+    async def stop_tts(self, session_id=None):
+        """Stop TTS playback of the given server session"""
+        params = {"session_id": session_id} if session_id else None
         try:
             # Use shared HTTP session
             session = await SharedHTTPClient.get_session()
-            async with session.post(f"{HTTP_BASE_URL}/api/stop-audio") as resp:
+            async with session.post(f"{HTTP_BASE_URL}/api/stop-audio", params=params) as resp:
                 resp_data = await resp.json()
                 logger.info(f"[TTSController] Stop TTS response: {resp_data}")
             return True
@@ -8,6 +8,15 @@ from PySide6.QtCore import QObject, Signal
 
 from frontend.config import SERVER_HOST, SERVER_PORT, WEBSOCKET_PATH, logger
 from frontend.error_handler import handle_error
+from frontend.logic.frames import (
+    FLAG_OPUS,
+    FRAME_ABORT,
+    FRAME_AUDIO,
+    FRAME_END,
+    FrameError,
+    decode_frame,
+)
+from frontend.logic.opus_decoder import OpusStreamDecoder, opus_supported
 
 
 class WebSocketClient(QObject):
@@ -20,13 +29,16 @@ class WebSocketClient(QObject):
         bool
     )  # Emitted when WebSocket connects/disconnects
     messageReceived = Signal(dict)  # Emitted when a JSON message is received
-    audioReceived = Signal(bytes)  # Emitted when audio data is received
+    audioReceived = Signal(object)  # Emitted with a memoryview of PCM audio (empty at end of stream)
 
     def __init__(self, parent=None):
         super().__init__(parent)
         self._running = True
         self._connected = False
         self._ws = None
+        self._session_id = None  # Assigned by the server for each connection
+        self._stream_seq = {}  # Next expected frame seq per stream id
+        self._opus_decoder = OpusStreamDecoder() if opus_supported() else None
         self._ws_url = f"ws://{SERVER_HOST}:{SERVER_PORT}{WEBSOCKET_PATH}"
         logger.info(f"[WebSocketClient] Initialized with URL: {self._ws_url}")
 
@@ -37,16 +49,21 @@ class WebSocketClient(QObject):
         while self._running:
             logger.info(f"[WebSocketClient] Attempting connection to {self._ws_url}...")
             try:
-                async with websockets.connect(self._ws_url) as ws:
+                # permessage-deflate keeps the JSON text messages small
+                async with websockets.connect(self._ws_url, compression="deflate") as ws:
                     self._connected = True
                     self._ws = ws
                     self.connectionStatusChanged.emit(True)
                     logger.info("[WebSocketClient] Connected.")
 
+                    # Tell the server which audio encodings we can play
+                    codecs = ["opus", "pcm"] if self._opus_decoder else ["pcm"]
+                    await ws.send(json.dumps({"action": "audio_codecs", "codecs": codecs}))
+
                     while self._running:
                         try:
                             raw_msg = await ws.recv()
-                            logger.debug(f"[WebSocketClient] Raw message received type: {type(raw_msg)}, content preview: {str(raw_msg)[:100]}...")
+                            logger.debug(f"[WebSocketClient] Raw message received type: {type(raw_msg)}, size: {len(raw_msg)}")
                             await self._process_message(raw_msg)
                         except Exception as e:
                             # Pass user message for significant processing errors
@@ -105,24 +122,15 @@ class WebSocketClient(QObject):
     async def _process_message(self, raw_msg):
         """Process incoming messages from WebSocket"""
         if isinstance(raw_msg, bytes):
-            if raw_msg.startswith(b"audio:"):
-                audio_data = raw_msg[len(b"audio:") :]
-                logger.debug(
-                    f"[WebSocketClient] Received audio chunk of size: {len(audio_data)} bytes"
-                )
-                # FIXED: Using synchronous emit for the signal
-                # The ChatController will handle scheduling the actual async work
-                logger.debug(f"[WebSocketClient] Emitting audioReceived signal for chunk size: {len(audio_data)}")
-                self.audioReceived.emit(audio_data)
-            else:
-                logger.warning("[WebSocketClient] Unknown binary message format")
-                # Emit as audio anyway with proper prefix
-                audio_data = raw_msg
-                self.audioReceived.emit(audio_data)
+            self._process_frame(raw_msg)
         else:
             try:
                 data = json.loads(raw_msg)
                 logger.debug(f"[WebSocketClient] Received message: {data}")
+                if data.get("action") == "session":
+                    self._session_id = data.get("session_id")
+                    logger.info(f"[WebSocketClient] Server session id: {self._session_id}")
+                    return
                 logger.debug(f"[WebSocketClient] Emitting messageReceived signal with data: {data}")
                 self.messageReceived.emit(data)
             except json.JSONDecodeError as e:
@@ -135,6 +143,45 @@ class WebSocketClient(QObject):
                 )
                 logger.error(f"[WebSocketClient] Raw message: {raw_msg}")
 
+    def _process_frame(self, raw_msg):
+        """Decode a binary frame and emit its audio without copying the payload"""
+        try:
+            frame = decode_frame(raw_msg)
+        except FrameError as e:
+            logger.warning(f"[WebSocketClient] Dropping invalid binary frame: {e}")
+            return
+
+        expected_seq = self._stream_seq.get(frame.stream_id, 0)
+        if frame.seq != expected_seq:
+            logger.warning(
+                f"[WebSocketClient] Stream {frame.stream_id}: expected seq {expected_seq}, got {frame.seq}"
+            )
+        self._stream_seq[frame.stream_id] = frame.seq + 1
+
+        if frame.frame_type == FRAME_AUDIO:
+            logger.debug(
+                f"[WebSocketClient] Audio frame stream={frame.stream_id} seq={frame.seq} size={len(frame.payload)}"
+            )
+            if frame.flags & FLAG_OPUS:
+                if not self._opus_decoder:
+                    logger.warning("[WebSocketClient] Received Opus audio but no decoder is available")
+                    return
+                # Decode to PCM before it reaches the audio device
+                self.audioReceived.emit(self._opus_decoder.decode(frame.payload))
+            else:
+                self.audioReceived.emit(frame.payload)
+        elif frame.frame_type in (FRAME_END, FRAME_ABORT):
+            logger.debug(
+                f"[WebSocketClient] Stream {frame.stream_id} {'ended' if frame.frame_type == FRAME_END else 'aborted'}"
+            )
+            self._stream_seq.pop(frame.stream_id, None)
+            if self._opus_decoder:
+                self._opus_decoder.reset()
+            # An empty chunk marks end of stream for the audio pipeline
+            self.audioReceived.emit(b"")
+        else:
+            logger.warning(f"[WebSocketClient] Unknown frame type: {frame.frame_type}")
+
     async def send_message(self, data):
         """
         Send a message over the WebSocket connection.
@@ -172,6 +219,10 @@ class WebSocketClient(QObject):
         """Return the current connection status"""
         return self._connected
 
+    def get_session_id(self):
+        """Return the server-assigned session id of the current connection"""
+        return self._session_id if self._connected else None
+
     def cleanup(self):
         """Clean up resources"""
         logger.info("[WebSocketClient] Cleaning up resources")
@@ -6,7 +6,7 @@ import os
 import logging
 from pathlib import Path
 from PySide6.QtQml import QQmlApplicationEngine, qmlRegisterSingletonInstance, QQmlComponent
-from PySide6.QtCore import QTimer, Qt, QObject, Slot, Property
+from PySide6.QtCore import Qt, QObject, Slot, Property
 from PySide6.QtGui import QGuiApplication
 from PySide6.QtWebEngineQuick import QtWebEngineQuick
 import PySide6
@@ -16,6 +16,7 @@ from frontend.theme_manager import ThemeManager
 from frontend.settings_service import SettingsService
 from frontend.error_handler import error_handler_instance, ErrorHandler
 from frontend.photo_controller import PhotoController
+from frontend.photo_preloader import PROVIDER_ID as PHOTO_PROVIDER_ID
 from frontend.logic.calendar_controller import CalendarController
 from frontend.utils.markdown_utils import markdown_utils
 # Import the new AlarmController v2 instead of the old one
@@ -34,6 +35,7 @@ from frontend.logic.navigation_controller import NavigationController
 from frontend.config import set_app_instance
 # Import our new SharedHTTPClient utilities
 from frontend.utils.http_client import SharedHTTPClient, register_http_client_cleanup
+from frontend.utils.qt_event_loop import new_qt_event_loop
 
 # Display PySide6 version for debugging
 print(f"Using PySide6 version: {PySide6.__version__}")
@@ -99,8 +101,8 @@ def main():
     app.setOrganizationName("SmartScreen")
     app.setOrganizationDomain("smartscreen.local")
 
-    # Create an asyncio loop
-    loop = asyncio.new_event_loop()
+    # Create an asyncio loop driven by the Qt event loop
+    loop = new_qt_event_loop()
     asyncio.set_event_loop(loop)
 
     # Initialize QtWebEngine before creating QML engine
@@ -313,6 +315,10 @@ def main():
     # Create QML engine
     engine = QQmlApplicationEngine()
 
+    # Serve the photos the slideshow decoded ahead of time
+    if photo_controller_instance.image_provider is not None:
+        engine.addImageProvider(PHOTO_PROVIDER_ID, photo_controller_instance.image_provider)
+
     # Add import paths for base components
     engine.addImportPath("frontend/qml")
     engine.addImportPath("frontend/qml/components")
@@ -355,26 +361,15 @@ def main():
         main_window.setVisible(True) # type: ignore
         logger.info(f"Main window size: {main_window.width()}x{main_window.height()}") # type: ignore
 
-    # Set up a timer to process asyncio events
-    timer = QTimer()
-    timer.setInterval(10)  # 10ms
-
-    # Process asyncio events on timer tick
-    def process_asyncio_events():
-        loop.call_soon(loop.stop)
-        loop.run_forever()
-
-    timer.timeout.connect(process_asyncio_events)
-    timer.start()
-
     # Define signal handler for graceful shutdown
-    def signal_handler(sig, frame):
+    def signal_handler(sig):
         logger.info(f"Received signal {sig}, initiating graceful shutdown...")
         app.quit()
 
-    # Register signal handlers
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    # Register signal handlers through the loop: the signal wakes it via its
+    # self-pipe, so the handler runs even while Qt is idle
+    loop.add_signal_handler(signal.SIGINT, signal_handler, signal.SIGINT)
+    loop.add_signal_handler(signal.SIGTERM, signal_handler, signal.SIGTERM)
 
     # Start the application event loop
     exit_code = app.exec()
@@ -389,6 +384,12 @@ def main():
         
         # Handle chat controller cleanup
         loop.run_until_complete(chat_controller_instance.cleanup())
+
+        # Stop the calendar sync threads
+        calendar_controller_instance.cleanup()
+
+        # Stop the photo preloading threads
+        photo_controller_instance.cleanup()
     except Exception as e:
         logger.error(f"Error during cleanup: {e}")
     
@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Photo Blur Module
+
+Creates the blurred, darkened backgrounds of the photo slideshow. The photo
+is decoded at a reduced scale, averaged down to a 20x20 grid and scaled up
+only to display resolution; the background is never built at the camera
+resolution. Used by the PhotoProcessor and by the downloader, which builds
+the backgrounds of a whole library at once in a process pool.
+
+Usage:
+    python -m frontend.photo_blur <media folder> [--workers N]
+"""
+
+import argparse
+import logging
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+from PIL import Image, ImageFilter, ImageOps
+
+from frontend.config import PHOTO_CONFIG
+
+logger = logging.getLogger("frontend.photo_blur")
+
+# The photo is reduced to this many cells before it's scaled up again
+BLUR_GRID = (20, 20)
+# Gaussian blur radius, relative to a cell (5 pixels on the 1280-pixel-wide downloads)
+BLUR_RADIUS_PER_CELL = 5 / 64
+# Darkened for better contrast with foreground content
+BRIGHTNESS = 0.7
+BLUR_QUALITY = 90
+
+DISPLAY_SIZE = (PHOTO_CONFIG["display_width"], PHOTO_CONFIG["display_height"])
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+
+
+def cover_size(image_size, display_size=DISPLAY_SIZE):
+    """Smallest size with the aspect ratio of the image that covers the display."""
+    width, height = image_size
+    scale = max(display_size[0] / width, display_size[1] / height)
+    return max(1, round(width * scale)), max(1, round(height * scale))
+
+
+def atomic_save(image, path, format, **kw):
+    """
+    Save an image under a temporary name and move it into place, so a
+    half-written file is never used.
+
+    Args:
+        image: PIL image
+        path: Destination path
+        format: PIL format name, e.g. "JPEG"
+        **kw: Options passed to Image.save (quality, ...)
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path) or ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            image.save(f, format, **kw)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def make_blurred_background(img, display_size=DISPLAY_SIZE):
+    """
+    Build the blurred background of an image.
+
+    Args:
+        img: PIL image, upright, at any resolution
+        display_size: (width, height) of the screen; the result covers it
+
+    Returns:
+        RGB image of the display resolution
+    """
+    output_size = cover_size(img.size, display_size)
+    if img.mode != "RGB":
+        img = img.convert("RGB")
+
+    # Average down to the grid: reduce() by whole factors first (cheap box
+    # filter), then one small resize. Darkening 400 pixels is free.
+    factor = min(img.width // BLUR_GRID[0], img.height // BLUR_GRID[1])
+    if factor > 1:
+        img = img.reduce(factor)
+    small = img.resize(BLUR_GRID, Image.LANCZOS)
+    small = small.point([int(value * BRIGHTNESS) for value in range(256)] * 3)
+
+    # Scale back up to create the pixelation effect, at display resolution only
+    blurred = small.resize(output_size, Image.LANCZOS)
+    radius = BLUR_RADIUS_PER_CELL * output_size[0] / BLUR_GRID[0]
+    if radius >= 0.5:
+        blurred = blurred.filter(ImageFilter.GaussianBlur(radius=radius))
+    return blurred
+
+
+def create_blurred_background_file(image_path, output_path, display_size=DISPLAY_SIZE):
+    """
+    Create the blurred background of an image file.
+
+    Args:
+        image_path: Path to the original image
+        output_path: Where to save the background (JPEG)
+        display_size: (width, height) of the screen
+
+    Returns:
+        output_path
+    """
+    with Image.open(image_path) as img:
+        # JPEGs decode straight to 1/2, 1/4 or 1/8 scale; the grid needs little
+        img.draft("RGB", (BLUR_GRID[0] * 8, BLUR_GRID[1] * 8))
+        img = ImageOps.exif_transpose(img)
+        blurred = make_blurred_background(img, display_size)
+
+    atomic_save(blurred, output_path, "JPEG", quality=BLUR_QUALITY)
+    return output_path
+
+
+def _create_job(job):
+    image_path, output_path, display_size = job
+    try:
+        return create_blurred_background_file(image_path, output_path, display_size)
+    except Exception as e:
+        logger.error(f"Error creating blurred background for {image_path}: {e}")
+        return None
+
+
+def create_blurred_backgrounds(jobs, display_size=DISPLAY_SIZE, workers=None):
+    """
+    Create many blurred backgrounds in a process pool.
+
+    Args:
+        jobs: (image_path, output_path) pairs
+        display_size: (width, height) of the screen
+        workers: Number of processes (default: one per CPU)
+
+    Returns:
+        List with the output path of each job, or None where it failed
+    """
+    jobs = [(image_path, output_path, display_size) for image_path, output_path in jobs]
+    if not jobs:
+        return []
+    if len(jobs) == 1 or workers == 1:
+        return [_create_job(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_create_job, jobs, chunksize=4))
+
+
+def blurred_path_for(image_path):
+    """Path of the pre-generated background next to an image ("<name>_blurred.jpg")."""
+    name, _ = os.path.splitext(image_path)
+    return f"{name}_blurred.jpg"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("folder", help="Folder with the photos; backgrounds are saved next to them")
+    parser.add_argument("--workers", type=int, default=None, help="Number of processes (default: one per CPU)")
+    parser.add_argument("--force", action="store_true", help="Rebuild existing backgrounds")
+    args = parser.parse_args()
+
+    jobs = []
+    for filename in sorted(os.listdir(args.folder)):
+        if not filename.lower().endswith(IMAGE_EXTENSIONS) or filename.endswith("_blurred.jpg"):
+            continue
+        image_path = os.path.join(args.folder, filename)
+        output_path = blurred_path_for(image_path)
+        if args.force or not os.path.exists(output_path):
+            jobs.append((image_path, output_path))
+
+    results = create_blurred_backgrounds(jobs, workers=args.workers)
+    created = sum(1 for result in results if result)
+    print(f"Created {created} blurred backgrounds ({len(results) - created} failed)")
+
+
+if __name__ == "__main__":
+    main()
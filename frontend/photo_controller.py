@@ -1,8 +1,10 @@
-from PySide6.QtCore import QObject, Slot, Signal, Property, QTimer
+from PySide6.QtCore import QObject, Slot, Signal, Property, QTimer, QFileSystemWatcher
 import os
-import json
 import logging
+from .config import PHOTO_CONFIG
+from .photo_library import PhotoLibrary
 from .photo_processor import PhotoProcessor
+from .photo_preloader import PhotoImageProvider, PhotoPreloader
 
 logger = logging.getLogger("frontend.photo_controller")
 
@@ -22,121 +24,118 @@ class PhotoController(QObject):
     # Signal when the date metadata changes
     dateTextChanged = Signal(str)
 
+    # Internal: an item the slideshow is waiting for has been prepared (worker -> GUI thread)
+    _mediaPrepared = Signal(object)
+
+    # Internal: a library refresh finished (worker -> GUI thread)
+    _libraryRefreshed = Signal(object)
+
     def __init__(self):
         super().__init__()
         self.media_folder = (
             "/home/jack/PYSIDE_RASPI_FRONTEND/frontend/downloaded_media"
         )
-        self.metadata_file = os.path.join(self.media_folder, "photo_metadata.json")
-        self.metadata = {}
         self.media_files = []
         self.current_index = 0
         self._is_running = False
         self._current_blurred_bg = ""
         self._current_date_text = ""
         self._user_paused = False # Flag to track user-initiated pause
-        
-        # Load metadata if it exists
-        self.load_metadata()
+        self._start_pending = False # Slideshow requested while the library was still empty
+
+        # Index of the media folder; dates and the order come from here
+        self.library = PhotoLibrary(self.media_folder)
+        self._libraryRefreshed.connect(self._on_library_refreshed)
 
         # Create the photo processor for adding effects
         self.photo_processor = PhotoProcessor()
 
+        # Upcoming items are prepared (and decoded) ahead on worker threads
+        self.image_provider = None
+        if PHOTO_CONFIG["predecode_images"]:
+            self.image_provider = PhotoImageProvider(self.photo_processor.cache_dir)
+        self.preloader = PhotoPreloader(
+            self._prepare_media, PHOTO_CONFIG["preload_workers"], self.image_provider
+        )
+        self._pending_media = None  # Future of the item waiting to be shown
+        self._mediaPrepared.connect(self._apply_prepared_media)
+
         # Timer for auto-advancing images
         self.timer = QTimer(self)
         self.timer.timeout.connect(self.show_next_media)
         self.timer.setInterval(5000)  # 5 seconds for images
 
-        # Load media files
+        # Folder changes update the library once the folder is quiet again
+        # (e.g. after a download), not once per file
+        self._rescan_timer = QTimer(self)
+        self._rescan_timer.setSingleShot(True)
+        self._rescan_timer.setInterval(PHOTO_CONFIG["rescan_delay_ms"])
+        self._rescan_timer.timeout.connect(self.refresh_library)
+        self.watcher = QFileSystemWatcher(self)
+        if os.path.isdir(self.media_folder):
+            self.watcher.addPath(self.media_folder)
+        self.watcher.directoryChanged.connect(lambda _path: self._rescan_timer.start())
+
+        # Load media files from the index, then catch up with changes made
+        # while the app wasn't running
         self.load_media_files()
+        self.refresh_library()
         logger.info("PhotoController initialized")
 
-    def load_metadata(self):
-        """Load metadata from the JSON file if it exists."""
-        if os.path.exists(self.metadata_file):
-            try:
-                with open(self.metadata_file, "r") as f:
-                    self.metadata = json.load(f)
-                logger.info(f"Loaded metadata for {len(self.metadata)} media items")
-            except Exception as e:
-                logger.error(f"Error loading metadata: {e}")
-                self.metadata = {}
-        else:
-            logger.warning(f"Metadata file not found: {self.metadata_file}")
-            self.metadata = {}
-
     def load_media_files(self):
-        """Load all media files from the specified folder"""
+        """Load the media list from the library index"""
         try:
-            if os.path.exists(self.media_folder):
-                self.media_files = []
-                for filename in os.listdir(self.media_folder):
-                    # Skip blurred background images (ending with _blurred.jpg)
-                    if filename.endswith("_blurred.jpg"):
-                        continue
-                    # Skip the metadata file
-                    if filename == "photo_metadata.json":
-                        continue
-                    # Skip Python scripts
-                    if filename.endswith(".py"):
-                        continue
-
-                    file_path = os.path.join(self.media_folder, filename)
-                    if filename.lower().endswith(
-                        (".jpg", ".jpeg", ".png", ".mp4", ".mov", ".webm")
-                    ):
-                        is_video = filename.lower().endswith((".mp4", ".mov", ".webm"))
-                        self.media_files.append((file_path, is_video))
-
-                # Sort files by name - this ensures a consistent order
-                self.media_files.sort(key=lambda x: x[0])
-
-                logger.info(
-                    f"Loaded {len(self.media_files)} media files from {self.media_folder}"
-                )
-
-                # Emit the first media item
-                if self.media_files:
-                    self.currentMediaChanged.emit(
-                        self.media_files[0][0], self.media_files[0][1]
-                    )
-            else:
-                logger.error(f"Media folder does not exist: {self.media_folder}")
+            current_path = self.media_files[self.current_index][0] if self.media_files else None
+            self.media_files = self.library.media_files(PHOTO_CONFIG["order"])
+
+            # Stay on the same item when files are added or removed
+            paths = [path for path, _ in self.media_files]
+            if current_path in paths:
+                self.current_index = paths.index(current_path)
+            elif self.current_index >= len(self.media_files):
+                self.current_index = 0
+
+            logger.info(
+                f"Loaded {len(self.media_files)} media files from {self.media_folder}"
+            )
         except Exception as e:
             logger.error(f"Error loading media files: {e}")
 
+    def refresh_library(self):
+        """Update the library from the media folder in the background"""
+        self.library.refresh().add_done_callback(self._libraryRefreshed.emit)
+
+    @Slot(object)
+    def _on_library_refreshed(self, future):
+        """GUI thread: reload the media list if the library changed"""
+        if future.cancelled():
+            return
+        try:
+            changed = future.result()
+        except Exception as e:
+            logger.error(f"Error updating photo library: {e}")
+            return
+        if changed:
+            was_empty = not self.media_files
+            self.load_media_files()
+            # First scan of a new library: start the slideshow the screen asked for
+            if was_empty and self.media_files and self._start_pending:
+                self.start_slideshow()
+
     def get_date_for_file(self, file_path):
-        """Get the date from metadata for a file."""
+        """Get the date from the library for a file."""
         if not file_path:
             return ""
-
-        filename = os.path.basename(file_path)
-        if filename in self.metadata:
-            return self.metadata[filename].get("date", "")
-        return ""
+        return self.library.date_text(file_path)
 
     @Slot()
     def start_slideshow(self):
         """Start the slideshow timer"""
+        # Nothing indexed yet (new library): start once the first refresh fills it
+        self._start_pending = not self.media_files
         if self.media_files:
-            # Clear the image cache to ensure fresh processing
-            self.photo_processor.clear_cache()
-
-            # Immediately emit the current media item to ensure something is displayed
-            current_path, is_video = self.media_files[self.current_index]
-
-            # Process the image before sending to UI
-            processed_path = self.process_media_path(current_path, is_video)
-
-            # Update date text
-            self.update_date_text(current_path)
-
-            # Create and emit blurred background if this is an image
-            if not is_video:
-                self.find_blurred_background(current_path)
-
-            # Emit the new media item
-            self.currentMediaChanged.emit(processed_path, is_video)
+            # Immediately show the current media item to ensure something is displayed
+            self._show_media(self.current_index)
 
             # Start the timer for automatic advancement
             self.timer.start()
@@ -158,6 +157,7 @@ class PhotoController(QObject):
         self.timer.stop()
         self._is_running = False
         self._user_paused = True # Set user pause flag when stopping via controls/cleanup
+        self._start_pending = False
         self.slideshowRunningChanged.emit(False)
         logger.info("Slideshow stopped")
 
@@ -184,26 +184,28 @@ class PhotoController(QObject):
         if self.media_files:
             current_path, is_video = self.media_files[self.current_index]
             if not is_video:
-                self.currentMediaChanged.emit(current_path, is_video)
+                self._show_media(self.current_index)
 
     def process_media_path(self, media_path, is_video):
-        """Apply effects to image files before sending to the UI"""
+        """Get the screen-sized rendition of image files before sending to the UI"""
         if is_video:
             # Don't process videos
             return media_path
         else:
-            # Apply shadow effect to images
-            return self.photo_processor.add_shadow_effect(
-                media_path, getattr(self, "is_dark_mode", False)
-            )
+            return self.photo_processor.get_display_image(media_path)
 
     def find_blurred_background(self, image_path):
-        """Find or create a blurred background version of the current image"""
+        """
+        Find or create a blurred background version of an image
+
+        Returns:
+            Path to the blurred background, or None
+        """
         if not image_path or not os.path.exists(image_path):
             logger.error(
                 f"Cannot find blurred background: Invalid image path {image_path}"
             )
-            return
+            return None
 
         try:
             # First check if there's already a pre-generated blurred version
@@ -213,51 +215,102 @@ class PhotoController(QObject):
             blurred_path = os.path.join(os.path.dirname(image_path), blurred_filename)
 
             if os.path.exists(blurred_path):
-                # Use the pre-generated blurred background
-                self._current_blurred_bg = blurred_path
-                self.blurredBackgroundChanged.emit(blurred_path)
-                logger.info(f"Using pre-generated blurred background: {blurred_path}")
-                return
+                logger.debug(f"Using pre-generated blurred background: {blurred_path}")
+                return blurred_path
 
             # If no pre-generated version exists, create one on-the-fly
             blurred_path = self.photo_processor.create_blurred_background(image_path)
 
             if blurred_path and os.path.exists(blurred_path):
-                self._current_blurred_bg = blurred_path
-                # Emit signal with the path to the blurred image
-                self.blurredBackgroundChanged.emit(blurred_path)
-                logger.info(f"Created blurred background: {blurred_path}")
-            else:
-                logger.error("Failed to create blurred background")
+                return blurred_path
+            logger.error("Failed to create blurred background")
         except Exception as e:
             logger.error(f"Error finding/creating blurred background: {e}")
+        return None
 
-    @Slot()
-    def advance_to_next(self):
-        """Manually advance to the next media item"""
-        if not self.media_files:
+    def _prepare_media(self, media_path, is_video):
+        """Worker thread: get everything needed to show a media item"""
+        if is_video:
+            return {"source": media_path, "display_path": media_path, "blurred_path": None}
+        # The library knows the renditions made before, so the file isn't hashed again
+        info = self.library.get(media_path)
+        if (
+            info
+            and info["derivative_path"]
+            and info["blurred_path"]
+            and self.photo_processor.size_tag in os.path.basename(info["derivative_path"])
+            and os.path.exists(info["derivative_path"])
+            and os.path.exists(info["blurred_path"])
+        ):
+            display_path, blurred_path = info["derivative_path"], info["blurred_path"]
+        else:
+            display_path = self.process_media_path(media_path, is_video)
+            blurred_path = self.find_blurred_background(media_path)
+            if info and display_path != media_path and blurred_path:
+                self.library.set_derivatives(media_path, display_path, blurred_path)
+        return {
+            "source": display_path,
+            "display_path": display_path,
+            "blurred_path": blurred_path,
+        }
+
+    def _show_media(self, index):
+        """
+        Show a media item as soon as it's prepared, and prepare the ones after it
+
+        Prepared items are applied right away; otherwise the item is shown
+        when its preparation finishes, without blocking the GUI thread.
+        """
+        self.current_index = index
+        current_path, is_video = self.media_files[index]
+        future = self.preloader.get(current_path, is_video)
+        self._pending_media = future
+
+        # The item itself first, then the next ones and the previous one
+        count = len(self.media_files)
+        upcoming = [(index + offset) % count for offset in range(PHOTO_CONFIG["preload_count"] + 1)]
+        upcoming.append((index - 1) % count)
+        self.preloader.keep([self.media_files[i] for i in dict.fromkeys(upcoming)])
+
+        # Runs right away if the item is ready, else on the worker when it's done
+        future.add_done_callback(self._mediaPrepared.emit)
+
+    @Slot(object)
+    def _apply_prepared_media(self, future):
+        """GUI thread: send a prepared item to the UI unless the user moved on meanwhile"""
+        if future is not self._pending_media or future.cancelled():
             return
-
-        # Simple index advancement in the fixed order
-        self.current_index = (self.current_index + 1) % len(self.media_files)
+        self._pending_media = None
         current_path, is_video = self.media_files[self.current_index]
-
-        # Process the image before sending to UI
-        processed_path = self.process_media_path(current_path, is_video)
+        try:
+            item = future.result()
+        except Exception as e:
+            logger.error(f"Error preparing {current_path}: {e}")
+            item = {"source": current_path, "blurred_path": None}
 
         # Update date text
         self.update_date_text(current_path)
 
-        # Create and emit blurred background if this is an image
-        if not is_video:
-            self.find_blurred_background(current_path)
+        # Emit the blurred background if this is an image
+        if not is_video and item["blurred_path"]:
+            self._current_blurred_bg = item["blurred_path"]
+            self.blurredBackgroundChanged.emit(item["blurred_path"])
 
         # Emit the new media item
-        self.currentMediaChanged.emit(processed_path, is_video)
+        self.currentMediaChanged.emit(item["source"], is_video)
         logger.debug(
-            f"Showing media {self.current_index + 1}/{len(self.media_files)}: {processed_path}"
+            f"Showing media {self.current_index + 1}/{len(self.media_files)}: {item['source']}"
         )
 
+    @Slot()
+    def advance_to_next(self):
+        """Manually advance to the next media item"""
+        if not self.media_files:
+            return
+
+        # Simple index advancement in the fixed order
+        self._show_media((self.current_index + 1) % len(self.media_files))
+
     @Slot()
     def go_to_previous(self):
         """Go to the previous media item"""
@@ -265,24 +318,7 @@ class PhotoController(QObject):
             return
 
         # Simple previous in the fixed order
-        self.current_index = (self.current_index - 1) % len(self.media_files)
-        current_path, is_video = self.media_files[self.current_index]
-
-        # Process the image before sending to UI
-        processed_path = self.process_media_path(current_path, is_video)
-
-        # Update date text
-        self.update_date_text(current_path)
-
-        # Create and emit blurred background if this is an image
-        if not is_video:
-            self.find_blurred_background(current_path)
-
-        # Emit the new media item
-        self.currentMediaChanged.emit(processed_path, is_video)
-        logger.debug(
-            f"Showing media {self.current_index + 1}/{len(self.media_files)}: {processed_path}"
-        )
+        self._show_media((self.current_index - 1) % len(self.media_files))
         
     @Slot(int)
     def go_to_specific_index(self, index):
@@ -291,25 +327,7 @@ class PhotoController(QObject):
             logger.error(f"Invalid index {index} for media files of length {len(self.media_files)}")
             return
 
-        # Set current index to the specified index
-        self.current_index = index
-        current_path, is_video = self.media_files[self.current_index]
-
-        # Process the image before sending to UI
-        processed_path = self.process_media_path(current_path, is_video)
-
-        # Update date text
-        self.update_date_text(current_path)
-
-        # Create and emit blurred background if this is an image
-        if not is_video:
-            self.find_blurred_background(current_path)
-
-        # Emit the new media item
-        self.currentMediaChanged.emit(processed_path, is_video)
-        logger.debug(
-            f"Direct jump to media {self.current_index + 1}/{len(self.media_files)}: {processed_path}"
-        )
+        self._show_media(index)
 
     @Slot()
     def video_finished(self):
@@ -335,6 +353,7 @@ class PhotoController(QObject):
     @Slot()
     def pause_timer(self):
         """Pause the automatic advancement timer (e.g., when screen is hidden)."""
+        self._start_pending = False
         if self._is_running:
             self.timer.stop()
             self._is_running = False
@@ -355,7 +374,18 @@ class PhotoController(QObject):
                 logger.info("Slideshow timer resumed (e.g., screen shown).")
             else:
                 logger.info("Screen shown, but current item is video. Timer not resumed.")
+        elif not self._user_paused and not self.media_files:
+            # Library still empty: start as soon as the refresh fills it
+            self._start_pending = True
         elif self._user_paused:
             logger.info("Screen shown, but slideshow was paused by user. Timer not resumed.")
         elif self._is_running:
              logger.info("Screen shown, but timer is already running.")
+
+    def cleanup(self):
+        """Stop the slideshow timer and the preloading threads, and close the library"""
+        self.timer.stop()
+        self._rescan_timer.stop()
+        self._pending_media = None
+        self.preloader.shutdown()
+        self.library.close()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+import json
+import logging
+import os
+from datetime import datetime
+
+from PIL import Image
+
+from frontend.config import PHOTO_LIBRARY_DB_PATH
+from frontend.utils.sqlite_store import SQLiteStore
+
+logger = logging.getLogger("frontend.photo_library")
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png")
+VIDEO_EXTENSIONS = (".mp4", ".mov", ".webm")
+METADATA_FILENAME = "photo_metadata.json"
+
+# EXIF tags
+EXIF_IFD = 0x8769
+DATE_TIME_ORIGINAL = 0x9003
+ORIENTATION = 0x0112
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS media (
+    filename TEXT PRIMARY KEY,
+    is_video INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    width INTEGER,
+    height INTEGER,
+    creation_time TEXT,
+    derivative_path TEXT,
+    blurred_path TEXT
+);
+CREATE INDEX IF NOT EXISTS media_by_creation_time ON media(creation_time);
+CREATE TABLE IF NOT EXISTS metadata (
+    filename TEXT PRIMARY KEY,
+    creation_time TEXT,
+    title TEXT,
+    description TEXT
+);
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+ORDER_BY = {
+    "name": "filename",
+    "date": "creation_time IS NULL, creation_time, filename",
+}
+
+
+def is_media_file(filename):
+    """Whether a file of the media folder belongs in the slideshow."""
+    lower = filename.lower()
+    if filename.endswith("_blurred.jpg"):
+        return False
+    return lower.endswith(IMAGE_EXTENSIONS) or lower.endswith(VIDEO_EXTENSIONS)
+
+
+def format_date(creation_time):
+    """Format a creation time as shown on the photo screen (e.g. "Thursday, April 3, 2025")."""
+    if not creation_time:
+        return ""
+    try:
+        return datetime.fromisoformat(creation_time.replace("Z", "+00:00")).strftime("%A, %B %-d, %Y")
+    except ValueError:
+        return ""
+
+
+def _describe_image(path):
+    """Get the upright (width, height) and EXIF capture time of an image; only the header is read."""
+    try:
+        with Image.open(path) as img:
+            width, height = img.size
+            exif = img.getexif()
+            if exif.get(ORIENTATION, 1) in (5, 6, 7, 8):
+                width, height = height, width
+            taken = exif.get_ifd(EXIF_IFD).get(DATE_TIME_ORIGINAL)
+        if taken:
+            taken = datetime.strptime(taken.strip("\x00 "), "%Y:%m:%d %H:%M:%S").isoformat()
+        return width, height, taken or None
+    except Exception as e:
+        logger.warning(f"Could not read image header of {path}: {e}")
+        return None, None, None
+
+
+class PhotoLibrary(SQLiteStore):
+    """
+    Index of the slideshow's media folder (SQLite).
+
+    Holds each file's type, size and modification time, upright dimensions,
+    creation time and the paths of its rendition and blurred background, plus
+    the Google Photos metadata written by the downloader. refresh() brings it
+    up to date by comparing the folder with the index, so only new or changed
+    files are read; startup and the media list, date and order lookups never
+    scan the folder.
+    """
+
+    def __init__(self, media_folder, db_path=PHOTO_LIBRARY_DB_PATH):
+        super().__init__(db_path, SCHEMA, "photo-library")
+        self.media_folder = media_folder
+
+    # --- Reads (calling thread) ---
+
+    def media_files(self, order="name"):
+        """
+        Get the indexed media files.
+
+        Args:
+            order: "name" (file name) or "date" (creation time; files without one last)
+
+        Returns:
+            List of (path, is_video) tuples
+        """
+        rows = self._connection().execute(
+            f"SELECT filename, is_video FROM media ORDER BY {ORDER_BY[order]}"
+        ).fetchall()
+        return [(os.path.join(self.media_folder, row["filename"]), bool(row["is_video"])) for row in rows]
+
+    def get(self, path):
+        """
+        Get the indexed details of a media file.
+
+        Returns:
+            Dictionary with the columns of the media table, or None if the file isn't indexed
+        """
+        row = self._connection().execute(
+            "SELECT * FROM media WHERE filename = ?", (os.path.basename(path),)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def date_text(self, path):
+        """Get the formatted creation date of a media file, or "" if unknown."""
+        row = self._connection().execute(
+            "SELECT creation_time FROM media WHERE filename = ?", (os.path.basename(path),)
+        ).fetchone()
+        return format_date(row["creation_time"]) if row else ""
+
+    # --- Writes (worker thread) ---
+
+    def _import_metadata_file(self, conn):
+        """Take over photo_metadata.json (written by older downloaders) when it changed."""
+        metadata_file = os.path.join(self.media_folder, METADATA_FILENAME)
+        try:
+            mtime = str(os.stat(metadata_file).st_mtime_ns)
+        except FileNotFoundError:
+            return False
+        row = conn.execute("SELECT value FROM state WHERE key = 'metadata_file_mtime'").fetchone()
+        if row and row["value"] == mtime:
+            return False
+        try:
+            with open(metadata_file, "r") as f:
+                metadata = json.load(f)
+        except Exception as e:
+            logger.error(f"Error loading metadata: {e}")
+            return False
+        self._record_metadata(metadata)
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO state (key, value) VALUES ('metadata_file_mtime', ?)", (mtime,)
+            )
+        logger.info(f"Imported metadata for {len(metadata)} media items")
+        return True
+
+    def _refresh(self):
+        conn = self._connection()
+        changed = self._import_metadata_file(conn)
+
+        known = {
+            row["filename"]: (row["size"], row["mtime_ns"])
+            for row in conn.execute("SELECT filename, size, mtime_ns FROM media")
+        }
+        seen = set()
+        updates = []
+        try:
+            entries = list(os.scandir(self.media_folder))
+        except FileNotFoundError:
+            # Keep the index (e.g. while a USB stick is unplugged)
+            logger.error(f"Media folder does not exist: {self.media_folder}")
+            return changed
+        for entry in entries:
+            if not is_media_file(entry.name) or not entry.is_file():
+                continue
+            stat = entry.stat()
+            seen.add(entry.name)
+            if known.get(entry.name) == (stat.st_size, stat.st_mtime_ns):
+                continue
+            # New or changed: only these files are opened
+            is_video = entry.name.lower().endswith(VIDEO_EXTENSIONS)
+            width, height, taken = (None, None, None) if is_video else _describe_image(entry.path)
+            updates.append((entry.name, int(is_video), stat.st_size, stat.st_mtime_ns, width, height, taken))
+        removed = [(filename,) for filename in known.keys() - seen]
+
+        if updates or removed:
+            with conn:
+                # The downloader's creation time wins over the EXIF one; the
+                # rendition and background of a changed file are made again
+                conn.executemany(
+                    "INSERT INTO media (filename, is_video, size, mtime_ns, width, height, creation_time) "
+                    "VALUES (?1, ?2, ?3, ?4, ?5, ?6, "
+                    "COALESCE((SELECT creation_time FROM metadata WHERE filename = ?1), ?7)) "
+                    "ON CONFLICT(filename) DO UPDATE SET is_video = excluded.is_video, size = excluded.size, "
+                    "mtime_ns = excluded.mtime_ns, width = excluded.width, height = excluded.height, "
+                    "creation_time = excluded.creation_time, derivative_path = NULL, blurred_path = NULL",
+                    updates,
+                )
+                conn.executemany("DELETE FROM media WHERE filename = ?", removed)
+            logger.info(f"Photo library updated: {len(updates)} new or changed, {len(removed)} removed")
+        return changed or bool(updates or removed)
+
+    def _record_metadata(self, metadata):
+        conn = self._connection()
+        with conn:
+            for filename, item in metadata.items():
+                creation_time = item.get("creation_time") or None
+                conn.execute(
+                    "INSERT OR REPLACE INTO metadata (filename, creation_time, title, description) "
+                    "VALUES (?, ?, ?, ?)",
+                    (filename, creation_time, item.get("title", ""), item.get("description", "")),
+                )
+                if creation_time:
+                    conn.execute(
+                        "UPDATE media SET creation_time = ? WHERE filename = ?", (creation_time, filename)
+                    )
+
+    def _set_derivatives(self, path, derivative_path, blurred_path):
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "UPDATE media SET derivative_path = ?, blurred_path = ? WHERE filename = ?",
+                (derivative_path, blurred_path, os.path.basename(path)),
+            )
+
+    # --- Public write API (any thread, returns a Future) ---
+
+    def refresh(self):
+        """
+        Bring the index up to date with the media folder.
+
+        Returns:
+            Future of True if anything changed
+        """
+        return self._submit(self._refresh)
+
+    def record_metadata(self, metadata):
+        """
+        Store Google Photos metadata.
+
+        Args:
+            metadata: {filename: {"creation_time", "title", "description"}}
+        """
+        return self._submit(self._record_metadata, metadata)
+
+    def set_derivatives(self, path, derivative_path, blurred_path):
+        """Remember the rendition and blurred background made for a media file."""
+        return self._submit(self._set_derivatives, path, derivative_path, blurred_path)
@@ -0,0 +1,131 @@
+"""
+Photo Preloader Module
+
+Prepares the slideshow items around the current one on worker threads (the
+screen-sized rendition, the blurred background and optionally the decoded
+image), so a transition only swaps in things that already exist.
+"""
+
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from PySide6.QtGui import QImage
+from PySide6.QtQuick import QQuickImageProvider
+
+logger = logging.getLogger("frontend.photo_preloader")
+
+# Image provider id; pre-decoded photos are shown as "image://photos/<rendition file name>"
+PROVIDER_ID = "photos"
+
+
+class PhotoImageProvider(QQuickImageProvider):
+    """
+    Hands photos decoded by the preloader to QML.
+
+    Photos that aren't (or no longer) held are read from the rendition cache
+    when QML asks for them, on the QML image loading thread.
+    """
+
+    def __init__(self, cache_dir):
+        super().__init__(QQuickImageProvider.ImageType.Image)
+        self.cache_dir = cache_dir
+        self._images = {}  # Rendition file name -> QImage
+        self._lock = threading.Lock()
+
+    def put(self, image_id, image):
+        with self._lock:
+            self._images[image_id] = image
+
+    def discard(self, image_id):
+        with self._lock:
+            self._images.pop(image_id, None)
+
+    def requestImage(self, image_id, size, requested_size):
+        with self._lock:
+            image = self._images.get(image_id)
+        if image is None:
+            image = QImage(os.path.join(self.cache_dir, os.path.basename(image_id)))
+        return image
+
+
+class PhotoPreloader:
+    """
+    Worker pool preparing slideshow items ahead of time.
+
+    Only the items passed to the latest keep() are held: the others are
+    dropped, with their decoded images, and cancelled if not started yet.
+    """
+
+    def __init__(self, prepare, workers, image_provider=None):
+        """
+        Args:
+            prepare: Function (path, is_video) -> item dictionary with "source"
+                     and "display_path"; called on a worker thread
+            workers: Number of worker threads
+            image_provider: PhotoImageProvider to decode images into, or None
+                            to leave decoding to QML
+        """
+        self._prepare = prepare
+        self._provider = image_provider
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="photo-preload")
+        self._futures = {}  # Media path -> Future of its prepared item
+
+    def _run(self, path, is_video):
+        item = self._prepare(path, is_video)
+        if self._provider is not None and not is_video:
+            image = QImage(item["display_path"])
+            if image.isNull():
+                logger.warning(f"Could not decode {item['display_path']}")
+            else:
+                image_id = os.path.basename(item["display_path"])
+                self._provider.put(image_id, image)
+                item["image_id"] = image_id
+                item["source"] = f"image://{PROVIDER_ID}/{image_id}"
+        return item
+
+    def _release(self, future):
+        if self._provider is None or future.cancelled() or future.exception() is not None:
+            return
+        image_id = future.result().get("image_id")
+        if image_id:
+            self._provider.discard(image_id)
+
+    def get(self, path, is_video):
+        """
+        Get the Future of a prepared item, starting its preparation if needed.
+
+        Args:
+            path: Path of the media file
+            is_video: Whether the file is a video
+
+        Returns:
+            Future of the item dictionary
+        """
+        future = self._futures.get(path)
+        if future is None:
+            future = self._executor.submit(self._run, path, is_video)
+            self._futures[path] = future
+        return future
+
+    def keep(self, items):
+        """
+        Prepare the given items in the background, and drop every other one.
+
+        Args:
+            items: (path, is_video) tuples, most urgent first
+        """
+        paths = {path for path, _ in items}
+        for path in list(self._futures):
+            if path not in paths:
+                future = self._futures.pop(path)
+                future.cancel()
+                # Frees the decoded image now, or once a running preparation ends
+                future.add_done_callback(self._release)
+        for path, is_video in items:
+            self.get(path, is_video)
+
+    def shutdown(self):
+        self.keep([])
+        self._executor.shutdown(wait=False, cancel_futures=True)
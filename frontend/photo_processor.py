@@ -1,77 +1,130 @@
-from PIL import Image, ImageFilter, ImageEnhance
+from PIL import Image, ImageOps
 import os
+import hashlib
 import logging
-import tempfile
+import threading
 from PySide6.QtCore import QObject
 
+from frontend.config import PHOTO_CONFIG, PHOTO_CACHE_DIR
+from frontend.photo_blur import atomic_save, create_blurred_background_file
+
 logger = logging.getLogger("frontend.photo_processor")
 
+# EXIF orientations that swap width and height
+ROTATED_ORIENTATIONS = (5, 6, 7, 8)
+
+DERIVATIVE_EXTENSIONS = {"JPEG": ".jpg", "WEBP": ".webp", "PNG": ".png"}
+
 
 class PhotoProcessor(QObject):
     """Utility class to process photos with borders and effects"""
 
-    def __init__(self):
+    def __init__(self, cache_dir=PHOTO_CACHE_DIR):
         super().__init__()
-        self.cache_dir = os.path.join(tempfile.gettempdir(), "photo_processor_cache")
+        self.cache_dir = cache_dir
         # Create cache directory if it doesn't exist
-        if not os.path.exists(self.cache_dir):
-            os.makedirs(self.cache_dir)
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.display_size = (PHOTO_CONFIG["display_width"], PHOTO_CONFIG["display_height"])
+        # Part of the cached file names; renditions for another size are never reused
+        self.size_tag = f"{self.display_size[0]}x{self.display_size[1]}"
+        self.derivative_format = PHOTO_CONFIG["derivative_format"].upper()
+        self.derivative_quality = PHOTO_CONFIG["derivative_quality"]
+        # (path, size, mtime) -> content hash, so unchanged files are only hashed once
+        self._hashes = {}
+        self._hashes_lock = threading.Lock()
         logger.info(f"PhotoProcessor initialized with cache at {self.cache_dir}")
 
-    def add_shadow_effect(self, image_path, is_dark_mode=False):
+    def content_hash(self, image_path):
+        """
+        Get the hash of a file's content, remembered while the file is unchanged
+
+        Args:
+            image_path: Path to the file
+
+        Returns:
+            Hex digest identifying the content
+        """
+        stat = os.stat(image_path)
+        key = (image_path, stat.st_size, stat.st_mtime_ns)
+        with self._hashes_lock:
+            digest = self._hashes.get(key)
+        if digest is None:
+            hasher = hashlib.blake2b(digest_size=16)
+            with open(image_path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    hasher.update(chunk)
+            digest = hasher.hexdigest()
+            with self._hashes_lock:
+                self._hashes[key] = digest
+        return digest
+
+    def _derivative_path(self, digest, has_alpha):
+        image_format = "PNG" if has_alpha else self.derivative_format
+        return os.path.join(self.cache_dir, f"{digest}_{self.size_tag}{DERIVATIVE_EXTENSIONS[image_format]}"), image_format
+
+    def _cached_derivative(self, digest):
+        for has_alpha in (False, True):
+            path, _ = self._derivative_path(digest, has_alpha)
+            if os.path.exists(path):
+                return path
+        return None
+
+    def get_display_image(self, image_path):
         """
-        Add a shadow effect to the image and return the path to the processed image
+        Get a screen-sized, upright rendition of an image, creating it on first use
+
+        The rendition is cached by content hash and display size, so it's
+        made once per photo and survives restarts and renames.
 
         Args:
             image_path: Path to the original image
-            is_dark_mode: Whether the UI is in dark mode
 
         Returns:
-            Path to the processed image
+            Path to the rendition, or the original path for non-images and on error
         """
         try:
-            # Log the image processing attempt
-            logger.info(f"Processing image: {image_path}, dark mode: {is_dark_mode}")
-
             # Skip if not an image
             if not image_path.lower().endswith((".jpg", ".jpeg", ".png")):
                 logger.info(f"Skipping non-image file: {image_path}")
                 return image_path
 
-            # Check if we already have a cached version - fix the cache key naming
-            filename = os.path.basename(image_path)
-            name, ext = os.path.splitext(filename)
-            # Always use PNG for output since we ensure RGBA
-            cache_key = f"{name}.png"  # Simplified cache key, shadow removed
-            cached_path = os.path.join(self.cache_dir, cache_key)
-
-            # Return cached version if it exists
-            if os.path.exists(cached_path):
-                logger.info(f"Using cached version: {cached_path}")
+            digest = self.content_hash(image_path)
+            cached_path = self._cached_derivative(digest)
+            if cached_path:
+                logger.debug(f"Using cached rendition: {cached_path}")
                 return cached_path
 
-            # Open the image
-            logger.info(f"Opening image: {image_path}")
-            img = Image.open(image_path)
-
-            # Convert to RGBA if not already
-            if img.mode != "RGBA":
-                logger.info(f"Converting image from {img.mode} to RGBA")
-                img = img.convert("RGBA")
-
-            # Shadow creation steps removed. We just use the 'img' (converted to RGBA).
-            processed_image = img
-
-            # Save the processed image to cache
-            logger.info(f"Saving processed image to: {cached_path}")
-            processed_image.save(cached_path)
-
-            logger.info(f"Saved processed (no shadow) image to {cached_path}")
+            logger.info(f"Creating display rendition of: {image_path}")
+            with Image.open(image_path) as img:
+                width, height = self.display_size
+                orientation = img.getexif().get(0x0112, 1)
+                # Let the JPEG decoder scale down while decoding (1/2, 1/4 or 1/8),
+                # so the full camera resolution is never held in memory
+                if orientation in ROTATED_ORIENTATIONS:
+                    img.draft("RGB", (height, width))
+                else:
+                    img.draft("RGB", (width, height))
+                img = ImageOps.exif_transpose(img)
+                img.thumbnail(self.display_size, Image.LANCZOS)
+
+                has_alpha = img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info)
+                if has_alpha:
+                    img = img.convert("RGBA")
+                elif img.mode != "RGB":
+                    img = img.convert("RGB")
+
+                cached_path, image_format = self._derivative_path(digest, has_alpha)
+                if image_format == "PNG":
+                    atomic_save(img, cached_path, "PNG")
+                else:
+                    atomic_save(img, cached_path, image_format, quality=self.derivative_quality)
+
+            logger.info(f"Saved display rendition to {cached_path}")
             return cached_path
 
         except Exception as e:
             logger.error(
-                f"Error adding shadow effect to image {image_path}: {str(e)}",
+                f"Error creating display rendition of image {image_path}: {str(e)}",
                 exc_info=True,
             )
             return image_path  # Return original path on error
@@ -92,42 +145,17 @@ class PhotoProcessor(QObject):
                 logger.info(f"Skipping non-image file for blur: {image_path}")
                 return None
 
-            # Create cache key for the blurred image
-            filename = os.path.basename(image_path)
-            name, ext = os.path.splitext(filename)
-            # Always use JPG for blurred backgrounds (no need for transparency)
-            cache_key = f"{name}_blurred.jpg"
-            cached_path = os.path.join(self.cache_dir, cache_key)
+            # Cached by content and display size, like the renditions
+            digest = self.content_hash(image_path)
+            cached_path = os.path.join(self.cache_dir, f"{digest}_{self.size_tag}_blurred.jpg")
 
             # Return cached version if it exists
             if os.path.exists(cached_path):
-                logger.info(f"Using cached blurred background: {cached_path}")
+                logger.debug(f"Using cached blurred background: {cached_path}")
                 return cached_path
 
-            # Open the image
             logger.info(f"Creating blurred background for: {image_path}")
-            img = Image.open(image_path)
-
-            # Convert to RGB mode if needed
-            if img.mode != "RGB":
-                img = img.convert("RGB")
-
-            # Create a low-resolution version first (for faster processing)
-            small_size = (20, 20)
-            small = img.resize(small_size, Image.LANCZOS)
-
-            # Scale back up to create pixelation effect
-            blurred = small.resize(img.size, Image.LANCZOS)
-
-            # Apply additional Gaussian blur
-            blurred = blurred.filter(ImageFilter.GaussianBlur(radius=5))
-
-            # Darken the image for better contrast with foreground content
-            enhancer = ImageEnhance.Brightness(blurred)
-            blurred = enhancer.enhance(0.7)  # 70% brightness
-
-            # Save to cache
-            blurred.save(cached_path, quality=90)
+            create_blurred_background_file(image_path, cached_path, self.display_size)
             logger.info(f"Saved blurred background to: {cached_path}")
 
             return cached_path
@@ -5,7 +5,6 @@ import QtQuick.Layouts 1.15
 // import MyScreens 1.0 // REMOVED - Module no longer defined/needed here
 import MyTheme 1.0  // Import our ThemeManager
 import MyServices 1.0 // Needed for SettingsService AND ChatService
-import MyUtils 1.0 // Import for MarkdownUtils
 
 BaseScreen {
     id: chatScreen
@@ -19,7 +18,8 @@ BaseScreen {
     
     // Properties to expose chat logic (singleton) and model to controls
     // property alias chatLogic: ChatService // REMOVED - Conflicting alias
-    property alias chatModel: chatModel
+    // The model lives in ChatService, so history survives screen changes
+    property var chatModel: ChatService.chatModel()
     
     // Set the controls file for this screen
     screenControls: "ChatControls.qml"
@@ -30,15 +30,8 @@ BaseScreen {
             showInputBox = SettingsService.getSetting("chat.CHAT_CONFIG.show_input_box", true)
             console.log("ChatScreen initial showInputBox value:", showInputBox)
             
-            // Load initial chat history FROM THE SINGLETON
-            var history = ChatService.getChatHistory() // <-- Use ChatService
-            console.log("ChatScreen loading initial history from ChatService with " + history.length + " messages.")
-            // Clear existing model before loading potentially stale data (important!)
-            chatModel.clear()
-            for (var i = 0; i < history.length; ++i) {
-                chatModel.append(history[i])
-            }
-            if (history.length > 0 && chatView.autoScroll) {
+            console.log("ChatScreen showing " + chatView.count + " messages from ChatService.")
+            if (chatView.count > 0 && chatView.autoScroll) {
                 chatView.positionViewAtEnd()
             }
             
@@ -65,27 +58,18 @@ BaseScreen {
         target: ChatService // <-- Use ChatService
 
         function onHistoryCleared() {
-            console.log("ChatScreen: Received historyCleared signal. Clearing model.")
-            chatModel.clear()
+            console.log("ChatScreen: Received historyCleared signal.")
         }
 
         // Handlers for real-time updates while screen is visible
-        // These signals are emitted by the ChatService singleton
+        // The ChatService model already holds the new text; these only scroll
         function onMessageReceived(text) {
-            chatModel.append({"text": text, "isUser": false})
             if (chatView.autoScroll) {
                 chatView.positionViewAtEnd()
             }
         }
         
         function onMessageChunkReceived(text, isFinal) {
-            var lastIndex = chatModel.count - 1
-            if (lastIndex >= 0 && !chatModel.get(lastIndex).isUser) {
-                chatModel.setProperty(lastIndex, "text", text)
-            } else {
-                chatModel.append({"text": text, "isUser": false})
-            }
-            
             if (isFinal) {
                 console.log("Message stream complete")
             }
@@ -105,7 +89,6 @@ BaseScreen {
         }
         
         function onUserMessageAutoSubmitted(text) {
-            chatModel.append({"text": text, "isUser": true})
             if (chatView.autoScroll) {
                 chatView.positionViewAtEnd()
             }
@@ -132,32 +115,60 @@ BaseScreen {
                     clip: true
                     spacing: 8
                     property bool autoScroll: true
+                    reuseItems: true
+                    
+                    model: chatScreen.chatModel
                     
-                    model: ListModel {
-                        id: chatModel
+                    // Older history is paged in from the history store when
+                    // the user scrolls to the top
+                    onMovementEnded: {
+                        if (atYBeginning) {
+                            ChatService.loadOlderMessages()
+                        }
                     }
                     
                     delegate: Rectangle {
                         width: ListView.view ? ListView.view.width - 16 : 0
                         color: model.isUser ? ThemeManager.user_bubble_color : ThemeManager.assistant_bubble_color
                         radius: 8
-                        height: contentLabel.paintedHeight + 16
+                        height: messageColumn.height + 16
                         
                         anchors.right: (parent && model.isUser) ? parent.right : undefined // Add null check for parent
                         anchors.left: parent && !model.isUser ? parent.left : undefined
                         anchors.rightMargin: model.isUser ? 8 : 0
                         anchors.leftMargin: model.isUser ? 0 : 8
                         
-                        Text {
-                            id: contentLabel
-                            text: MarkdownUtils.markdownToHtml(model.text)
-                            textFormat: Text.RichText
-                            wrapMode: Text.Wrap
+                        // Completed blocks and the block being streamed are separate
+                        // Text items, so a chunk only re-shapes the latter. The model
+                        // renders the markdown incrementally.
+                        Column {
+                            id: messageColumn
                             width: parent.width - 16
-                            color: ThemeManager.text_primary_color
-                            anchors.margins: 8
                             anchors.centerIn: parent
-                            onLinkActivated: Qt.openUrlExternally(link)
+                            // Stands in for the margin between the two blocks
+                            spacing: stableLabel.visible && pendingLabel.visible ? stableLabel.fontInfo.pixelSize : 0
+                            
+                            Text {
+                                id: stableLabel
+                                visible: model.stableHtml.length > 0
+                                text: model.stableHtml
+                                textFormat: Text.RichText
+                                wrapMode: Text.Wrap
+                                width: parent.width
+                                color: ThemeManager.text_primary_color
+                                onLinkActivated: Qt.openUrlExternally(link)
+                            }
+                            
+                            Text {
+                                id: pendingLabel
+                                visible: model.pendingHtml.length > 0
+                                text: model.pendingHtml
+                                textFormat: Text.RichText
+                                wrapMode: Text.Wrap
+                                width: parent.width
+                                color: ThemeManager.text_primary_color
+                                onLinkActivated: Qt.openUrlExternally(link)
+                            }
                         }
                     }
                     
@@ -170,6 +181,9 @@ BaseScreen {
                                 chatView.autoScroll = true
                             } else if (wheel.angleDelta.y > 0) {
                                 chatView.autoScroll = false
+                                if (chatView.atYBeginning) {
+                                    ChatService.loadOlderMessages()
+                                }
                             }
                             wheel.accepted = false
                         }
@@ -216,7 +230,6 @@ BaseScreen {
                         onClicked: {
                             let userText = inputField.text.trim()
                             if (userText.length > 0) {
-                                chatModel.append({ "text": userText, "isUser": true })
                                 inputField.text = ""
                                 ChatService.sendMessage(userText) // <-- Use ChatService
                                 chatView.autoScroll = true
@@ -356,11 +356,14 @@ Item {
                 videoTimer.stop();  // Stop fallback timer
                 currentImagePath = mediaPath; // Update path
                 
+                // Pre-decoded photos come from the image provider, others from disk
+                var imageSource = mediaPath.startsWith("image://") ? mediaPath : "file://" + mediaPath;
+
                 // Load the new image into the inactive image element
                 if (isImage1Active) {
-                    photoImage2.source = "file://" + mediaPath;
+                    photoImage2.source = imageSource;
                 } else {
-                    photoImage1.source = "file://" + mediaPath;
+                    photoImage1.source = imageSource;
                 }
                 
                 // We'll toggle the active state in the image's onStatusChanged handler
@@ -1,8 +1,7 @@
 import asyncio
 import aiohttp
-from typing import Optional, Dict, Any, Tuple
+from typing import Optional
 import logging
-import time
 
 logger = logging.getLogger(__name__)
 
@@ -45,58 +44,6 @@ class SharedHTTPClient:
         """Check if the session is initialized"""
         return cls._instance is not None and cls._instance._session is not None
 
-class TTSResponseCache:
-    """
-    Simple cache for TTS responses to avoid redundant API calls.
-    Caches responses for common phrases to improve responsiveness.
-    """
-    _instance: Optional["TTSResponseCache"] = None
-    _lock = asyncio.Lock()
-    
-    def __init__(self):
-        self._cache: Dict[str, Tuple[bytes, float]] = {}
-        self._max_size = 50  # Maximum number of cached items
-        self._ttl = 3600     # Time to live in seconds (1 hour)
-        logger.info("Initialized TTS response cache")
-    
-    @classmethod
-    async def get_instance(cls) -> "TTSResponseCache":
-        """Get the singleton instance, creating it if necessary"""
-        async with cls._lock:
-            if cls._instance is None:
-                cls._instance = TTSResponseCache()
-            return cls._instance
-    
-    async def get(self, text: str) -> Optional[bytes]:
-        """Get cached audio data for the given text if available"""
-        if text in self._cache:
-            data, timestamp = self._cache[text]
-            # Check if entry is still valid
-            if time.time() - timestamp < self._ttl:
-                logger.debug(f"TTS cache hit for '{text[:20]}...'")
-                return data
-            else:
-                # Remove expired entry
-                del self._cache[text]
-        return None
-    
-    async def set(self, text: str, data: bytes) -> None:
-        """Store audio data for the given text"""
-        # Implement cache size management
-        if len(self._cache) >= self._max_size:
-            # Remove oldest entry
-            oldest_key = min(self._cache.keys(), key=lambda k: self._cache[k][1])
-            del self._cache[oldest_key]
-        
-        # Store new entry
-        self._cache[text] = (data, time.time())
-        logger.debug(f"Cached TTS response for '{text[:20]}...'")
-    
-    async def clear(self) -> None:
-        """Clear the cache"""
-        self._cache.clear()
-        logger.info("Cleared TTS response cache")
-
 # Function to register cleanup on application exit
 def register_http_client_cleanup():
     """
@@ -1,7 +1,200 @@
 #!/usr/bin/env python3
+import html
 import re
 from PySide6.QtCore import QObject, Slot, Property
 
+FENCE_RE = re.compile(r'^\s{0,3}(```|~~~)\s*([\w+-]*)')
+HEADING_RE = re.compile(r'^\s{0,3}(#{1,6})\s+(.*?)\s*#*\s*$')
+UNORDERED_ITEM_RE = re.compile(r'^\s{0,3}[-*+]\s+(.*)$')
+ORDERED_ITEM_RE = re.compile(r'^\s{0,3}(\d{1,9})[.)]\s+(.*)$')
+
+INLINE_CODE_RE = re.compile(r'`([^`]*)`')
+BOLD_RE = re.compile(r'\*\*(.*?)\*\*')
+# Only match *text* that isn't part of **text**
+ITALIC_RE = re.compile(r'(?<!\*)\*(?!\*)(.*?)(?<!\*)\*(?!\*)')
+LINK_RE = re.compile(r'\[(.*?)\]\((.*?)\)')
+
+
+def render_inline(text):
+    """
+    Convert inline markdown (bold, italic, code, links) in one block to HTML.
+    Text is HTML-escaped; code spans are left untouched by the other rules.
+    """
+    parts = INLINE_CODE_RE.split(text)
+    out = []
+    for i, part in enumerate(parts):
+        if i % 2:
+            out.append(f'<code>{html.escape(part)}</code>')
+            continue
+        part = html.escape(part)
+        part = BOLD_RE.sub(r'<b>\1</b>', part)
+        part = ITALIC_RE.sub(r'<i>\1</i>', part)
+        part = LINK_RE.sub(r'<a href="\2">\1</a>', part)
+        out.append(part)
+    return ''.join(out).replace('\n', '<br>')
+
+
+class StreamingMarkdownRenderer:
+    """
+    Incremental markdown to HTML renderer for streamed text.
+
+    Text is consumed line by line. Once a block (paragraph, list, heading or
+    code fence) is complete its HTML is final and appended to `stable_html`;
+    only the open block and the partial last line are re-rendered, so the cost
+    of a chunk doesn't grow with the length of the answer.
+    """
+
+    def __init__(self):
+        self._stable_parts = []
+        self._block_kind = None  # None, "paragraph", "list" or "fence"
+        self._block_lines = []
+        self._partial = ''  # Last line, not yet terminated by a newline
+
+    @property
+    def stable_html(self):
+        """HTML of all completed blocks."""
+        if len(self._stable_parts) > 1:
+            self._stable_parts = [''.join(self._stable_parts)]
+        return self._stable_parts[0] if self._stable_parts else ''
+
+    @property
+    def pending_html(self):
+        """HTML of the block still being written (re-rendered on each call)."""
+        lines = self._block_lines + ([self._partial] if self._partial else [])
+        if not lines:
+            return ''
+        tail = StreamingMarkdownRenderer()
+        tail.feed('\n'.join(lines))
+        tail.finish()
+        return tail.stable_html
+
+    def feed(self, text):
+        """
+        Add streamed text.
+
+        Args:
+            text: The new text only
+
+        Returns:
+            True if a block was completed (stable_html changed)
+        """
+        self._partial += text
+        if '\n' not in text:
+            return False
+        lines = self._partial.split('\n')
+        self._partial = lines.pop()
+        completed = False
+        for line in lines:
+            completed |= self._add_line(line)
+        return completed
+
+    def finish(self):
+        """Close the open block; everything becomes stable."""
+        completed = False
+        if self._partial:
+            completed |= self._add_line(self._partial)
+            self._partial = ''
+        completed |= self._close_block()
+        return completed
+
+    def _emit(self, block_html):
+        self._stable_parts.append(block_html)
+        return True
+
+    def _close_block(self):
+        if self._block_kind is None:
+            return False
+        kind, lines = self._block_kind, self._block_lines
+        self._block_kind = None
+        self._block_lines = []
+        if kind == 'fence':
+            return self._emit(self._render_fence(lines))
+        if kind == 'list':
+            return self._emit(self._render_list(lines))
+        paragraph = render_inline('\n'.join(lines))
+        return self._emit(f'<p>{paragraph}</p>')
+
+    def _add_line(self, line):
+        """Consume one complete line; returns True if a block was completed."""
+        if self._block_kind == 'fence':
+            fence = FENCE_RE.match(line)
+            if fence and fence.group(1) == FENCE_RE.match(self._block_lines[0]).group(1) and not fence.group(2):
+                # Closing fence; an unclosed fence is rendered the same way
+                return self._close_block()
+            self._block_lines.append(line)
+            return False
+
+        if not line.strip():
+            return self._close_block()
+
+        if FENCE_RE.match(line):
+            completed = self._close_block()
+            self._block_kind = 'fence'
+            self._block_lines = [line]
+            return completed
+
+        heading = HEADING_RE.match(line)
+        if heading:
+            self._close_block()
+            level = len(heading.group(1))
+            return self._emit(f'<h{level}>{render_inline(heading.group(2))}</h{level}>')
+
+        if UNORDERED_ITEM_RE.match(line) or ORDERED_ITEM_RE.match(line):
+            completed = False
+            if self._block_kind != 'list' or self._list_type(self._block_lines[0]) != self._list_type(line):
+                completed = self._close_block()
+                self._block_kind = 'list'
+            self._block_lines.append(line)
+            return completed
+
+        if self._block_kind == 'list' and line[:1].isspace():
+            # Continuation of the previous list item
+            self._block_lines.append(line)
+            return False
+
+        completed = False
+        if self._block_kind != 'paragraph':
+            completed = self._close_block()
+            self._block_kind = 'paragraph'
+        self._block_lines.append(line)
+        return completed
+
+    @staticmethod
+    def _list_type(line):
+        return 'ul' if UNORDERED_ITEM_RE.match(line) else 'ol'
+
+    @staticmethod
+    def _render_fence(lines):
+        # The info string (language) on the opening line isn't shown
+        code = html.escape('\n'.join(lines[1:]))
+        return f'<pre><code>{code}</code></pre>'
+
+    def _render_list(self, lines):
+        list_type = self._list_type(lines[0])
+        items = []
+        for line in lines:
+            item = UNORDERED_ITEM_RE.match(line) if list_type == 'ul' else ORDERED_ITEM_RE.match(line)
+            if item:
+                items.append([item.group(item.lastindex)])
+            elif items:
+                items[-1].append(line.strip())
+        start = ''
+        if list_type == 'ol':
+            first = int(ORDERED_ITEM_RE.match(lines[0]).group(1))
+            if first != 1:
+                start = f' start="{first}"'
+        body = ''.join('<li>' + render_inline('\n'.join(item)) + '</li>' for item in items)
+        return f'<{list_type}{start}>{body}</{list_type}>'
+
+
+def render_markdown(text):
+    """Render a complete markdown text to HTML."""
+    renderer = StreamingMarkdownRenderer()
+    renderer.feed(text)
+    renderer.finish()
+    return renderer.stable_html
+
+
 class MarkdownUtils(QObject):
     """
     Utility class for converting markdown syntax to HTML format
@@ -15,40 +208,29 @@ class MarkdownUtils(QObject):
     def markdownToHtml(self, text):
         """
         Convert markdown formatting to HTML for display in QML Text elements.
-        
+
         Supported markdown:
         - **bold text** -> <b>bold text</b>
         - *italic text* -> <i>italic text</i>
         - `code` -> <code>code</code>
         - [link text](url) -> <a href="url">link text</a>
-        - \n -> <br>
-        
+        - ``` fenced code blocks -> <pre><code>...</code></pre>
+        - "- item" / "1. item" lists -> <ul>/<ol>
+        - # headings -> <h1>..<h6>
+        - blank lines separate paragraphs, \n -> <br>
+
+        Streaming text should use StreamingMarkdownRenderer instead, which
+        only re-renders the block still being written.
+
         Args:
             text: Text with markdown formatting
-            
+
         Returns:
             Text converted to HTML
         """
         if not text:
             return ""
-            
-        # Convert line breaks
-        html = text.replace('\n', '<br>')
-        
-        # Bold: **text** -> <b>text</b>
-        html = re.sub(r'\*\*(.*?)\*\*', r'<b>\1</b>', html)
-        
-        # Italic: *text* -> <i>text</i>
-        # Only match *text* that isn't part of **text**
-        html = re.sub(r'(?<!\*)\*(?!\*)(.*?)(?<!\*)\*(?!\*)', r'<i>\1</i>', html)
-        
-        # Code: `code` -> <code>code</code>
-        html = re.sub(r'`(.*?)`', r'<code>\1</code>', html)
-        
-        # Links: [text](url) -> <a href="url">text</a>
-        html = re.sub(r'\[(.*?)\]\((.*?)\)', r'<a href="\2">\1</a>', html)
-        
-        return html
+        return render_markdown(text)
 
 # For singleton usage in QML
-markdown_utils = MarkdownUtils() 
\ No newline at end of file
+markdown_utils = MarkdownUtils()
@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+Asyncio event loop driven by the Qt event loop.
+
+Qt owns the thread and sleeps until something happens. The asyncio loop runs
+one iteration only when there is work for it:
+
+- a file descriptor registered with asyncio becomes readable/writable
+  (mirrored by QSocketNotifiers; this includes the loop's self-pipe, so
+  call_soon_threadsafe() and signal handlers wake it too),
+- the earliest asyncio timer is due (a single-shot precise QTimer), or
+- a callback was scheduled with call_soon()/call_at() from Qt code.
+
+This replaces polling asyncio from a fixed-interval QTimer, which woke the
+process continuously and delayed every callback by up to one interval.
+"""
+import asyncio
+import math
+import selectors
+
+from PySide6.QtCore import QSocketNotifier, Qt, QTimer
+
+from frontend.config import logger
+
+
+class _NotifyingSelector(selectors.DefaultSelector):
+    """
+    Selector that mirrors its registrations as QSocketNotifiers, so Qt can
+    tell the loop when a registered descriptor is ready.
+    """
+
+    def __init__(self, on_activity):
+        super().__init__()
+        self._on_activity = on_activity
+        self._notifiers = {}  # (fd, notifier type) -> QSocketNotifier
+
+    def _update_notifiers(self, fd, events):
+        for notifier_type, event in (
+            (QSocketNotifier.Type.Read, selectors.EVENT_READ),
+            (QSocketNotifier.Type.Write, selectors.EVENT_WRITE),
+        ):
+            notifier = self._notifiers.get((fd, notifier_type))
+            if events & event and notifier is None:
+                notifier = QSocketNotifier(fd, notifier_type)
+                notifier.activated.connect(lambda *args: self._on_activity())
+                self._notifiers[(fd, notifier_type)] = notifier
+            elif not events & event and notifier is not None:
+                # Disable right away: the descriptor may be closed next
+                notifier.setEnabled(False)
+                notifier.deleteLater()
+                del self._notifiers[(fd, notifier_type)]
+
+    def register(self, fileobj, events, data=None):
+        key = super().register(fileobj, events, data)
+        self._update_notifiers(key.fd, events)
+        return key
+
+    def unregister(self, fileobj):
+        key = super().unregister(fileobj)
+        self._update_notifiers(key.fd, 0)
+        return key
+
+    def modify(self, fileobj, events, data=None):
+        key = super().modify(fileobj, events, data)
+        self._update_notifiers(key.fd, events)
+        return key
+
+    def close(self):
+        for notifier in self._notifiers.values():
+            notifier.setEnabled(False)
+            notifier.deleteLater()
+        self._notifiers.clear()
+        super().close()
+
+
+class QtEventLoop(asyncio.SelectorEventLoop):
+    """
+    SelectorEventLoop whose iterations are triggered by Qt instead of by a
+    blocking select(). Must be created in the Qt GUI thread after the
+    QGuiApplication. run_until_complete() still works as usual outside of
+    the Qt event loop (e.g. for startup and shutdown work).
+    """
+
+    def __init__(self):
+        # Timers first: the selector registers the self-pipe on construction
+        self._wake_timer = QTimer()
+        self._wake_timer.setSingleShot(True)
+        self._wake_timer.setInterval(0)
+        self._wake_timer.timeout.connect(self._process_events)
+
+        self._deadline_timer = QTimer()
+        self._deadline_timer.setSingleShot(True)
+        self._deadline_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._deadline_timer.timeout.connect(self._process_events)
+
+        self._processing = False
+        self.iterations = 0
+        super().__init__(_NotifyingSelector(self._schedule_wake))
+
+    def _schedule_wake(self):
+        """Run an iteration as soon as Qt gets back to its event loop."""
+        if not self._processing and not self._wake_timer.isActive():
+            self._wake_timer.start()
+
+    def call_soon(self, callback, *args, context=None):
+        handle = super().call_soon(callback, *args, context=context)
+        self._schedule_wake()
+        return handle
+
+    def call_at(self, when, callback, *args, context=None):
+        handle = super().call_at(when, callback, *args, context=context)
+        self._schedule_wake()
+        return handle
+
+    def _arm_deadline_timer(self):
+        """Wake up for the earliest asyncio timer (cancelled ones just cause an early wake)."""
+        if not self._scheduled:
+            self._deadline_timer.stop()
+            return
+        delay = max(0.0, self._scheduled[0].when() - self.time())
+        # Round up: waking before the deadline would just spin
+        self._deadline_timer.start(math.ceil(delay * 1000))
+
+    def _process_events(self):
+        """Run one non-blocking asyncio iteration, then re-arm the Qt triggers."""
+        # A nested Qt event loop inside a callback must not re-enter asyncio
+        if self._processing or self.is_running() or self.is_closed():
+            return
+        self._processing = True
+        try:
+            # stop() is already queued, so the select() below doesn't block
+            super().call_soon(self.stop)
+            self.run_forever()
+            self.iterations += 1
+        except Exception as e:
+            logger.error(f"[QtEventLoop] Error processing asyncio events: {e}")
+        finally:
+            self._processing = False
+
+        if self.is_closed():
+            return
+        if self._ready:
+            # Callbacks scheduled during this iteration; let Qt run in between
+            self._wake_timer.start()
+        self._arm_deadline_timer()
+
+    def close(self):
+        self._wake_timer.stop()
+        self._deadline_timer.stop()
+        super().close()
+
+
+def new_qt_event_loop():
+    """Create a QtEventLoop; call after the QGuiApplication exists."""
+    loop = QtEventLoop()
+    logger.info("[QtEventLoop] Created Qt-driven asyncio event loop")
+    return loop
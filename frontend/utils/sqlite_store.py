@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from frontend.config import logger
+
+
+class SQLiteStore:
+    """
+    Base of the app's SQLite stores (WAL mode).
+
+    Writes run on one worker thread, submitted with _submit(). Reads run on
+    the calling thread with its own connection; in WAL mode they never wait
+    for a write. Stores that need to see their own queued writes submit their
+    reads too.
+    """
+
+    def __init__(self, db_path, schema, thread_name_prefix):
+        self.db_path = db_path
+        self._schema = schema
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=thread_name_prefix)
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        self._closed = False
+
+    def _connection(self):
+        """Get the calling thread's connection, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            if self._closed:
+                raise RuntimeError(f"{type(self).__name__} is closed")
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            # Each connection is only used by the thread that opened it;
+            # check_same_thread=False only lets close() close them all
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(self._schema)
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+            self._opened(conn)
+        return conn
+
+    def _opened(self, conn):
+        """Called once for each new connection, on its thread."""
+
+    def _submit(self, fn, *args):
+        """Run fn(*args) on the worker thread; returns a Future."""
+        return self._executor.submit(fn, *args)
+
+    def _close(self):
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections = []
+
+    def close(self):
+        """Finish pending writes and close every connection."""
+        self._closed = True
+        self._executor.submit(self._close)
+        self._executor.shutdown(wait=True)
+        logger.info(f"[{type(self).__name__}] Closed")
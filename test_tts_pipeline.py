@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Tests for the TTS synthesis pipeline (backend/tts/pipeline.py).
+
+Usage:
+    python -m pytest test_tts_pipeline.py
+    python test_tts_pipeline.py
+"""
+
+import asyncio
+import unittest
+
+from backend.tts.pipeline import run_synthesis_pipeline
+
+
+def make_synthesizer(delay):
+    """Synthesizer that takes `delay` seconds per phrase and returns its text as two chunks."""
+    async def synthesize(phrase, sink):
+        await asyncio.sleep(delay)
+        sink.put_nowait(f"{phrase}:1")
+        sink.put_nowait(f"{phrase}:2")
+    return synthesize
+
+
+def drain(queue):
+    items = []
+    while not queue.empty():
+        items.append(queue.get_nowait())
+    return items
+
+
+class SynthesisPipelineTest(unittest.IsolatedAsyncioTestCase):
+    async def test_audio_in_phrase_order(self):
+        phrase_queue, audio_queue = asyncio.Queue(), asyncio.Queue()
+        for phrase in ("one", "two", "three", None):
+            phrase_queue.put_nowait(phrase)
+
+        await asyncio.wait_for(
+            run_synthesis_pipeline(phrase_queue, audio_queue, asyncio.Event(), make_synthesizer(0.01), lookahead=2),
+            timeout=2,
+        )
+        self.assertEqual(
+            drain(audio_queue),
+            ["one:1", "one:2", "two:1", "two:2", "three:1", "three:2", None],
+        )
+
+    async def test_stop_with_full_lookahead_queue(self):
+        # More phrases than the lookahead, so the pending queue is full when
+        # the stop comes; the pipeline must still end promptly
+        phrase_queue, audio_queue = asyncio.Queue(), asyncio.Queue()
+        for i in range(6):
+            phrase_queue.put_nowait(f"phrase {i}")
+        stop_event = asyncio.Event()
+
+        pipeline = asyncio.create_task(
+            run_synthesis_pipeline(phrase_queue, audio_queue, stop_event, make_synthesizer(1.0), lookahead=2)
+        )
+        await asyncio.sleep(0.3)
+        stop_event.set()
+        await asyncio.wait_for(pipeline, timeout=2)
+
+        self.assertEqual(drain(audio_queue), [None])
+
+    async def test_cancelled_pipeline_ends(self):
+        phrase_queue, audio_queue = asyncio.Queue(), asyncio.Queue()
+        for i in range(6):
+            phrase_queue.put_nowait(f"phrase {i}")
+
+        pipeline = asyncio.create_task(
+            run_synthesis_pipeline(phrase_queue, audio_queue, asyncio.Event(), make_synthesizer(1.0), lookahead=2)
+        )
+        await asyncio.sleep(0.3)
+        pipeline.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await asyncio.wait_for(pipeline, timeout=2)
+
+
+if __name__ == "__main__":
+    unittest.main()